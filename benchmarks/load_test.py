@@ -0,0 +1,122 @@
+"""
+Нагрузочный тест полного цикла скрапинга на локальном сервере `benchmarks.replay_server`.
+
+Скрипт запускает сервер в отдельном процессе, направляет на него запросы скраперов через
+`SCRAPPER_FETCH_URL_REWRITE` и выполняет несколько циклов `scrapper.main` в долгоживущем
+`ScrapperRuntime`, как при периодическом запуске. Данные пишутся во временный каталог
+(`SCRAPPER_DATA_DIR`), поэтому рабочий `data/news_data.csv` не меняется.
+Ограничение скорости запросов к сайтам по умолчанию отключено (`--rate-limit 0`), чтобы измерялась
+пропускная способность самого скрапера.
+Для каждого цикла выводятся длительность, количество новых статей и статей в секунду.
+
+Сервер отдает новые ссылки при каждом запросе категории, поэтому каждый цикл находит
+4 * categories * articles-per-category статей; значения по умолчанию дают 10 000 статей за цикл.
+
+Запуск из корня проекта:
+    python -m benchmarks.load_test --cycles 3 --categories 10 --articles-per-category 250 --latency-ms 20
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+import urllib.request
+
+
+def wait_for_server(base_url, process, timeout=15):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("Replay server exited before accepting connections")
+        try:
+            with urllib.request.urlopen(f"{base_url}/_stats", timeout=1) as response:
+                return json.load(response)
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Replay server did not start at {base_url}")
+
+
+def server_stats(base_url):
+    with urllib.request.urlopen(f"{base_url}/_stats", timeout=5) as response:
+        return json.load(response)
+
+
+def run_cycles(cycles):
+    # Импортируются после настройки окружения, так как конфигурация читается при импорте
+    from scrapper import main as scrapper_main
+    from tools.runtime import ScrapperRuntime
+
+    results = []
+    runtime = ScrapperRuntime()
+    try:
+        for cycle in range(cycles):
+            started = time.perf_counter()
+            stats = runtime.run(scrapper_main)
+            seconds = time.perf_counter() - started
+            articles = sum(source_stats["articles"] for source_stats in stats.values())
+            results.append({
+                "cycle": cycle + 1,
+                "seconds": round(seconds, 2),
+                "articles": articles,
+                "articles_per_sec": round(articles / seconds, 1) if seconds else 0,
+                "sources": stats,
+            })
+            print(f"cycle {cycle + 1}: {articles} articles in {seconds:.1f} s "
+                  f"({results[-1]['articles_per_sec']:.1f} articles/s)")
+    finally:
+        runtime.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8090, help="Порт локального сервера")
+    parser.add_argument("--cycles", type=int, default=3, help="Количество циклов скрапинга")
+    parser.add_argument("--categories", type=int, default=10, help="Количество категорий на сайт")
+    parser.add_argument("--articles-per-category", type=int, default=250, help="Количество статей в категории")
+    parser.add_argument("--latency-ms", type=float, default=20, help="Средняя задержка ответа, мс")
+    parser.add_argument("--jitter-ms", type=float, default=5, help="Разброс задержки ответа, мс")
+    parser.add_argument("--error-rate", type=float, default=0, help="Доля ответов 503")
+    parser.add_argument("--rate-limit", type=float, default=0,
+                        help="Скорость запросов к одному сайту в секунду (SCRAPPER_RATE_LIMIT), 0 — без ограничения")
+    parser.add_argument("--data-dir", help="Каталог данных теста. По умолчанию временный, удаляется после теста")
+    parser.add_argument("--json", help="Путь к файлу для сохранения результатов")
+    args = parser.parse_args()
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix="scrapper_load_")
+    os.environ["SCRAPPER_FETCH_URL_REWRITE"] = base_url
+    os.environ["SCRAPPER_DATA_DIR"] = data_dir
+    os.environ["SCRAPPER_RATE_LIMIT"] = str(args.rate_limit)
+
+    server = subprocess.Popen([
+        sys.executable, "-m", "benchmarks.replay_server",
+        "--port", str(args.port),
+        "--categories", str(args.categories),
+        "--articles-per-category", str(args.articles_per_category),
+        "--latency-ms", str(args.latency_ms),
+        "--jitter-ms", str(args.jitter_ms),
+        "--error-rate", str(args.error_rate),
+        "--fresh",
+    ])
+    try:
+        wait_for_server(base_url, server)
+        results = run_cycles(args.cycles)
+        stats = server_stats(base_url)
+    finally:
+        server.terminate()
+        server.wait()
+        if not args.data_dir:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    print(f"server: {stats['requests']} requests, {stats['errors']} errors")
+    if args.json:
+        with open(args.json, mode="w", encoding="utf-8") as file:
+            json.dump({"args": vars(args), "cycles": results, "server": stats}, file, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
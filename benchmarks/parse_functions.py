@@ -0,0 +1,176 @@
+"""
+Измеряет скорость функций парсинга каждого скрапера на сохраненных страницах.
+
+Для каждого источника запускаются `parse_categories`, `parse_articles_in_category` и `parse_articles`
+с контекстом, который отдает сохраненные страницы вместо сетевых запросов и разбирает их в текущем
+процессе. Для каждой функции выводятся страницы в секунду, задержки p50/p99 и пиковое выделение
+памяти Python (tracemalloc) за один проход по страницам.
+
+С параметром `--baseline` результаты сравниваются с ранее сохраненным JSON-файлом, и программа
+завершается с кодом 1, если какая-либо функция стала медленнее больше чем в `--max-slowdown` раз.
+
+Страницы записываются командой `python -m benchmarks.record_pages`; если они не записаны, используются
+страницы из `benchmarks/fixtures`. Если страниц нет совсем, программа завершается с кодом 1.
+
+Запуск из корня проекта:
+    python -m benchmarks.parse_functions --repeat 20 --json bench_parse.json
+    python -m benchmarks.parse_functions --baseline bench_parse.json
+"""
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+import statistics
+import tracemalloc
+from datetime import datetime
+from config import HTML_PARSER_BACKEND
+from tools import html_parser
+from tools.scrape_context import ScrapeContext
+from benchmarks.snapshots import SOURCES, load_scrapper, load_snapshots
+
+# Функции парсинга скраперов и виды страниц, на которых они запускаются
+PARSE_FUNCTIONS = {
+    "parse_categories": "categories",
+    "parse_articles_in_category": "category",
+    "parse_articles": "article",
+}
+
+
+class SnapshotContext(ScrapeContext):
+    """
+    Контекст скрапинга для бенчмарка: отдает сохраненные страницы и разбирает их в текущем процессе.
+    Хранилище пустое, поэтому все найденные статьи считаются новыми.
+    """
+
+    def __init__(self, pages):
+        super().__init__(session=None, scheduler=None, known_articles=set(), queue=None)
+        self.pages = pages
+
+    async def fetch_html(self, url, cacheable=False, canonical=True):
+        return self.pages.get(url)
+
+    async def confirm_known(self, articles):
+        pass
+
+    async def parse(self, extract_function, html, url):
+        return extract_function(html, url)
+
+
+async def run_once(parse_function, pages, url):
+    started = time.perf_counter()
+    await parse_function(SnapshotContext(pages), url)
+    return time.perf_counter() - started
+
+
+async def measure_function(parse_function, snapshots, repeat):
+    pages = dict(snapshots)
+
+    # Прогрев: импорт ленивых зависимостей и заполнение кэшей не должны попадать в измерения
+    for url, _ in snapshots:
+        await run_once(parse_function, pages, url)
+
+    timings = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for url, _ in snapshots:
+            timings.append(await run_once(parse_function, pages, url))
+    total_seconds = time.perf_counter() - started
+
+    tracemalloc.start()
+    for url, _ in snapshots:
+        await run_once(parse_function, pages, url)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    percentiles = statistics.quantiles(timings, n=100, method="inclusive") if len(timings) > 1 else timings * 99
+    return {
+        "pages": len(snapshots),
+        "runs": len(timings),
+        "pages_per_sec": round(len(timings) / total_seconds, 2),
+        "p50_ms": round(percentiles[49] * 1000, 3),
+        "p99_ms": round(percentiles[98] * 1000, 3),
+        "peak_memory_kib": round(peak / 1024, 1),
+    }
+
+
+async def run(repeat, sources):
+    results = []
+    for source in sources:
+        scrapper = load_scrapper(source)
+        for function_name, kind in PARSE_FUNCTIONS.items():
+            snapshots = load_snapshots(source, kind)
+            if not snapshots:
+                continue
+            result = await measure_function(getattr(scrapper, function_name), snapshots, repeat)
+            results.append({"source": source, "function": function_name, **result})
+    return results
+
+
+def compare(results, baseline, max_slowdown):
+    baseline_results = {(result["source"], result["function"]): result for result in baseline["results"]}
+    regressions = []
+    for result in results:
+        previous = baseline_results.get((result["source"], result["function"]))
+        if previous is None:
+            continue
+        slowdown = previous["pages_per_sec"] / result["pages_per_sec"]
+        marker = " REGRESSION" if slowdown > max_slowdown else ""
+        print(f"{result['source']:<8} {result['function']:<28} "
+              f"{previous['pages_per_sec']:>10.1f} -> {result['pages_per_sec']:>10.1f} pages/s "
+              f"(time x{slowdown:.2f}){marker}")
+        if marker:
+            regressions.append(result)
+    return regressions
+
+
+def print_summary(results):
+    print(f"{'source':<8} {'function':<28} {'pages':>5} {'pages/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'peak KiB':>10}")
+    for result in results:
+        print(f"{result['source']:<8} {result['function']:<28} {result['pages']:>5} "
+              f"{result['pages_per_sec']:>10.1f} {result['p50_ms']:>9.2f} {result['p99_ms']:>9.2f} "
+              f"{result['peak_memory_kib']:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10, help="Количество проходов по страницам каждой функции")
+    parser.add_argument("--sources", default=",".join(SOURCES), help="Источники через запятую")
+    parser.add_argument("--backend", choices=sorted(html_parser.PARSER_BACKENDS), help="Движок разбора HTML")
+    parser.add_argument("--json", help="Путь к файлу для сохранения результатов")
+    parser.add_argument("--baseline", help="JSON-файл с результатами предыдущего запуска для сравнения")
+    parser.add_argument("--max-slowdown", type=float, default=1.2,
+                        help="Допустимое замедление относительно --baseline")
+    args = parser.parse_args()
+
+    if args.backend:
+        html_parser.set_parser_backend(args.backend)
+
+    results = asyncio.run(run(args.repeat, args.sources.split(",")))
+    if not results:
+        print("No snapshots found. Record pages with: python -m benchmarks.record_pages")
+        return 1
+    print_summary(results)
+
+    if args.json:
+        with open(args.json, mode="w", encoding="utf-8") as file:
+            json.dump({
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "parser_backend": args.backend or HTML_PARSER_BACKEND,
+                "repeat": args.repeat,
+                "results": results,
+            }, file, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        print()
+        if compare(results, baseline, args.max_slowdown):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+Сравнивает движки разбора HTML на сохраненных страницах всех четырех источников.
+
+Для каждой страницы и каждого движка измеряется время работы функции извлечения
+скрапера (медиана по нескольким повторам) и пиковое выделение памяти при разборе.
+Память измеряется через tracemalloc после неучитываемого прогревочного вызова, поэтому учитываются
+только выделения через аллокатор Python: внутренние буферы lxml в нее не попадают, а selectolax
+выделяет через него пул документа lexbor (около 1 МиБ на любой странице). Поэтому рядом с пиком
+(`peak KiB`) выводится пик разбора пустой страницы тем же движком (`base KiB`) — постоянная часть,
+не зависящая от размера страницы.
+Вариант `html.parser (full)` разбирает полное дерево и соответствует прежнему поведению.
+
+Страницы записываются командой `python -m benchmarks.record_pages`; если они не записаны, используются
+страницы из `benchmarks/fixtures`. Если страниц нет совсем, программа завершается с кодом 1.
+
+Запуск из корня проекта:
+    python -m benchmarks.parser_backends --repeat 5 --json bench_parsers.json
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from tools import html_parser
+from benchmarks.snapshots import SOURCES, PAGE_KINDS, load_scrapper, load_snapshots
+
+# Варианты разбора: (название, движок, разбор только нужных поддеревьев)
+VARIANTS = [
+    ("html.parser (full)", "html.parser", False),
+    ("html.parser", "html.parser", True),
+    ("lxml", "lxml", True),
+    ("selectolax", "selectolax", True),
+]
+
+# Пустая страница для измерения постоянной части выделений движка
+EMPTY_PAGE = "<html><head></head><body></body></html>"
+
+
+def available_variants():
+    variants = []
+    for name, backend, restrict_subtrees in VARIANTS:
+        if backend == "lxml" and html_parser._FRAGMENT_PARSER != "lxml":
+            continue
+        if backend == "selectolax" and html_parser.LexborHTMLParser is None:
+            continue
+        variants.append((name, backend, restrict_subtrees))
+    return variants
+
+
+def measure_peak(extract_function, html, url):
+    # Прогревочный вызов не учитывается: кэши селекторов и модулей заполняются до начала измерения
+    extract_function(html, url)
+    tracemalloc.start()
+    try:
+        extract_function(html, url)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def measure_base(extract_function, url):
+    try:
+        return measure_peak(extract_function, EMPTY_PAGE, url)
+    except Exception:
+        return 0
+
+
+def measure_page(extract_function, html, url, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        extract_function(html, url)
+        timings.append(time.perf_counter() - started)
+
+    return statistics.median(timings), measure_peak(extract_function, html, url)
+
+
+def run(repeat):
+    results = []
+    for source in SOURCES:
+        scrapper = load_scrapper(source)
+        for kind, function_name in PAGE_KINDS.items():
+            snapshots = load_snapshots(source, kind)
+            extract_function = getattr(scrapper, function_name)
+            for name, backend, restrict_subtrees in available_variants():
+                html_parser.set_parser_backend(backend, restrict_subtrees)
+                base = measure_base(extract_function, snapshots[0][0]) if snapshots else 0
+                for url, html in snapshots:
+                    try:
+                        seconds, peak = measure_page(extract_function, html, url, repeat)
+                    except Exception as e:
+                        print(f"{source} {kind} {name}: error parsing {url}: {e}")
+                        continue
+                    results.append({
+                        "source": source,
+                        "page": kind,
+                        "url": url,
+                        "backend": name,
+                        "html_kib": round(len(html.encode("utf-8")) / 1024, 1),
+                        "parse_ms": round(seconds * 1000, 3),
+                        "peak_memory_kib": round(peak / 1024, 1),
+                        "base_memory_kib": round(base / 1024, 1),
+                    })
+    return results
+
+
+def print_summary(results):
+    groups = {}
+    for result in results:
+        key = (result["source"], result["page"], result["backend"])
+        groups.setdefault(key, []).append(result)
+
+    print(f"{'source':<8} {'page':<11} {'backend':<20} {'pages':>5} {'ms/page':>10} {'peak KiB':>10} {'base KiB':>10}")
+    for (source, kind, backend), group in groups.items():
+        parse_ms = statistics.mean(result["parse_ms"] for result in group)
+        peak = statistics.mean(result["peak_memory_kib"] for result in group)
+        base = statistics.mean(result["base_memory_kib"] for result in group)
+        print(f"{source:<8} {kind:<11} {backend:<20} {len(group):>5} {parse_ms:>10.2f} {peak:>10.1f} {base:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Количество повторов разбора каждой страницы")
+    parser.add_argument("--json", help="Путь к файлу для сохранения результатов по каждой странице")
+    args = parser.parse_args()
+
+    results = run(args.repeat)
+    if not results:
+        print("No snapshots found. Record pages with: python -m benchmarks.record_pages")
+        sys.exit(1)
+    print_summary(results)
+
+    if args.json:
+        with open(args.json, mode="w", encoding="utf-8") as file:
+            json.dump(results, file, ensure_ascii=False, indent=2)
@@ -0,0 +1,64 @@
+"""
+Записывает страницы новостных сайтов для офлайн-бенчмарков.
+
+Для каждого источника сохраняется главная страница, несколько страниц категорий
+и несколько статей из них в каталог `benchmarks/pages`.
+
+С `--fixtures` страницы сохраняются в хранящийся в репозитории каталог `benchmarks/fixtures`.
+Этот набор записывается с локального `benchmarks.replay_server` (через `SCRAPPER_FETCH_URL_REWRITE`),
+а не с сайтов, и используется бенчмарками, когда страницы с сайтов не записаны.
+
+Запуск из корня проекта:
+    python -m benchmarks.record_pages --categories 3 --articles 5
+    SCRAPPER_FETCH_URL_REWRITE=http://127.0.0.1:8090 python -m benchmarks.record_pages --categories 2 --articles 2 --fixtures
+"""
+import argparse
+import asyncio
+import aiohttp
+from tools.fetch_html import async_fetch_html
+from benchmarks.snapshots import SOURCES, SNAPSHOTS_DIR, FIXTURES_DIR, load_scrapper, save_snapshot
+
+
+async def record_source(session, source, categories_limit, articles_limit, directory):
+    scrapper = load_scrapper(source)
+    main_url = SOURCES[source][1]
+
+    html = await async_fetch_html(session, main_url)
+    if html is None:
+        print(f"{source}: failed to fetch {main_url}")
+        return
+    save_snapshot(source, "categories", main_url, html, directory)
+
+    articles_saved = 0
+    for category in scrapper.extract_categories(html, main_url)[:categories_limit]:
+        category_html = await async_fetch_html(session, category["link"])
+        if category_html is None:
+            continue
+        save_snapshot(source, "category", category["link"], category_html, directory)
+
+        for article in scrapper.extract_articles_in_category(category_html, category["link"])[:articles_limit]:
+            article_html = await async_fetch_html(session, article["link"])
+            if article_html is None:
+                continue
+            save_snapshot(source, "article", article["link"], article_html, directory)
+            articles_saved += 1
+
+    print(f"{source}: saved {articles_saved} articles")
+
+
+async def main(categories_limit, articles_limit, directory):
+    async with aiohttp.ClientSession() as session:
+        await asyncio.gather(*(
+            record_source(session, source, categories_limit, articles_limit, directory)
+            for source in SOURCES
+        ))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--categories", type=int, default=3, help="Количество категорий на источник")
+    parser.add_argument("--articles", type=int, default=5, help="Количество статей на категорию")
+    parser.add_argument("--fixtures", action="store_true", help="Сохранить страницы в benchmarks/fixtures")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.categories, args.articles, FIXTURES_DIR if args.fixtures else SNAPSHOTS_DIR))
@@ -0,0 +1,276 @@
+"""
+Локальный сервер, заменяющий rbc.ru, lenta.ru, ria.ru и gazeta.ru при нагрузочном тестировании.
+
+Сервер принимает запросы вида `/<домен>/<путь>` (скраперы отправляют их при заданной переменной
+`SCRAPPER_FETCH_URL_REWRITE`) и отдает главные страницы, страницы категорий и статьи с разметкой,
+которую ожидают функции извлечения скраперов. Количество категорий и статей в категории задается
+параметрами, поэтому за один цикл можно получить десятки тысяч статей. Если записаны страницы
+статей (`python -m benchmarks.record_pages`), вместо синтетических статей отдаются записанные.
+
+Параметры `--latency-ms`/`--jitter-ms` задают задержку ответа, а `--error-rate` — долю ответов 503
+(или `--error-status`) с заголовком `Retry-After`, если задан `--retry-after`. С `--crawl-delay`
+сервер отдает robots.txt с директивой `Crawl-delay`.
+Каждая категория — лента статей от новых к старым. С `--pages` больше 1 страницы категории содержат ссылку
+на следующую страницу в разметке сайта («Загрузить еще» Lenta.ru, «Еще материалы» RIA.ru, «Показать еще»
+Газеты). С `--fresh` перед каждым запросом первой страницы категории в ленте публикуется `--fresh-articles`
+новых статей (по умолчанию целая страница), чтобы каждый цикл находил новые статьи.
+Счетчики запросов доступны по адресу `/_stats`.
+
+Запуск из корня проекта:
+    python -m benchmarks.replay_server --port 8090 --categories 10 --articles-per-category 250 --latency-ms 20
+"""
+import re
+import zlib
+import random
+import asyncio
+import argparse
+from datetime import datetime
+from aiohttp import web
+from benchmarks.snapshots import load_snapshots
+
+# Домены сайтов и соответствующие им источники
+SITES = {
+    "www.rbc.ru": "rbk",
+    "lenta.ru": "lenta",
+    "ria.ru": "ria",
+    "www.gazeta.ru": "gazeta",
+}
+
+# Сегмент пути, по которому сервер отличает статьи от страниц категорий
+ARTICLE_MARKER = "replay"
+
+# Номер страницы категории Lenta.ru в конце пути: /rubrics/russia/2/
+LENTA_PAGE_PATTERN = re.compile(r"^(?P<path>.*/)(?P<page>\d+)/$")
+
+MONTHS_GENITIVE = ["января", "февраля", "марта", "апреля", "мая", "июня", "июля",
+                   "августа", "сентября", "октября", "ноября", "декабря"]
+
+WORDS = ("правительство заявило сообщили источники агентства министерство компания рынок рост снижение "
+         "эксперты отметили регион области города президент решение проект закон данные года процентов "
+         "власти объявили планирует новые меры поддержки экономики граждан страны рубля курс банк").split()
+
+
+def _text(seed, words=250):
+    rnd = random.Random(seed)
+    return " ".join(rnd.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+class ReplayServer:
+    """
+    Генерирует страницы сайтов и отвечает на запросы с настраиваемыми задержкой и ошибками.
+
+    Аргументы:
+        categories (int): Количество категорий на главной странице каждого сайта.
+        articles_per_category (int): Количество статей на странице категории.
+        pages (int): Количество страниц в ленте категории.
+        fresh_articles (int, optional): Количество новых статей, публикуемых перед каждым запросом первой страницы
+            категории при `fresh`. По умолчанию равно `articles_per_category`.
+        latency_ms (float): Средняя задержка ответа в миллисекундах.
+        jitter_ms (float): Стандартное отклонение задержки в миллисекундах.
+        error_rate (float): Доля запросов, на которые отвечается ошибкой.
+        error_status (int): Статус ответа с ошибкой.
+        retry_after (int, optional): Значение заголовка `Retry-After` в ответах с ошибкой, в секундах.
+        crawl_delay (float, optional): Значение `Crawl-delay` в robots.txt.
+        fresh (bool): Возвращать новые ссылки при каждом запросе страницы категории.
+        use_snapshots (bool): Отдавать записанные страницы статей вместо синтетических.
+        seed (int): Начальное значение генератора случайных чисел.
+    """
+
+    def __init__(self, categories, articles_per_category, pages=1, fresh_articles=None, latency_ms=0, jitter_ms=0,
+                 error_rate=0, error_status=503, retry_after=None, crawl_delay=None, fresh=False, use_snapshots=True,
+                 seed=0):
+        self.categories = categories
+        self.articles_per_category = articles_per_category
+        self.pages = pages
+        self.fresh_articles = articles_per_category if fresh_articles is None else fresh_articles
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.crawl_delay = crawl_delay
+        self.fresh = fresh
+        self.random = random.Random(seed)
+        # Количество опубликованных статей в ленте каждой категории
+        self.published = {}
+        self.stats = {"requests": 0, "errors": 0, "robots": 0, "home": 0, "category": 0, "article": 0}
+
+        self.article_snapshots = {}
+        if use_snapshots:
+            for source in SITES.values():
+                self.article_snapshots[source] = [html for _, html in load_snapshots(source, "article", fixtures=False)]
+
+    def home_page(self, source):
+        names = [(f"cat{number}", f"Рубрика {number}") for number in range(self.categories)]
+
+        if source == "rbk":
+            items = "".join(f'<li><a href="https://www.rbc.ru/{path}/">{name}</a></li>' for path, name in names)
+            return f'<div class="footer__title">Рубрики</div><ul>{items}</ul>'
+        if source == "lenta":
+            items = "".join(
+                f'<li class="menu__nav-item"><a class="menu__nav-link _is-extra" href="/rubrics/{path}/">{name}</a></li>'
+                for path, name in names)
+            return f'<ul class="menu__nav-list">{items}</ul>'
+        if source == "ria":
+            items = "".join(f'<a href="/{path}/">{name}</a>' for path, name in names)
+            return f'<div class="cell-extension__table">{items}</div>'
+
+        # У Газеты первой категорией всегда идут новости, остальные берутся из меню
+        items = "".join(f'<div class="b_menu-item"><a href="/{path}/">{name}</a></div>' for path, name in names[1:])
+        return (f'<div class="b_control"><a class="b_nav-item" href="/">Главное</a>'
+                f'<a class="b_nav-item" href="/news/">Новости</a>{items}</div>')
+
+    def category_page(self, source, path, page=1):
+        category = path.strip("/").replace("/", "-") or "main"
+        key = (source, category)
+        if key not in self.published:
+            self.published[key] = self.articles_per_category * self.pages
+        elif self.fresh and page == 1:
+            self.published[key] += self.fresh_articles
+
+        # Статьи ленты нумеруются по порядку публикации, страницы идут от новых статей к старым
+        top = self.published[key] - (page - 1) * self.articles_per_category
+        bottom = max(top - self.articles_per_category, 0)
+        ids = [f"{category}-{index}" for index in range(top - 1, bottom - 1, -1)]
+        has_next = page < self.pages and bottom > 0
+        now = datetime.now()
+
+        if source == "rbk":
+            return "".join(
+                f'<div class="item__wrap l-col-center"><span>{now:%H:%M}</span>'
+                f'<a href="https://www.rbc.ru/{category}/{ARTICLE_MARKER}/{article_id}?from=newsfeed">x</a></div>'
+                for article_id in ids)
+        if source == "lenta":
+            links = "".join(f'<a href="/news/{ARTICLE_MARKER}/{article_id}/">x</a>' for article_id in ids)
+            more = f'<a class="loadmore js-loadmore" href="{path}{page + 1}/">Загрузить еще</a>' if has_next else ""
+            return f'<div class="rubric-page__container"><div class="longgrid-list">{links}</div>{more}</div>'
+        if source == "ria":
+            more = f'<div class="list-more" data-url="{path}more.html?page={page + 1}">Еще материалы</div>' if has_next else ""
+            return "".join(
+                f'<div class="list-item__content"><a class="list-item__title" '
+                f'href="https://ria.ru/{ARTICLE_MARKER}/{article_id}.html">Заголовок {article_id}</a></div>'
+                for article_id in ids) + more
+
+        links = "".join(f'<a href="/{category}/{ARTICLE_MARKER}/{article_id}.shtml">x</a>' for article_id in ids)
+        if has_next:
+            links += f'<a class="b_newslist-showmorebtn" href="{path}?page={page + 1}">Показать еще</a>'
+        return f'<div class="w_col4">x</div><div class="w_col4"><div class="row">{links}</div></div>'
+
+    @staticmethod
+    def split_page(source, path, query):
+        """
+        Возвращает путь категории и номер страницы из запроса страницы категории.
+        """
+        if source == "lenta":
+            match = LENTA_PAGE_PATTERN.match(path)
+            if match:
+                return match.group("path"), int(match.group("page"))
+            return path, 1
+        if source == "ria" and path.endswith("/more.html"):
+            path = path[:-len("more.html")]
+        return path, int(query.get("page", 1))
+
+    def article_page(self, source, path):
+        snapshots = self.article_snapshots.get(source)
+        if snapshots:
+            return snapshots[zlib.crc32(path.encode("utf-8")) % len(snapshots)]
+
+        title = f"Заголовок {path.rstrip('/').rsplit('/', 1)[-1]}"
+        text = _text(path)
+        now = datetime.now()
+        lenta_date = f"{now:%H:%M}, {now.day} {MONTHS_GENITIVE[now.month - 1]} {now.year}"
+        gazeta_date = f"{now.day} {MONTHS_GENITIVE[now.month - 1]} {now.year}, {now:%H:%M}"
+
+        if source == "rbk":
+            return f'<h1>{title}</h1><div class="article__text article__text_free"><p>{text}</p></div>'
+        if source == "lenta":
+            return (f'<div class="topic-page__container"><a class="topic-header__time">{lenta_date}</a>'
+                    f'<h1>{title}</h1><div class="topic-body"><p>{text}</p></div></div>')
+        if source == "ria":
+            return (f'<h1>{title}</h1><div class="article__info-date"><a>{now:%H:%M %d.%m.%Y}</a></div>'
+                    f'<div class="article__body"><div class="article__block" data-type="text">{text}</div></div>')
+        return (f'<h1 class="headline">{title}</h1><div class="breadcrumb"><time>{gazeta_date}</time></div>'
+                f'<div class="b_article-intro">{text[:200]}</div><div class="b_article-text">{text}</div>')
+
+    async def handle(self, request):
+        self.stats["requests"] += 1
+        delay = self.random.gauss(self.latency_ms, self.jitter_ms) if self.jitter_ms else self.latency_ms
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        source = SITES.get(request.match_info["host"])
+        if source is None:
+            raise web.HTTPNotFound()
+        path = "/" + request.match_info["path"]
+        if path == "/robots.txt":
+            self.stats["robots"] += 1
+            robots = "User-agent: *\nDisallow:\n"
+            if self.crawl_delay is not None:
+                robots += f"Crawl-delay: {self.crawl_delay:g}\n"
+            return web.Response(text=robots)
+
+        if self.random.random() < self.error_rate:
+            self.stats["errors"] += 1
+            headers = {"Retry-After": str(self.retry_after)} if self.retry_after is not None else None
+            return web.Response(status=self.error_status, headers=headers)
+
+        if path == "/":
+            kind, html = "home", self.home_page(source)
+        elif f"/{ARTICLE_MARKER}/" in path:
+            kind, html = "article", self.article_page(source, path)
+        else:
+            kind, html = "category", self.category_page(source, *self.split_page(source, path, request.query))
+
+        self.stats[kind] += 1
+        return web.Response(text=f"<html><body>{html}</body></html>", content_type="text/html")
+
+    async def handle_stats(self, request):
+        return web.json_response(self.stats)
+
+    def make_app(self):
+        app = web.Application()
+        app.router.add_get("/_stats", self.handle_stats)
+        app.router.add_get("/{host}/{path:.*}", self.handle)
+        return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1", help="Адрес сервера")
+    parser.add_argument("--port", type=int, default=8090, help="Порт сервера")
+    parser.add_argument("--categories", type=int, default=10, help="Количество категорий на сайт")
+    parser.add_argument("--articles-per-category", type=int, default=250, help="Количество статей в категории")
+    parser.add_argument("--pages", type=int, default=1, help="Количество страниц в ленте категории")
+    parser.add_argument("--fresh-articles", type=int,
+                        help="Новых статей в категории перед каждым запросом первой страницы при --fresh")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Средняя задержка ответа, мс")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Разброс задержки ответа, мс")
+    parser.add_argument("--error-rate", type=float, default=0, help="Доля ответов с ошибкой")
+    parser.add_argument("--error-status", type=int, default=503, help="Статус ответов с ошибкой")
+    parser.add_argument("--retry-after", type=int, help="Заголовок Retry-After в ответах с ошибкой, секунды")
+    parser.add_argument("--crawl-delay", type=float, help="Crawl-delay в robots.txt, секунды")
+    parser.add_argument("--fresh", action="store_true", help="Новые ссылки при каждом запросе категории")
+    parser.add_argument("--no-snapshots", action="store_true", help="Не использовать записанные страницы статей")
+    parser.add_argument("--seed", type=int, default=0, help="Начальное значение генератора случайных чисел")
+    args = parser.parse_args()
+
+    server = ReplayServer(
+        args.categories,
+        args.articles_per_category,
+        pages=args.pages,
+        fresh_articles=args.fresh_articles,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        retry_after=args.retry_after,
+        crawl_delay=args.crawl_delay,
+        fresh=args.fresh,
+        use_snapshots=not args.no_snapshots,
+        seed=args.seed,
+    )
+    web.run_app(server.make_app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import os
+import json
+import importlib
+
+# Каталог со страницами, записанными с сайтов: pages/<источник>/<вид страницы>/*.html (не хранится в git)
+SNAPSHOTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pages")
+
+# Каталог с небольшим набором страниц той же структуры, записанных с `benchmarks.replay_server`
+# и хранящихся в репозитории, чтобы бенчмарки работали без записи страниц с сайтов
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Источники: модуль скрапера и URL главной страницы
+SOURCES = {
+    "rbk": ("news_scrappers.rbk", "https://www.rbc.ru/"),
+    "lenta": ("news_scrappers.lenta", "https://lenta.ru/"),
+    "ria": ("news_scrappers.ria", "https://ria.ru/"),
+    "gazeta": ("news_scrappers.gazeta", "https://www.gazeta.ru/"),
+}
+
+# Виды страниц и соответствующие им методы извлечения скраперов
+PAGE_KINDS = {
+    "categories": "extract_categories",
+    "category": "extract_articles_in_category",
+    "article": "extract_article",
+}
+
+
+def load_scrapper(source):
+    """
+    Импортирует модуль скрапера указанного источника и возвращает его объект `SCRAPPER`.
+
+    Аргументы:
+        source (str): Название источника из `SOURCES`.
+
+    Возвращает:
+        SelectorScrapper: Скрапер источника с методами `extract_*` и `parse_*`.
+    """
+    return importlib.import_module(SOURCES[source][0]).SCRAPPER
+
+
+def _index_path(source, kind, directory=SNAPSHOTS_DIR):
+    return os.path.join(directory, source, kind, "index.json")
+
+
+def load_snapshots(source, kind, fixtures=True):
+    """
+    Загружает сохраненные страницы указанного вида для источника.
+    Если страницы с сайта не записаны, загружаются страницы из `FIXTURES_DIR`.
+
+    Аргументы:
+        source (str): Название источника из `SOURCES`.
+        kind (str): Вид страницы из `PAGE_KINDS`.
+        fixtures (bool, optional): Использовать страницы из `FIXTURES_DIR`, если записанных страниц нет.
+
+    Возвращает:
+        list: Список пар (url, html). Пустой, если страницы не найдены.
+    """
+    index_path = _index_path(source, kind)
+    if not os.path.exists(index_path) and fixtures:
+        index_path = _index_path(source, kind, FIXTURES_DIR)
+    if not os.path.exists(index_path):
+        return []
+
+    with open(index_path, encoding="utf-8") as file:
+        index = json.load(file)
+
+    snapshots = []
+    for entry in index:
+        with open(os.path.join(os.path.dirname(index_path), entry["file"]), encoding="utf-8") as file:
+            snapshots.append((entry["url"], file.read()))
+    return snapshots
+
+
+def save_snapshot(source, kind, url, html, directory=SNAPSHOTS_DIR):
+    """
+    Сохраняет страницу и добавляет ее в индекс страниц источника.
+
+    Аргументы:
+        source (str): Название источника из `SOURCES`.
+        kind (str): Вид страницы из `PAGE_KINDS`.
+        url (str): URL страницы.
+        html (str): HTML контент страницы.
+        directory (str, optional): Каталог страниц: `SNAPSHOTS_DIR` или `FIXTURES_DIR`.
+    """
+    index_path = _index_path(source, kind, directory)
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+
+    index = []
+    if os.path.exists(index_path):
+        with open(index_path, encoding="utf-8") as file:
+            index = json.load(file)
+
+    index = [entry for entry in index if entry["url"] != url]
+    file_name = f"{len(index):04d}.html"
+    with open(os.path.join(os.path.dirname(index_path), file_name), mode="w", encoding="utf-8") as file:
+        file.write(html)
+    index.append({"file": file_name, "url": url})
+
+    with open(index_path, mode="w", encoding="utf-8") as file:
+        json.dump(index, file, ensure_ascii=False, indent=2)
@@ -46,6 +46,390 @@ GLOBAL_SCRAPPER_SERVER_GET_NEWS_DATA_API_PATH = os.getenv('GLOBAL_SCRAPPER_SERVE
 NEWS_DATA_API_PATH = GLOBAL_SCRAPPER_SERVER_GET_NEWS_DATA_API_PATH if GLOBAL_SCRAPPER_SERVER_GET_NEWS_DATA_API_PATH else SCRAPPER_SERVER_GET_NEWS_DATA_API_PATH
 
 
+# ----- Настройка хранения данных -----
+
+"""
+-- SCRAPPER_DATA_DIR --
+
+Каталог, в котором хранятся собранные новости и служебные файлы к ним.
+По умолчанию каталог `data` рядом с проектом.
+"""
+DATA_DIR = os.getenv('SCRAPPER_DATA_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data'))
+
+# Файл с собранными новостями
+NEWS_DATA_FILE = os.path.join(DATA_DIR, 'news_data.csv')
+
+"""
+-- SCRAPPER_DATA_PARTITIONING --
+
+Разбиение CSV-файла с новостями по времени записи: `none` (один файл, по умолчанию),
+`month` (news_data_2024_05.csv) или `day` (news_data_2024_05_17.csv).
+"""
+DATA_PARTITIONING = os.getenv('SCRAPPER_DATA_PARTITIONING', 'none')
+
+"""
+-- SCRAPPER_DEDUP_WINDOW_PARTITIONS --
+
+Количество последних разделов (включая текущий), в которых ищутся дубликаты статей
+при разбиении CSV-файла по времени.
+"""
+DEDUP_WINDOW_PARTITIONS = int(os.getenv('SCRAPPER_DEDUP_WINDOW_PARTITIONS', 2))
+
+"""
+-- SCRAPPER_DEDUP_MODE --
+
+Индекс известных ссылок для CSV-файла: `set` (все ссылки в памяти, по умолчанию) или `bloom`
+(фильтр Блума с ограниченным расходом памяти; возможные совпадения подтверждаются по CSV).
+"""
+DEDUP_MODE = os.getenv('SCRAPPER_DEDUP_MODE', 'set')
+
+"""
+-- SCRAPPER_BLOOM_CAPACITY, SCRAPPER_BLOOM_ERROR_RATE, SCRAPPER_BLOOM_RECENT_LINKS --
+
+Ожидаемое количество ссылок в фильтре Блума, допустимая доля ложноположительных ответов
+и количество последних ссылок, которые хранятся точно и подтверждают ответы фильтра без чтения CSV.
+"""
+BLOOM_CAPACITY = int(os.getenv('SCRAPPER_BLOOM_CAPACITY', 1_000_000))
+BLOOM_ERROR_RATE = float(os.getenv('SCRAPPER_BLOOM_ERROR_RATE', 0.001))
+BLOOM_RECENT_LINKS = int(os.getenv('SCRAPPER_BLOOM_RECENT_LINKS', 100_000))
+
+"""
+-- SCRAPPER_NEAR_DUPLICATES --
+
+Поиск почти одинаковых статей разных источников (MinHash/LSH, требуется numpy):
+`off` (по умолчанию), `mark` (статьи сохраняются, найденные пары пишутся в near_duplicates.jsonl)
+или `collapse` (почти дубликаты не сохраняются, но тоже попадают в журнал).
+"""
+NEAR_DUPLICATES_MODE = os.getenv('SCRAPPER_NEAR_DUPLICATES', 'off')
+
+# Индекс MinHash/LSH последних статей и журнал найденных почти дубликатов
+NEAR_DUPLICATES_INDEX_FILE = os.path.join(DATA_DIR, 'near_duplicates.npz')
+NEAR_DUPLICATES_LOG_FILE = os.path.join(DATA_DIR, 'near_duplicates.jsonl')
+
+"""
+-- SCRAPPER_NEAR_DUPLICATES_THRESHOLD, SCRAPPER_NEAR_DUPLICATES_WINDOW --
+
+Минимальное оценочное сходство текстов (0..1), при котором статьи считаются почти дубликатами,
+и количество последних статей, с которыми сравнивается новая статья.
+"""
+NEAR_DUPLICATES_THRESHOLD = float(os.getenv('SCRAPPER_NEAR_DUPLICATES_THRESHOLD', 0.8))
+NEAR_DUPLICATES_WINDOW = int(os.getenv('SCRAPPER_NEAR_DUPLICATES_WINDOW', 50_000))
+
+"""
+-- SCRAPPER_STORAGE_BACKENDS --
+
+Хранилища статей через запятую: `csv` (файл news_data.csv, как раньше) и/или `sqlite`
+(база news_data.sqlite3 с индексами). Первое хранилище используется для проверки дубликатов.
+Например, `csv,sqlite` ведет базу SQLite параллельно с CSV-файлом.
+"""
+STORAGE_BACKENDS = [backend.strip() for backend in os.getenv('SCRAPPER_STORAGE_BACKENDS', 'csv').split(',') if backend.strip()]
+
+# База SQLite с собранными новостями
+SQLITE_DATA_FILE = os.path.join(DATA_DIR, 'news_data.sqlite3')
+
+"""
+-- SCRAPPER_SQLITE_BATCH_SIZE --
+
+Количество статей, вставляемых в SQLite одной транзакцией.
+"""
+SQLITE_BATCH_SIZE = int(os.getenv('SCRAPPER_SQLITE_BATCH_SIZE', 200))
+
+"""
+-- SCRAPPER_SNAPSHOT_ENCODINGS --
+
+Сжатые снимки файла с новостями, которые обновляются после каждого цикла и отдаются клиентам
+с соответствующим `Accept-Encoding`: `gzip` и/или `zstd` через запятую (для `zstd` нужен пакет `zstandard`).
+Пустое значение отключает снимки.
+"""
+SNAPSHOT_ENCODINGS = [encoding.strip() for encoding in os.getenv('SCRAPPER_SNAPSHOT_ENCODINGS', 'gzip').split(',') if encoding.strip()]
+
+"""
+-- SCRAPPER_UPDATES_PAGE_LIMIT --
+
+Количество строк на одной странице выдачи новых статей по курсору (маршрут `<API_PATH>/updates`),
+если клиент не указал `limit`, и максимальное количество строк, которое клиент может запросить.
+"""
+UPDATES_PAGE_LIMIT = int(os.getenv('SCRAPPER_UPDATES_PAGE_LIMIT', 1000))
+UPDATES_MAX_PAGE_LIMIT = int(os.getenv('SCRAPPER_UPDATES_MAX_PAGE_LIMIT', 10000))
+
+
+# ----- Настройка скрапера -----
+
+"""
+-- SCRAPPER_FETCH_GLOBAL_LIMIT --
+
+Максимальное количество одновременных HTTP-запросов за цикл скрапинга по всем источникам.
+"""
+FETCH_GLOBAL_LIMIT = int(os.getenv('SCRAPPER_FETCH_GLOBAL_LIMIT', 32))
+
+"""
+-- SCRAPPER_FETCH_PER_HOST_LIMIT --
+
+Максимальное количество одновременных HTTP-запросов к одному хосту (rbc.ru, lenta.ru и т.д.).
+"""
+FETCH_PER_HOST_LIMIT = int(os.getenv('SCRAPPER_FETCH_PER_HOST_LIMIT', 6))
+
+"""
+-- SCRAPPER_ARTICLE_QUEUE_SIZE --
+
+Размер очереди статей между скраперами и задачей записи в CSV.
+Когда очередь заполнена, скраперы ждут, пока статьи будут записаны, поэтому память ограничена.
+"""
+ARTICLE_QUEUE_SIZE = int(os.getenv('SCRAPPER_ARTICLE_QUEUE_SIZE', 100))
+
+"""
+-- SCRAPPER_CATEGORY_CACHE_TTL --
+
+Время в секундах, в течение которого сохраненный список категорий источника (`data/categories.json`)
+используется без загрузки главной страницы. Устаревший список используется в цикле, пока новый загружается
+в фоне; если загрузка не удалась, остается последний удачный список. 0 — обновлять в фоне каждый цикл.
+"""
+CATEGORY_CACHE_TTL = float(os.getenv('SCRAPPER_CATEGORY_CACHE_TTL', 6 * 60 * 60))
+
+# Файл с сохраненными списками категорий источников
+CATEGORY_CACHE_FILE = os.path.join(DATA_DIR, 'categories.json')
+
+"""
+-- SCRAPPER_CATEGORY_MAX_PAGES --
+
+Наибольшее количество страниц списка статей («показать еще», пагинация), которое загружается в одной
+категории за цикл. Первая страница загружается всегда; следующая — только если на текущей странице
+не встретилось `SCRAPPER_CATEGORY_KNOWN_RUN` уже сохраненных ссылок подряд (или вся страница
+состоит из таких ссылок), то есть с прошлого цикла вышло больше статей, чем помещается на странице.
+Значение 1 отключает догрузку.
+"""
+CATEGORY_MAX_PAGES = int(os.getenv('SCRAPPER_CATEGORY_MAX_PAGES', 5))
+
+"""
+-- SCRAPPER_CATEGORY_KNOWN_RUN --
+
+Количество уже сохраненных ссылок подряд на странице категории, после которого следующие страницы
+категории не загружаются.
+"""
+CATEGORY_KNOWN_RUN = int(os.getenv('SCRAPPER_CATEGORY_KNOWN_RUN', 5))
+
+"""
+-- SCRAPPER_PARSE_WORKERS --
+
+Количество процессов в пуле парсинга HTML. При значении 0 парсинг выполняется
+в основном процессе, как раньше; при положительном значении BeautifulSoup работает
+в отдельных процессах, не блокируя цикл событий с загрузками.
+"""
+PARSE_WORKERS = int(os.getenv('SCRAPPER_PARSE_WORKERS', 0))
+
+"""
+-- SCRAPPER_HTML_PARSER --
+
+Движок разбора HTML: `html.parser` (встроенный), `lxml` или `selectolax`.
+Для `lxml` и `selectolax` требуется установить соответствующий пакет.
+"""
+HTML_PARSER_BACKEND = os.getenv('SCRAPPER_HTML_PARSER', 'html.parser')
+
+"""
+-- SCRAPPER_HTML_PARSE_SUBTREES --
+
+Разбирать только поддеревья страницы, объявленные скрапером (например, `article__body`),
+вместо построения полного дерева документа. Установите `0`, чтобы разбирать страницу целиком.
+"""
+HTML_PARSE_SUBTREES = os.getenv('SCRAPPER_HTML_PARSE_SUBTREES', '1') != '0'
+
+"""
+-- SCRAPPER_HTTP_CACHE_MAX_BYTES --
+
+Максимальный размер дискового кэша главных страниц и страниц категорий (`data/http_cache`) в байтах.
+При превышении удаляются записи, к которым дольше всего не обращались. Значение 0 отключает кэш.
+"""
+HTTP_CACHE_MAX_BYTES = int(os.getenv('SCRAPPER_HTTP_CACHE_MAX_BYTES', 50 * 1024 * 1024))
+
+"""
+-- SCRAPPER_FETCH_URL_REWRITE --
+
+Адрес локального сервера, на который перенаправляются все запросы скраперов, например
+`http://127.0.0.1:8090` для сервера `benchmarks.replay_server`. URL `https://lenta.ru/rubrics/russia/`
+превращается в `http://127.0.0.1:8090/lenta.ru/rubrics/russia/`. По умолчанию запросы идут на сайты.
+"""
+FETCH_URL_REWRITE = os.getenv('SCRAPPER_FETCH_URL_REWRITE')
+
+"""
+-- SCRAPPER_FETCH_TIMEOUT / SCRAPPER_FETCH_CONNECT_TIMEOUT --
+
+Тайм-аут одной попытки запроса целиком и тайм-аут установки соединения, в секундах.
+"""
+FETCH_TIMEOUT = float(os.getenv('SCRAPPER_FETCH_TIMEOUT', 30))
+FETCH_CONNECT_TIMEOUT = float(os.getenv('SCRAPPER_FETCH_CONNECT_TIMEOUT', 10))
+
+"""
+-- SCRAPPER_FETCH_RETRIES --
+
+Количество повторов запроса после ошибки соединения, тайм-аута или ответа 429/5xx.
+"""
+FETCH_RETRIES = int(os.getenv('SCRAPPER_FETCH_RETRIES', 2))
+
+"""
+-- SCRAPPER_FETCH_BACKOFF_BASE / SCRAPPER_FETCH_BACKOFF_MAX --
+
+Пауза перед повтором выбирается случайно от 0 до `BASE * 2 ** номер_попытки` секунд, но не больше `MAX`.
+"""
+FETCH_BACKOFF_BASE = float(os.getenv('SCRAPPER_FETCH_BACKOFF_BASE', 0.5))
+FETCH_BACKOFF_MAX = float(os.getenv('SCRAPPER_FETCH_BACKOFF_MAX', 8))
+
+"""
+-- SCRAPPER_FETCH_RETRY_AFTER_MAX --
+
+Наибольшая пауза из заголовка `Retry-After` в секундах, которую скрапер выдерживает в цикле.
+При более длинной паузе запрос не повторяется, а запросы к сайту приостанавливаются на это время.
+"""
+FETCH_RETRY_AFTER_MAX = float(os.getenv('SCRAPPER_FETCH_RETRY_AFTER_MAX', 60))
+
+"""
+-- SCRAPPER_CIRCUIT_BREAKER_MIN_REQUESTS / SCRAPPER_CIRCUIT_BREAKER_ERROR_RATE --
+
+Предохранитель хоста: если после `MIN_REQUESTS` запросов к сайту в цикле доля сбоев достигла `ERROR_RATE`,
+оставшиеся запросы к этому сайту в цикле не выполняются, чтобы недоступный сайт не задерживал весь цикл.
+"""
+CIRCUIT_BREAKER_MIN_REQUESTS = int(os.getenv('SCRAPPER_CIRCUIT_BREAKER_MIN_REQUESTS', 10))
+CIRCUIT_BREAKER_ERROR_RATE = float(os.getenv('SCRAPPER_CIRCUIT_BREAKER_ERROR_RATE', 0.5))
+
+"""
+-- SCRAPPER_RATE_LIMIT / SCRAPPER_RATE_LIMIT_BURST --
+
+Скорость запросов к одному сайту (запросов в секунду) и количество запросов, которые можно выполнить
+подряд без ожидания. Значение 0 отключает ограничение скорости.
+"""
+RATE_LIMIT = float(os.getenv('SCRAPPER_RATE_LIMIT', 5))
+RATE_LIMIT_BURST = int(os.getenv('SCRAPPER_RATE_LIMIT_BURST', 5))
+
+"""
+-- SCRAPPER_RATE_LIMIT_HOSTS --
+
+Скорость запросов для отдельных сайтов через запятую, например `www.rbc.ru=2,ria.ru=3`.
+Для остальных сайтов используется `SCRAPPER_RATE_LIMIT`.
+"""
+RATE_LIMIT_HOSTS = {
+    host.strip(): float(rate)
+    for host, rate in (
+        item.split('=', 1) for item in os.getenv('SCRAPPER_RATE_LIMIT_HOSTS', '').split(',') if '=' in item
+    )
+}
+
+"""
+-- SCRAPPER_ROBOTS_CRAWL_DELAY --
+
+Учитывать `Crawl-delay` и `Request-rate` из robots.txt сайтов: если сайт просит запрашивать страницы реже,
+чем задано в `SCRAPPER_RATE_LIMIT`, используется скорость из robots.txt. Установите `0`, чтобы не читать robots.txt.
+"""
+ROBOTS_CRAWL_DELAY = os.getenv('SCRAPPER_ROBOTS_CRAWL_DELAY', '1') != '0'
+
+# Файл с сохраненными задержками из robots.txt
+ROBOTS_CACHE_FILE = os.path.join(DATA_DIR, 'robots.json')
+
+"""
+-- SCRAPPER_ROBOTS_CACHE_TTL --
+
+Время в секундах, в течение которого сохраненные данные robots.txt используются без повторной загрузки.
+"""
+ROBOTS_CACHE_TTL = float(os.getenv('SCRAPPER_ROBOTS_CACHE_TTL', 24 * 60 * 60))
+
+# ----- Настройка профилирования -----
+
+"""
+-- SCRAPPER_PROFILE_CYCLES --
+
+Количество первых циклов скрапинга процесса, которые профилируются: время функций (cProfile),
+места выделения памяти (tracemalloc) и блокировки цикла событий. Отчеты сохраняются
+в `logs/profiles`. По умолчанию 0 — профилирование отключено и не замедляет циклы.
+"""
+PROFILE_CYCLES = int(os.getenv('SCRAPPER_PROFILE_CYCLES', 0))
+
+# Каталог отчетов профилирования
+PROFILE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs', 'profiles')
+
+"""
+-- SCRAPPER_PROFILE_SLOW_CALLBACK_MS --
+
+Порог в миллисекундах, после которого блокировка цикла событий (например, разбор страницы
+или запись на диск без `await`) попадает в отчет профилирования вместе со стеком блокирующего кода.
+"""
+PROFILE_SLOW_CALLBACK_MS = float(os.getenv('SCRAPPER_PROFILE_SLOW_CALLBACK_MS', 50))
+
+# ----- Настройка расписания опроса источников -----
+
+"""
+-- SCRAPPER_POLL_MIN_INTERVAL / SCRAPPER_POLL_MAX_INTERVAL --
+
+Границы интервала опроса одного источника в секундах. Интервал каждого источника
+подстраивается под скорость появления новых статей, но не выходит за эти границы.
+"""
+POLL_MIN_INTERVAL = float(os.getenv('SCRAPPER_POLL_MIN_INTERVAL', 120))
+POLL_MAX_INTERVAL = float(os.getenv('SCRAPPER_POLL_MAX_INTERVAL', 1800))
+
+"""
+-- SCRAPPER_POLL_INITIAL_INTERVAL --
+
+Интервал опроса источника в секундах до того, как накоплена статистика по нему.
+"""
+POLL_INITIAL_INTERVAL = float(os.getenv('SCRAPPER_POLL_INITIAL_INTERVAL', 600))
+
+"""
+-- SCRAPPER_POLL_TARGET_ARTICLES --
+
+Желаемое количество новых статей за один опрос источника. По нему вычисляется интервал опроса.
+"""
+POLL_TARGET_ARTICLES = int(os.getenv('SCRAPPER_POLL_TARGET_ARTICLES', 20))
+
+# ----- Настройка источников -----
+
+"""
+-- SCRAPPER_SOURCES --
+
+Источники, которые скрапятся, через запятую, например `RBK,RIA`. Модули скраперов остальных источников
+не импортируются. Пустое значение включает все источники реестра (`news_scrappers/registry.py`).
+"""
+SOURCES_ENABLED = [source.strip() for source in os.getenv('SCRAPPER_SOURCES', '').split(',') if source.strip()]
+
+"""
+-- SCRAPPER_SOURCE_PLUGINS --
+
+Дополнительные источники через запятую в виде `название=модуль`, например `Tass=plugins.tass`.
+Модуль должен определять объект `SCRAPPER` (см. `news_scrappers/engine.py`).
+"""
+SOURCE_PLUGINS = {
+    name.strip(): module.strip()
+    for name, module in (
+        item.split('=', 1) for item in os.getenv('SCRAPPER_SOURCE_PLUGINS', '').split(',') if '=' in item
+    )
+}
+
+# ----- Настройка пула соединений -----
+
+"""
+-- SCRAPPER_CONNECTOR_LIMIT --
+
+Максимальное количество открытых соединений в пуле сессии, которая живет между циклами скрапинга.
+"""
+CONNECTOR_LIMIT = int(os.getenv('SCRAPPER_CONNECTOR_LIMIT', 100))
+
+"""
+-- SCRAPPER_CONNECTOR_LIMIT_PER_HOST --
+
+Максимальное количество открытых соединений в пуле к одному хосту.
+"""
+CONNECTOR_LIMIT_PER_HOST = int(os.getenv('SCRAPPER_CONNECTOR_LIMIT_PER_HOST', 10))
+
+"""
+-- SCRAPPER_DNS_CACHE_TTL --
+
+Время хранения результатов DNS-запросов в пуле соединений, в секундах.
+"""
+DNS_CACHE_TTL = int(os.getenv('SCRAPPER_DNS_CACHE_TTL', 3600))
+
+"""
+-- SCRAPPER_KEEPALIVE_TIMEOUT --
+
+Время, в течение которого неиспользуемое keep-alive соединение остается открытым, в секундах.
+"""
+KEEPALIVE_TIMEOUT = float(os.getenv('SCRAPPER_KEEPALIVE_TIMEOUT', 60))
+
 
 # Логгеры для различных компонентов
 server_logger = setup_logger("server", "server")
@@ -0,0 +1,350 @@
+import asyncio
+import os
+import sys
+from urllib.parse import urljoin
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from tools.html_parser import make_soup, select, select_one
+from tools.pars_time_text import parse_time_text, parse_time_texts
+
+
+class SelectorScrapper:
+    """
+    Скрапер новостного сайта, описанный CSS-селекторами.
+
+    Все источники проходят одинаковый путь: главная страница -> список категорий ->
+    страницы списка статей категории -> страницы статей. Скрапер источника — небольшой подкласс,
+    который задает URL, поддеревья и селекторы страниц в атрибутах класса, а для разметки,
+    которую селекторами не описать, переопределяет методы `category_elements`, `category_link`,
+    `article_elements` или `article_link`.
+
+    Селекторы компилируются один раз на процесс (см. `tools.html_parser.compile_selector`).
+    Методы `extract_*` выполняются в пуле процессов парсинга, поэтому подкласс должен быть
+    определен на уровне модуля, а его экземпляр не должен хранить состояние.
+
+    Поле `date` страницы категории или статьи разбирается `parse_time_text` по формату источника `name`,
+    остальные поля — текст элемента (см. `spaced_fields`). Поле `link` страницы категории — ссылка
+    на статью из атрибута href.
+    """
+
+    # Название источника (поле `news_source_name` и формат времени), URL главной страницы и логгер
+    name = None
+    main_url = None
+    logger = None
+
+    # Главная страница: поддеревья для разбора, первый подходящий контейнер меню (None — вся страница),
+    # ссылки категорий внутри него и названия категорий, которые не скрапятся
+    categories_subtrees = None
+    categories_container = None
+    categories_selector = None
+    skip_categories = ()
+
+    # Страница категории: элементы статей, поля статьи внутри элемента (поле -> селектор,
+    # None — сам элемент), кнопка следующей страницы и ее атрибуты с адресом страницы.
+    # Элементы статей можно задать кортежем селекторов, каждый из которых ищется внутри элементов,
+    # найденных предыдущим: это в несколько раз быстрее селектора с комбинатором потомка,
+    # для которого soupsieve проверяет предков каждого кандидата
+    category_subtrees = None
+    articles_selector = None
+    article_item_fields = {"link": None}
+    next_page_selector = None
+    next_page_attributes = ("href",)
+
+    # Страница статьи: поля статьи (поле -> селектор первого подходящего элемента или кортеж селекторов,
+    # проверяемых по порядку: берется элемент первого селектора, для которого он нашелся),
+    # блоки текста статьи и вставки, которые вырезаются из текста. Строка `text_selector` берет
+    # все подходящие блоки, кортеж — первый подходящий блок каждого селектора по порядку
+    article_subtrees = None
+    article_fields = {}
+    text_selector = None
+    text_remove_selector = None
+
+    # Поля, текст вложенных элементов которых склеивается через пробел, как в тексте статьи.
+    # Текст остальных полей склеивается без разделителя
+    spaced_fields = ()
+
+    def field_text(self, field, node):
+        """
+        Возвращает текст поля статьи из элемента.
+        """
+        if field in self.spaced_fields:
+            return node.get_text(separator=" ", strip=True)
+        return node.get_text(strip=True)
+
+    def category_elements(self, soup):
+        """
+        Возвращает элементы ссылок категорий главной страницы.
+        """
+        root = soup
+        if self.categories_container is not None:
+            root = select_one(soup, self.categories_container)
+            if root is None:
+                return []
+        return select(root, self.categories_selector)
+
+    def category_link(self, href, url):
+        """
+        Возвращает абсолютную ссылку на категорию.
+        """
+        return urljoin(url, href)
+
+    def article_elements(self, soup):
+        """
+        Возвращает элементы статей страницы категории.
+        """
+        selectors = self.articles_selector
+        if isinstance(selectors, str):
+            return select(soup, selectors)
+        elements = [soup]
+        for selector in selectors:
+            elements = [element for parent in elements for element in select(parent, selector)]
+        return elements
+
+    def article_link(self, href, url):
+        """
+        Возвращает абсолютную ссылку на статью со страницы категории `url`.
+        """
+        return urljoin(self.main_url, href)
+
+    def extract_categories(self, html, url):
+        """
+        Извлекает категории новостей из HTML главной страницы.
+
+        Args:
+            html (str): HTML главной страницы.
+            url (str): URL главной страницы для построения ссылок на категории.
+
+        Returns:
+            list: Список словарей, представляющих категории новостей, содержащий имя и ссылку на категорию.
+        """
+        soup = make_soup(html, self.categories_subtrees)
+
+        categories = []
+        for element in self.category_elements(soup):
+            name = element.get_text(strip=True)
+            if name in self.skip_categories or not element.get("href"):
+                continue
+            categories.append({"name": name, "link": self.category_link(element["href"], url)})
+        return categories
+
+    def extract_articles_in_category(self, html, url):
+        """
+        Извлекает статьи из HTML страницы категории.
+
+        Args:
+            html (str): HTML страницы категории.
+            url (str): URL категории новостей.
+
+        Returns:
+            list: Список словарей, представляющих статьи, содержащий ссылку на статью
+                и поля из `article_item_fields`.
+        """
+        return self.extract_category_page(html, url)["articles"]
+
+    def extract_category_page(self, html, url):
+        """
+        Извлекает статьи и ссылку на следующую страницу из HTML страницы категории.
+
+        Args:
+            html (str): HTML страницы категории.
+            url (str): URL страницы категории.
+
+        Returns:
+            dict: Список статей ('articles') и URL следующей страницы или None ('next_page').
+        """
+        soup = make_soup(html, self.category_subtrees)
+
+        articles = []
+        for element in self.article_elements(soup):
+            article = {}
+            for field, selector in self.article_item_fields.items():
+                node = element if selector is None else select_one(element, selector)
+                if node is None:
+                    break
+                if field == "link":
+                    if not node.get("href"):
+                        break
+                    article["link"] = self.article_link(node["href"], url)
+                else:
+                    article[field] = self.field_text(field, node)
+            else:
+                articles.append(article)
+
+        if "date" in self.article_item_fields:
+            dates = parse_time_texts([article["date"] for article in articles], self.name)
+            for article, article_date in zip(articles, dates):
+                article["date"] = article_date
+
+        return {"articles": articles, "next_page": self.next_page(soup)}
+
+    def next_page(self, soup):
+        """
+        Возвращает URL следующей страницы списка из кнопки «Показать еще» или None.
+        """
+        if self.next_page_selector is None:
+            return None
+        button = select_one(soup, self.next_page_selector)
+        if button is None:
+            return None
+        for attribute in self.next_page_attributes:
+            if button.get(attribute):
+                return urljoin(self.main_url, button[attribute])
+        return None
+
+    def extract_article(self, html, url):
+        """
+        Извлекает поля и текст статьи из HTML страницы статьи.
+
+        Args:
+            html (str): HTML страницы статьи.
+            url (str): URL статьи.
+
+        Returns:
+            dict: Словарь, представляющий статью, с полями из `article_fields` и текстом статьи ('text').
+        """
+        soup = make_soup(html, self.article_subtrees)
+
+        article = {}
+        for field, selectors in self.article_fields.items():
+            if isinstance(selectors, str):
+                selectors = (selectors,)
+            node = next(
+                (node for node in (select_one(soup, selector) for selector in selectors) if node is not None), None)
+            if node is not None:
+                article[field] = self.field_text(field, node)
+        if "date" in article:
+            article["date"] = parse_time_text(article["date"], self.name)
+
+        if self.text_selector is not None:
+            if isinstance(self.text_selector, str):
+                blocks = select(soup, self.text_selector)
+            else:
+                blocks = [block for block in (select_one(soup, selector) for selector in self.text_selector)
+                          if block is not None]
+            if self.text_remove_selector is not None:
+                for block in blocks:
+                    for incut in select(block, self.text_remove_selector):
+                        incut.decompose()
+            article["text"] = " ".join(block.get_text(separator=" ", strip=True) for block in blocks)
+
+        return article
+
+    async def parse_categories(self, context, url):
+        """
+        Асинхронно парсит категории новостей с указанного URL.
+
+        Args:
+            context (ScrapeContext): Контекст цикла скрапинга с сессией и общим планировщиком запросов.
+            url (str): URL главной страницы источника.
+
+        Returns:
+            list: Список словарей, представляющих категории новостей, содержащий имя и ссылку на категорию.
+        """
+        self.logger.info("Parsing categories from %s", url)
+        try:
+            html = await context.fetch_html(url, cacheable=True)
+            if html is None:
+                self.logger.warning("Failed to fetch categories page %s", url)
+                return []
+            categories = await context.parse(self.extract_categories, html, url)
+            self.logger.info("Found %d categories", len(categories))
+            return categories
+        except Exception as e:
+            self.logger.error("Error parsing categories: %s", e)
+        return []
+
+    async def parse_articles_in_category(self, context, url):
+        """
+        Асинхронно парсит статьи в указанной категории новостей.
+        Страницы списка загружаются от новых статей к старым, пока не встретятся уже сохраненные ссылки
+        (см. `ScrapeContext.crawl_category`).
+
+        Args:
+            context (ScrapeContext): Контекст цикла скрапинга с сессией и общим планировщиком запросов.
+            url (str): URL категории новостей.
+
+        Returns:
+            list: Список словарей, представляющих новые статьи, содержащий ссылки на статьи.
+        """
+        self.logger.info("-- Parsing articles in category %s", url)
+        try:
+            articles = await context.crawl_category(url, self.extract_category_page)
+            if articles is None:
+                self.logger.warning("-- Failed to fetch category %s, skipping", url)
+                return []
+            self.logger.info("-- Found %d articles in category %s", len(articles), url)
+            return articles
+        except Exception as e:
+            self.logger.error("-- Error parsing articles in category %s: %s", url, e)
+        return []
+
+    async def parse_articles(self, context, url):
+        """
+        Асинхронно парсит полную статью по указанному URL.
+
+        Args:
+            context (ScrapeContext): Контекст цикла скрапинга с сессией и общим планировщиком запросов.
+            url (str): URL статьи.
+
+        Returns:
+            dict: Словарь, представляющий статью, или None, если страницу не удалось загрузить.
+        """
+        self.logger.info("-- -- Parsing full article from %s", url)
+        try:
+            html = await context.fetch_html(url)
+            if html is None:
+                self.logger.warning("-- -- Failed to fetch article %s, skipping", url)
+                return None
+            return await context.parse(self.extract_article, html, url)
+        except Exception as e:
+            self.logger.error("-- -- Error parsing article %s: %s", url, e)
+        return {}
+
+    async def scrape(self, context):
+        """
+        Асинхронно получает новости источника.
+
+        Категории и статьи загружаются параллельно через общий планировщик запросов контекста,
+        а каждая готовая статья сразу передается в очередь записи. Поля статьи со страницы статьи
+        дополняют поля, найденные на странице категории (например, дату у RBC.ru или заголовок у RIA.ru).
+
+        Args:
+            context (ScrapeContext): Контекст цикла скрапинга с сессией и общим планировщиком запросов.
+
+        Returns:
+            int: Количество статей, переданных в очередь записи.
+        """
+        async def scrape_article(category, element):
+            full_article = await self.parse_articles(context, element["link"])
+            if full_article is None:
+                return 0
+            fields = {**element, **full_article}
+            single_article = {
+                "news_source_name": self.name,
+                "news_source_link": self.main_url,
+                "category_name": category["name"],
+                "category_link": category["link"],
+                "article_date": fields.get("date", ""),
+                "article_link": element["link"],
+                "article_title": fields.get("title", ""),
+                "article_text": fields.get("text", ""),
+            }
+            await context.emit(single_article)
+            self.logger.info("-- -- Added article: %s", single_article["article_link"])
+            return 1
+
+        async def scrape_category(category):
+            articles = await self.parse_articles_in_category(context, category["link"])
+            added = await asyncio.gather(
+                *(scrape_article(category, element) for element in articles)
+            )
+            return sum(added)
+
+        categories = await context.categories(self.name, self.parse_categories, self.main_url)
+        categories_counts = await asyncio.gather(
+            *(scrape_category(category) for category in categories)
+        )
+        total_articles = sum(categories_counts)
+
+        self.logger.info("Total articles scraped: %d", total_articles)
+        return total_articles
@@ -0,0 +1,58 @@
+import importlib
+from config import SOURCES_ENABLED, SOURCE_PLUGINS
+
+# Встроенные источники новостей: название источника -> модуль скрапера.
+# Модуль импортируется только при первом запуске источника и должен определять объект `SCRAPPER`
+# (обычно экземпляр подкласса `news_scrappers.engine.SelectorScrapper`).
+SOURCES = {
+    "RBK": "news_scrappers.rbk",
+    "Lenta": "news_scrappers.lenta",
+    "RIA": "news_scrappers.ria",
+    "Gazeta": "news_scrappers.gazeta",
+}
+
+_scrappers = {}
+
+
+def registered_sources():
+    """
+    Возвращает все известные источники: встроенные и подключенные через `SCRAPPER_SOURCE_PLUGINS`.
+
+    Возвращает:
+        dict: Название источника -> модуль скрапера.
+    """
+    return {**SOURCES, **SOURCE_PLUGINS}
+
+
+def enabled_sources():
+    """
+    Возвращает названия источников, включенных в `SCRAPPER_SOURCES` (по умолчанию все известные).
+
+    Возвращает:
+        list: Названия источников.
+
+    Raises:
+        ValueError: Если включен источник, которого нет в реестре.
+    """
+    sources = registered_sources()
+    if not SOURCES_ENABLED:
+        return list(sources)
+    unknown = [name for name in SOURCES_ENABLED if name not in sources]
+    if unknown:
+        raise ValueError(f"Unknown news sources: {', '.join(unknown)}")
+    return list(SOURCES_ENABLED)
+
+
+def load_scrapper(name):
+    """
+    Импортирует модуль скрапера источника при первом обращении и возвращает его объект `SCRAPPER`.
+
+    Аргументы:
+        name (str): Название источника.
+
+    Возвращает:
+        SelectorScrapper: Скрапер источника.
+    """
+    if name not in _scrappers:
+        _scrappers[name] = importlib.import_module(registered_sources()[name]).SCRAPPER
+    return _scrappers[name]
@@ -1,132 +1,253 @@
 import asyncio
 import aiohttp
-from aiohttp import ClientSession
+import time
+from contextlib import nullcontext
 import os
-import csv
-from config import scrapper_logger
-from news_scrappers.rbk import async_rbk_news_scrapper
-from news_scrappers.lenta import async_lenta_news_scrapper
-from news_scrappers.ria import async_ria_news_scrapper
-from news_scrappers.gazeta import async_gazeta_news_scrapper
-from tools.existing_articles import read_existing_articles
-
-# Словарь, сопоставляющий источники новостей и соответствующие им асинхронные функции-скраперы
-SCRAPPERS = {
-    "RBK": async_rbk_news_scrapper,
-    "Lenta": async_lenta_news_scrapper,
-    "RIA": async_ria_news_scrapper,
-    "Gazeta": async_gazeta_news_scrapper,
-}
-
-
-async def fetch_news(session: ClientSession, scrapper_name: str, scrapper_function):
+from config import (
+    scrapper_logger,
+    FETCH_GLOBAL_LIMIT,
+    FETCH_PER_HOST_LIMIT,
+    ARTICLE_QUEUE_SIZE,
+    CATEGORY_MAX_PAGES,
+    CATEGORY_KNOWN_RUN,
+    CATEGORY_CACHE_FILE,
+    CATEGORY_CACHE_TTL,
+    HTTP_CACHE_MAX_BYTES,
+    DATA_DIR,
+    NEWS_DATA_FILE,
+    SNAPSHOT_ENCODINGS,
+    STORAGE_BACKENDS,
+    SQLITE_DATA_FILE,
+    SQLITE_BATCH_SIZE,
+    DATA_PARTITIONING,
+    DEDUP_WINDOW_PARTITIONS,
+    DEDUP_MODE,
+    BLOOM_CAPACITY,
+    BLOOM_ERROR_RATE,
+    BLOOM_RECENT_LINKS,
+    NEAR_DUPLICATES_MODE,
+    NEAR_DUPLICATES_INDEX_FILE,
+    NEAR_DUPLICATES_LOG_FILE,
+    NEAR_DUPLICATES_THRESHOLD,
+    NEAR_DUPLICATES_WINDOW,
+    CIRCUIT_BREAKER_MIN_REQUESTS,
+    CIRCUIT_BREAKER_ERROR_RATE,
+    RATE_LIMIT,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_HOSTS,
+    ROBOTS_CRAWL_DELAY,
+    ROBOTS_CACHE_FILE,
+    ROBOTS_CACHE_TTL,
+    PROFILE_CYCLES,
+    PROFILE_DIR,
+    PROFILE_SLOW_CALLBACK_MS,
+)
+from news_scrappers.registry import enabled_sources, load_scrapper
+from tools.fetch_scheduler import FetchScheduler
+from tools.http_cache import HttpCache
+from tools.rate_limiter import HostRateLimiter
+from tools.category_cache import CategoryCache
+from tools.storage import create_storage
+from tools.near_duplicates import wrap_near_duplicates
+from tools.scrape_context import ScrapeContext
+from tools.profiler import cycle_profiler
+from tools.metrics import ARTICLES_WRITTEN, SOURCE_DURATION, CYCLE_DURATION, LAST_CYCLE_TIMESTAMP
+
+# Названия включенных источников новостей. Модули их скраперов импортируются при первом запуске источника.
+SCRAPPERS = enabled_sources()
+
+
+async def fetch_news(context: ScrapeContext, scrapper_name: str):
     """
-    Асинхронно получает новостные статьи из указанной функции-скрапера новостей.
+    Асинхронно получает новостные статьи скрапером указанного источника.
+    Модуль скрапера импортируется из реестра источников при первом запуске, поэтому ошибка
+    в модуле одного источника не мешает остальным.
+    Статьи передаются скрапером в очередь записи контекста по мере готовности.
 
     Args:
-        session (ClientSession): Объект ClientSession из aiohttp для выполнения HTTP-запросов.
-        scrapper_name (str): Название скрапера новостей.
-        scrapper_function: Асинхронная функция, которая выполняет скрапинг новостей для определенного источника.
+        context (ScrapeContext): Контекст цикла скрапинга с сессией и общим планировщиком запросов.
+        scrapper_name (str): Название источника из реестра `news_scrappers.registry`.
 
     Returns:
-        list: Список словарей, представляющих новостные статьи, полученные из скрапера.
+        dict: Количество новых статей, полученных из скрапера ('articles'),
+            и длительность его работы в секундах ('duration').
 
     """
+    started = time.monotonic()
     try:
-        news = await scrapper_function(session)
+        news_count = await load_scrapper(scrapper_name).scrape(context)
         scrapper_logger.info(
-            f"-- Fetched {len(news)} articles from {scrapper_name}.")
-        return news
+            f"-- Fetched {news_count} articles from {scrapper_name}.")
     except Exception as e:
         scrapper_logger.error(f"-- Error fetching {scrapper_name} news: {e}")
-        return []
+        news_count = 0
+    duration = time.monotonic() - started
+    SOURCE_DURATION.observe(duration, source=scrapper_name.lower())
+    return {"articles": news_count, "duration": duration}
 
 
-def write_to_csv(file_path, total_news_list, existing_articles):
+async def write_articles(storage, queue):
     """
-    Записывает новостные статьи в CSV-файл, пропуская статьи, которые уже есть в множестве `existing_articles`.
+    Разбирает очередь статей и записывает их в хранилище по мере поступления,
+    пропуская статьи, которые в хранилище уже есть. Статья, запись которой завершилась ошибкой,
+    пропускается с записью в журнал, а разбор очереди продолжается.
+
+    Для CSV каждая строка сбрасывается на диск сразу после записи, поэтому уже полученные статьи
+    сохраняются, даже если цикл скрапинга позже завершится ошибкой.
+    Задача завершается, получив из очереди `None`.
 
     Args:
-        file_path (str): Путь к CSV-файлу, в который будут записаны новостные статьи.
-        total_news_list (list): Список словарей, представляющих все полученные новостные статьи.
-        existing_articles (Set[str]): Множество, содержащее URL статей, которые уже были записаны.
+        storage: Хранилище статей (см. `tools.storage.create_storage`).
+        queue (asyncio.Queue): Очередь словарей статей, заполняемая скраперами.
 
-    Raises:
-        Exception: В случае ошибки при записи в CSV-файл.
+    Returns:
+        int: Количество записанных статей.
 
     """
-    file_exists = os.path.exists(file_path)
+    written_count = 0
 
-    try:
-        with open(file_path, mode="a", encoding="utf-8", newline="") as file:
-            writer = csv.writer(file)
-            if not file_exists or os.path.getsize(file_path) == 0:
-                writer.writerow([
-                    "news_source_name",
-                    "news_source_link",
-                    "category_name",
-                    "category_link",
-                    "article_date",
-                    "article_link",
-                    "article_title",
-                    "article_text",
-                ])
-
-            for article in total_news_list:
-                if article["article_link"] not in existing_articles:
-                    writer.writerow([
-                        article.get("news_source_name", ""),
-                        article.get("news_source_link", ""),
-                        article.get("category_name", ""),
-                        article.get("category_link", ""),
-                        article.get("article_date", ""),
-                        article.get("article_link", ""),
-                        article.get("article_title", ""),
-                        article.get("article_text", ""),
-                    ])
-                    existing_articles.add(article["article_link"])
-    except Exception as e:
-        scrapper_logger.error(f"Error writing to CSV file: {e}")
+    while (article := await queue.get()) is not None:
+        try:
+            written = storage.write(article)
+        except Exception as e:
+            # Ошибка записи одной статьи не останавливает запись остальных статей цикла
+            scrapper_logger.error(f"Error writing {article.get('article_link')} to storage: {e}")
+            continue
+        if written:
+            written_count += 1
+            ARTICLES_WRITTEN.inc(source=article["news_source_name"])
+
+    return written_count
 
 
-async def main():
+def create_news_storage():
     """
-    Асинхронная основная функция, координирующая процесс скрапинга новостей.
-    Получает новостные статьи из нескольких источников, записывает их в CSV-файл и обрабатывает исключения.
+    Создает хранилище статей по конфигурации: CSV и/или SQLite с индексом известных ссылок
+    и, если включено, с проверкой почти дубликатов.
 
-    Raises:
-        Exception: В случае неожиданной ошибки в процессе скрапинга новостей.
+    Returns:
+        Хранилище с методами `open`, `write`, `close` и проверкой `link in storage`.
 
     """
-    total_news_list = []
-    existing_articles = set()
+    storage = create_storage(
+        STORAGE_BACKENDS, NEWS_DATA_FILE, SQLITE_DATA_FILE, SQLITE_BATCH_SIZE, SNAPSHOT_ENCODINGS,
+        DATA_PARTITIONING, DEDUP_WINDOW_PARTITIONS,
+        dedup_mode=DEDUP_MODE,
+        bloom_capacity=BLOOM_CAPACITY,
+        bloom_error_rate=BLOOM_ERROR_RATE,
+        bloom_recent_links=BLOOM_RECENT_LINKS,
+    )
+    return wrap_near_duplicates(
+        storage,
+        NEAR_DUPLICATES_MODE,
+        NEAR_DUPLICATES_INDEX_FILE,
+        NEAR_DUPLICATES_LOG_FILE,
+        NEAR_DUPLICATES_THRESHOLD,
+        NEAR_DUPLICATES_WINDOW,
+    )
+
+
+def create_http_cache():
+    """
+    Создает дисковый кэш ответов для главных страниц и страниц категорий.
 
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    data_dir = os.path.join(script_dir, 'data')  # формируем путь к папке 'data'
+    Returns:
+        HttpCache: Кэш ответов или None, если кэш отключен (`SCRAPPER_HTTP_CACHE_MAX_BYTES=0`).
 
-    if not os.path.exists(data_dir):  # проверяем существование папки
-        os.makedirs(data_dir)  # создаем папку, если она не существует
+    """
+    if HTTP_CACHE_MAX_BYTES <= 0:
+        return None
+    return HttpCache(os.path.join(DATA_DIR, 'http_cache'), HTTP_CACHE_MAX_BYTES)
 
-    file_path = os.path.join(data_dir, 'news_data.csv')
-    # file_path = os.path.join(script_dir, "./data/news_data.csv")
-    existing_articles = read_existing_articles(file_path)
 
-    try:
-        scrapper_logger.info("Starting the news scrapper.")
-        async with aiohttp.ClientSession() as session:
-            tasks = []
-            for source_name, scrapper_function in SCRAPPERS.items():
-                tasks.append(fetch_news(
-                    session, source_name, scrapper_function))
+async def main(session=None, sources=None, runtime=None):
+    """
+    Асинхронная основная функция, координирующая процесс скрапинга новостей.
+    Запускает скраперы нескольких источников и задачу записи, которая сохраняет статьи в хранилище
+    (CSV-файл и/или SQLite) по мере их получения, и обрабатывает исключения.
 
-            news_results = await asyncio.gather(*tasks)
+    Args:
+        session (aiohttp.ClientSession, optional): Долгоживущая сессия для переиспользования соединений
+            между циклами. Если не указана, на время цикла создается новая сессия.
+        sources (list, optional): Названия источников из `SCRAPPERS`, которые нужно запустить.
+            Если не указаны, запускаются все источники.
+        runtime (ScrapperRuntime, optional): Среда выполнения периодических запусков. Хранилище
+            с индексом известных ссылок и кэш ответов создаются в первом цикле, сохраняются в ней
+            и переиспользуются следующими циклами. Если не указана, они создаются на время цикла.
 
-            for news in news_results:
-                total_news_list.extend(news)
+    Returns:
+        dict: Статистика по запущенным источникам: название источника -> словарь
+            с количеством новых статей ('articles') и длительностью запуска в секундах ('duration').
 
-        write_to_csv(file_path, total_news_list, existing_articles)
+    Raises:
+        Exception: В случае неожиданной ошибки в процессе скрапинга новостей.
 
-        scrapper_logger.info("News scrapper finished.")
+    """
+    data_dir = DATA_DIR
 
-    except Exception as e:
-        scrapper_logger.error(e)
+    if not os.path.exists(data_dir):  # проверяем существование папки
+        os.makedirs(data_dir)  # создаем папку, если она не существует
+
+    if runtime is None:
+        storage, http_cache = create_news_storage(), create_http_cache()
+    else:
+        if runtime.storage is None:
+            runtime.storage, runtime.http_cache = create_news_storage(), create_http_cache()
+        storage, http_cache = runtime.storage, runtime.http_cache
+        if http_cache is not None:
+            # Счетчики кэша выводятся в журнал за каждый цикл
+            http_cache.hits = http_cache.misses = 0
+    if sources is None:
+        sources = list(SCRAPPERS)
+    stats = {}
+
+    rate_limiter = HostRateLimiter(
+        RATE_LIMIT,
+        RATE_LIMIT_BURST,
+        RATE_LIMIT_HOSTS,
+        ROBOTS_CACHE_FILE if ROBOTS_CRAWL_DELAY else None,
+        ROBOTS_CACHE_TTL,
+    )
+    category_cache = CategoryCache(CATEGORY_CACHE_FILE, CATEGORY_CACHE_TTL)
+
+    started = time.monotonic()
+    async with cycle_profiler(PROFILE_CYCLES, PROFILE_DIR, PROFILE_SLOW_CALLBACK_MS):
+        try:
+            scrapper_logger.info("Starting the news scrapper.")
+            storage.open()
+            queue = asyncio.Queue(maxsize=ARTICLE_QUEUE_SIZE)
+            writer_task = asyncio.create_task(write_articles(storage, queue))
+
+            try:
+                session_context = aiohttp.ClientSession() if session is None else nullcontext(session)
+                async with session_context as session:
+                    scheduler = FetchScheduler(
+                        FETCH_GLOBAL_LIMIT, FETCH_PER_HOST_LIMIT, http_cache,
+                        CIRCUIT_BREAKER_MIN_REQUESTS, CIRCUIT_BREAKER_ERROR_RATE, rate_limiter)
+                    context = ScrapeContext(
+                        session, scheduler, storage, queue, CATEGORY_MAX_PAGES, CATEGORY_KNOWN_RUN, category_cache)
+
+                    tasks = []
+                    for source_name in sources:
+                        tasks.append(fetch_news(context, source_name))
+
+                    stats = dict(zip(sources, await asyncio.gather(*tasks)))
+                    await category_cache.wait_refreshes()
+            finally:
+                await queue.put(None)
+                written_count = await writer_task
+                storage.close()
+
+            scrapper_logger.info(f"-- Written {written_count} new articles.")
+            if http_cache is not None:
+                scrapper_logger.info(
+                    f"-- HTTP cache: {http_cache.hits} hits, {http_cache.misses} misses.")
+            scrapper_logger.info("News scrapper finished.")
+
+        except Exception as e:
+            scrapper_logger.error(e)
+
+    CYCLE_DURATION.observe(time.monotonic() - started)
+    LAST_CYCLE_TIMESTAMP.set(time.time())
+
+    return stats
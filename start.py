@@ -1,30 +1,323 @@
+import io
+import os
+import csv
+import json
 import time
 import threading
-import asyncio
-from flask import Flask, send_file
-from scrapper import main as scrapper_main
-from config import server_logger, SERVER_PORT, NEWS_DATA_API_PATH
+from datetime import datetime
+from flask import Flask, Response, abort, request, send_file
+from scrapper import main as scrapper_main, SCRAPPERS
+from tools.runtime import ScrapperRuntime
+from tools.poll_scheduler import AdaptivePollScheduler
+from tools.offset_index import RowOffsetIndex
+from tools.compressed_snapshot import snapshot_path
+from tools.metrics import render_metrics
+from tools.partitions import PARTITION_KEY_PATTERN, partition_path, list_partitions
+from config import (
+    server_logger,
+    SERVER_PORT,
+    NEWS_DATA_API_PATH,
+    POLL_MIN_INTERVAL,
+    POLL_MAX_INTERVAL,
+    POLL_INITIAL_INTERVAL,
+    POLL_TARGET_ARTICLES,
+    NEWS_DATA_FILE,
+    UPDATES_PAGE_LIMIT,
+    UPDATES_MAX_PAGE_LIMIT,
+    SNAPSHOT_ENCODINGS,
+    DATA_PARTITIONING,
+)
 
 app = Flask(__name__)
 PORT = SERVER_PORT
 API_PATH = NEWS_DATA_API_PATH
 
 def run_scrapper_periodically():
-   
+    runtime = ScrapperRuntime()
+    poll_scheduler = AdaptivePollScheduler(
+        SCRAPPERS,
+        POLL_MIN_INTERVAL,
+        POLL_MAX_INTERVAL,
+        POLL_INITIAL_INTERVAL,
+        POLL_TARGET_ARTICLES,
+    )
+
     while True:
+        sources = poll_scheduler.due_sources()
+        stats = {}
         try: 
-            server_logger.info("News scrapper is running")
-            asyncio.run(scrapper_main())
+            server_logger.info(f"News scrapper is running for {', '.join(sources)}")
+            stats = runtime.run(scrapper_main, sources=sources)
             server_logger.info("News scrapper finished")
         except Exception as e:
             server_logger.error(f"Error running scrapper: {e}")
-        server_logger.info("Sleeping for 10 minutes. \n")
-        time.sleep(600)
+
+        for source in sources:
+            source_stats = stats.get(source, {"articles": 0, "duration": 0})
+            interval = poll_scheduler.record(
+                source, source_stats["articles"], source_stats["duration"])
+            server_logger.info(
+                f"{source}: {source_stats['articles']} new articles, next run in {interval:.0f} seconds")
+
+        delay = poll_scheduler.seconds_until_next_run()
+        server_logger.info(f"Sleeping for {delay:.0f} seconds. \n")
+        time.sleep(delay)
+
+def requested_partition():
+    """
+    Возвращает путь к файлу раздела из параметра запроса `partition` или None, если параметр не указан.
+    """
+    key = request.args.get("partition")
+    if key is None:
+        return None
+    if not PARTITION_KEY_PATTERN.fullmatch(key):
+        abort(400, "partition must look like YYYY_MM or YYYY_MM_DD")
+    file_path = partition_path(NEWS_DATA_FILE, key)
+    if not os.path.exists(file_path):
+        abort(404)
+    return file_path
+
+
+def send_data_file(file_path):
+    """
+    Отдает CSV-файл целиком или его сжатый снимок, если клиент принимает `gzip` или `zstd`.
+    """
+    encoding = request.accept_encodings.best_match(SNAPSHOT_ENCODINGS + ["identity"], default="identity")
+
+    if encoding != "identity" and os.path.exists(snapshot_path(file_path, encoding)):
+        response = send_file(
+            snapshot_path(file_path, encoding),
+            mimetype="text/csv",
+            as_attachment=True,
+            download_name=os.path.basename(file_path),
+            conditional=True,
+        )
+        response.headers["Content-Encoding"] = encoding
+    else:
+        response = send_file(file_path, as_attachment=True, conditional=True)
+
+    response.headers["Vary"] = "Accept-Encoding"
+    response.cache_control.no_cache = True
+    return response
+
+
+def merged_partitions(file_paths, chunk_size=64 * 1024):
+    """
+    Последовательно читает разделы как один CSV-файл: заголовок берется из первого раздела,
+    в остальных он пропускается.
+    """
+    for number, file_path in enumerate(file_paths):
+        with open(file_path, "rb") as file:
+            header = file.readline()
+            if number == 0:
+                yield header
+            while chunk := file.read(chunk_size):
+                yield chunk
+
 
 @app.route(API_PATH)
 def index():
-    file_path = "./data/news_data.csv"
-    return send_file(file_path, as_attachment=True)
+    """
+    Отдает файл с новостями целиком.
+
+    Если клиент принимает `gzip` или `zstd` и для этой кодировки есть сжатый снимок,
+    отдается снимок с заголовком `Content-Encoding`. Ответ содержит валидаторы
+    ETag/Last-Modified (повторный запрос с ними получает 304) и поддерживает запросы
+    Range, чтобы клиент мог докачать или дочитать хвост файла.
+
+    При разбиении файла по времени без параметра `partition` отдается самый новый раздел
+    (его ключ возвращается в заголовке `X-Partition`), `partition=2024_05` выбирает один раздел,
+    а `partition=all` отдает объединенный CSV всех разделов от старых к новым. Объединенный CSV
+    собирается на лету, поэтому отдается без сжатия, валидаторов и поддержки Range.
+    """
+    if request.args.get("partition") == "all":
+        file_paths = [path for _, path in list_partitions(NEWS_DATA_FILE)]
+        if not file_paths:
+            abort(404)
+        response = Response(merged_partitions(file_paths), mimetype="text/csv")
+        response.headers["Content-Disposition"] = f"attachment; filename={os.path.basename(NEWS_DATA_FILE)}"
+        response.cache_control.no_cache = True
+        return response
+
+    key, file_path = request.args.get("partition"), requested_partition()
+    if file_path is None:
+        file_path = NEWS_DATA_FILE
+        if DATA_PARTITIONING != "none":
+            existing_partitions = list_partitions(NEWS_DATA_FILE)
+            if not existing_partitions:
+                abort(404)
+            key, file_path = existing_partitions[-1]
+
+    response = send_data_file(file_path)
+    if key:
+        response.headers["X-Partition"] = key
+    return response
+
+
+@app.route(f"{API_PATH.rstrip('/') if API_PATH else ''}/partitions")
+def partitions():
+    """
+    Отдает список разделов файла с новостями в формате JSON: ключ раздела и размер файла в байтах.
+    Основной файл, собранный до включения разбиения, имеет ключ `null`.
+    """
+    return [
+        {"partition": key, "size": os.path.getsize(file_path)}
+        for key, file_path in list_partitions(NEWS_DATA_FILE)
+    ]
+
+
+def parse_since(value):
+    """
+    Преобразует параметр `since` (unix-время или дата ISO 8601) в unix-время.
+    """
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+def parse_cursor(value):
+    """
+    Разбирает курсор выдачи новых строк: `1234` или привязанный к разделу `2024_05:1234`
+    (`:1234` — основной файл, собранный до включения разбиения).
+
+    Возвращает:
+        tuple: (привязан ли курсор к разделу, ключ раздела или None, номер строки).
+
+    Raises:
+        ValueError: Если курсор имеет неверный формат.
+    """
+    key, separator, row = value.rpartition(":")
+    if key and not PARTITION_KEY_PATTERN.fullmatch(key):
+        raise ValueError(f"invalid cursor partition: {key}")
+    return bool(separator), key or None, int(row)
+
+
+def format_cursor(key, row):
+    """
+    Возвращает курсор, привязанный к разделу: `2024_05:1234` или `:1234` для основного файла.
+    """
+    return f"{key or ''}:{row}"
+
+
+def updates_start(existing_partitions, cursor, since):
+    """
+    Находит раздел и строку, с которых начинается выдача при разбиении файла по времени.
+
+    Курсор указывает раздел явно, а `since` ищется во всех разделах от старых к новым:
+    выдача начинается с первого раздела, в котором есть строки, записанные позже `since`.
+    Без курсора и `since` выдача начинается с первой строки самого старого раздела.
+
+    Возвращает:
+        tuple: (номер раздела в `existing_partitions`, номер строки).
+    """
+    if cursor is not None:
+        _, key, start_row = cursor
+        keys = [partition_key for partition_key, _ in existing_partitions]
+        if key not in keys:
+            abort(400, "cursor refers to an unknown partition")
+        return keys.index(key), start_row
+
+    if since is not None:
+        for number, (_, file_path) in enumerate(existing_partitions):
+            offset_index = RowOffsetIndex(file_path)
+            start_row = offset_index.first_row_since(since)
+            if start_row < offset_index.count():
+                return number, start_row
+        return len(existing_partitions) - 1, RowOffsetIndex(existing_partitions[-1][1]).count()
+
+    return 0, 0
+
+
+@app.route(f"{API_PATH.rstrip('/') if API_PATH else ''}/updates")
+def updates():
+    """
+    Отдает строки, добавленные после курсора, постранично в формате CSV или JSONL.
+
+    Параметры запроса:
+        cursor: Курсор из заголовка `X-Next-Cursor` предыдущего ответа.
+        since: Время записи (unix-время или ISO 8601), после которого нужны строки.
+            Используется, если не указан `cursor`.
+        limit: Количество строк на странице.
+        format: `csv` (по умолчанию) или `jsonl`.
+        partition: Раздел файла при разбиении по времени, в пределах которого ведется выдача.
+
+    Страница читается из CSV одним чтением по индексу смещений, без сканирования файла.
+    Курсор следующей страницы возвращается в заголовке `X-Next-Cursor`,
+    а наличие следующих строк — в заголовке `X-Has-More`.
+
+    При разбиении по времени курсор привязан к разделу (`2024_05:1234`), а выдача без параметра
+    `partition` переходит от раздела к разделу, от старых к новым, поэтому смена раздела
+    не приводит к пропуску строк. Курсор без раздела в этом случае принимается только вместе с `partition`.
+    Раздел строк страницы возвращается в заголовке `X-Partition`.
+    """
+    output_format = request.args.get("format", "csv")
+    if output_format not in ("csv", "jsonl"):
+        abort(400, "format must be csv or jsonl")
+
+    try:
+        limit = min(int(request.args.get("limit", UPDATES_PAGE_LIMIT)), UPDATES_MAX_PAGE_LIMIT)
+        cursor = parse_cursor(request.args["cursor"]) if "cursor" in request.args else None
+        since = parse_since(request.args["since"]) if "since" in request.args and cursor is None else None
+    except ValueError:
+        abort(400, "invalid cursor, since or limit")
+
+    key, file_path = request.args.get("partition"), requested_partition()
+    if file_path is not None:
+        # Выдача в пределах одного раздела
+        if cursor is not None and cursor[0] and cursor[1] != key:
+            abort(400, "cursor refers to a different partition")
+        existing_partitions = [(key, file_path)]
+    elif DATA_PARTITIONING == "none":
+        existing_partitions = [(None, NEWS_DATA_FILE)]
+    else:
+        existing_partitions = list_partitions(NEWS_DATA_FILE) or [(None, NEWS_DATA_FILE)]
+        if cursor is not None and not cursor[0]:
+            abort(400, "cursor must include the partition (as returned in X-Next-Cursor)")
+    qualified = file_path is not None or DATA_PARTITIONING != "none"
+    if cursor is not None and not cursor[0]:
+        # Курсор без раздела относится к единственному файлу выдачи
+        cursor = (True, existing_partitions[0][0], cursor[2])
+
+    number, start_row = updates_start(existing_partitions, cursor, since)
+    key, file_path = existing_partitions[number]
+    offset_index = RowOffsetIndex(file_path)
+
+    # Раздел прочитан до конца: переходим к следующему, в котором есть строки
+    while start_row >= offset_index.count() and number + 1 < len(existing_partitions):
+        number += 1
+        key, file_path = existing_partitions[number]
+        offset_index, start_row = RowOffsetIndex(file_path), 0
+
+    rows, next_row = offset_index.read_rows(start_row, max(limit, 0))
+    header = offset_index.read_header()
+
+    if output_format == "csv":
+        body = header + rows if rows else b""
+        mimetype = "text/csv"
+    else:
+        fieldnames = next(csv.reader([header.decode("utf-8")]), [])
+        reader = csv.DictReader(io.StringIO(rows.decode("utf-8"), newline=""), fieldnames=fieldnames)
+        body = "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in reader).encode("utf-8")
+        mimetype = "application/x-ndjson"
+
+    has_more = next_row < offset_index.count() or any(
+        RowOffsetIndex(path).count() for _, path in existing_partitions[number + 1:])
+
+    response = Response(body, mimetype=mimetype)
+    response.headers["X-Next-Cursor"] = format_cursor(key, next_row) if qualified else str(next_row)
+    response.headers["X-Has-More"] = "true" if has_more else "false"
+    if key:
+        response.headers["X-Partition"] = key
+    return response
+
+@app.route("/metrics")
+def metrics():
+    """
+    Отдает метрики скрапера в текстовом формате Prometheus: длительность, размер и статусы запросов,
+    время разбора, количество найденных, новых и записанных статей по источникам и длительность циклов.
+    """
+    return Response(render_metrics(), mimetype="text/plain; version=0.0.4")
 
 if __name__ == "__main__":
     scrapper_thread = threading.Thread(target=run_scrapper_periodically)
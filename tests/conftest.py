@@ -0,0 +1,69 @@
+"""
+Общая настройка тестов.
+
+Конфигурация скрапера читается из переменных окружения при импорте `config`, поэтому они задаются
+здесь, до импорта модулей проекта: данные пишутся во временный каталог, а запросы скраперов
+направляются на локальный `benchmarks.replay_server` (см. фикстуру `replay_server`).
+"""
+import os
+import sys
+import socket
+import asyncio
+import tempfile
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+REPLAY_PORT = _free_port()
+DATA_DIR = tempfile.mkdtemp(prefix="scrapper-tests-")
+
+os.environ["SCRAPPER_DATA_DIR"] = DATA_DIR
+os.environ["SCRAPPER_FETCH_URL_REWRITE"] = f"http://127.0.0.1:{REPLAY_PORT}"
+os.environ["SCRAPPER_RATE_LIMIT"] = "0"
+os.environ["SCRAPPER_PARSE_WORKERS"] = "0"
+os.environ.setdefault("SCRAPPER_SERVER_GET_NEWS_DATA_API_PATH", "/api/news")
+
+
+@pytest.fixture
+def data_dir():
+    """
+    Каталог данных скрапера, очищаемый перед тестом.
+    """
+    for root, dirs, files in os.walk(DATA_DIR, topdown=False):
+        for name in files:
+            os.remove(os.path.join(root, name))
+        for name in dirs:
+            os.rmdir(os.path.join(root, name))
+    return DATA_DIR
+
+
+@pytest.fixture
+def replay_server():
+    """
+    Запускает `benchmarks.replay_server` в отдельном потоке на порту из `SCRAPPER_FETCH_URL_REWRITE`.
+    Каждый запрос первой страницы категории публикует новые статьи, как при `--fresh`.
+    """
+    from aiohttp import web
+    from benchmarks.replay_server import ReplayServer
+
+    server = ReplayServer(categories=2, articles_per_category=5, fresh=True, use_snapshots=False)
+    loop = asyncio.new_event_loop()
+    runner = web.AppRunner(server.make_app())
+    loop.run_until_complete(runner.setup())
+    loop.run_until_complete(web.TCPSite(runner, "127.0.0.1", REPLAY_PORT).start())
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield server
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.run_until_complete(runner.cleanup())
+    loop.close()
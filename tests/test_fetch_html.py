@@ -0,0 +1,77 @@
+import asyncio
+import contextlib
+import os
+
+import aiohttp
+from aiohttp import web
+
+from conftest import REPLAY_PORT
+from tools.fetch_html import async_fetch_html
+from tools.http_cache import HttpCache
+
+URL = "https://example.com/news/"
+
+
+class CountingLimiter:
+    def __init__(self):
+        self.acquired = 0
+
+    async def acquire(self, session, url):
+        self.acquired += 1
+
+    def throttle(self, url, delay):
+        pass
+
+
+def fetch_with_missing_body(tmp_path, always_not_modified):
+    requests = []
+
+    async def handler(request):
+        requests.append(request.headers.get("If-None-Match"))
+        if always_not_modified or request.headers.get("If-None-Match"):
+            return web.Response(status=304)
+        return web.Response(text="<html>new</html>", content_type="text/html")
+
+    async def run():
+        cache = HttpCache(str(tmp_path / "cache"), 1 << 20)
+        cache.store(URL, "<html>old</html>", {"ETag": '"v1"'})
+        os.remove(cache._path(URL, "html"))
+
+        app = web.Application()
+        app.router.add_get("/{tail:.*}", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", REPLAY_PORT).start()
+        limiter = CountingLimiter()
+        slots = []
+
+        @contextlib.asynccontextmanager
+        async def slot():
+            slots.append(URL)
+            yield
+
+        try:
+            async with aiohttp.ClientSession() as session:
+                html = await async_fetch_html(session, URL, cache=cache, limiter=limiter, slot=slot)
+        finally:
+            await runner.cleanup()
+        return html, limiter.acquired, len(slots)
+
+    html, acquired, slots = asyncio.run(run())
+    return html, requests, acquired, slots
+
+
+def test_missing_cached_body_is_refetched_through_limiter_and_slot(tmp_path):
+    html, requests, acquired, slots = fetch_with_missing_body(tmp_path, always_not_modified=False)
+
+    assert html == "<html>new</html>"
+    assert requests == ['"v1"', None]
+    assert acquired == slots == 2
+
+
+def test_missing_cached_body_is_refetched_only_once(tmp_path):
+    html, requests, acquired, slots = fetch_with_missing_body(tmp_path, always_not_modified=True)
+
+    assert html is None
+    assert requests == ['"v1"', None]
+    assert acquired == slots == 2
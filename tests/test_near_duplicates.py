@@ -0,0 +1,38 @@
+from tools.near_duplicates import NearDuplicateIndex, NearDuplicateStorage
+from tools.storage import CsvStorage
+
+
+def article(number, text=None):
+    return {
+        "news_source_name": "test",
+        "article_link": f"https://example.com/news/{number}",
+        "article_title": f"Заголовок {number}",
+        "article_text": text or f"статья номер {number} " + " ".join(f"слово{number}_{i}" for i in range(40)),
+    }
+
+
+def test_index_survives_repeated_cycles(tmp_path):
+    index = NearDuplicateIndex(str(tmp_path / "index.npz"), threshold=0.8, window=5)
+    storage = NearDuplicateStorage(
+        CsvStorage(str(tmp_path / "news.csv")), index, "mark", str(tmp_path / "near_duplicates.jsonl"))
+
+    number = 0
+    for _ in range(3):
+        storage.open()
+        for _ in range(3):
+            assert storage.write(article(number))
+            number += 1
+        storage.close()
+
+        assert len(index.links) == len(index._signatures) <= index.window
+        assert not index._new_signatures
+
+    # Почти дубликат статьи прошлого цикла находится, а не приводит к ошибке индекса
+    storage.open()
+    duplicate = article(number, article(number - 1)["article_text"] + " дополнение")
+    assert storage.write(duplicate)
+    assert storage.found == 1
+    storage.close()
+
+    reloaded = NearDuplicateIndex(str(tmp_path / "index.npz"), threshold=0.8, window=5).load()
+    assert reloaded.links == index.links
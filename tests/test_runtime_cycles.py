@@ -0,0 +1,45 @@
+import csv
+import gzip
+import os
+
+import scrapper
+import tools.existing_articles as existing_articles
+from config import NEWS_DATA_FILE
+from tools.runtime import ScrapperRuntime
+
+
+def read_links():
+    with open(NEWS_DATA_FILE, newline="", encoding="utf-8") as file:
+        return [row["article_link"] for row in csv.DictReader(file)]
+
+
+def test_runtime_reuses_storage_across_cycles(replay_server, data_dir, monkeypatch):
+    monkeypatch.setattr(scrapper, "NEAR_DUPLICATES_MODE", "mark")
+    rebuilds = []
+    read_existing_articles = existing_articles.read_existing_articles
+    monkeypatch.setattr(
+        existing_articles, "read_existing_articles", lambda *args: rebuilds.append(args) or read_existing_articles(*args))
+
+    runtime = ScrapperRuntime()
+    try:
+        index_sizes = []
+        for _ in range(3):
+            stats = runtime.run(scrapper.main)
+            assert stats and all(source["articles"] > 0 for source in stats.values())
+            index_sizes.append(os.path.getsize(f"{NEWS_DATA_FILE}.links.gz"))
+        known_articles = runtime.storage.storage.known_articles
+    finally:
+        runtime.close()
+
+    links = read_links()
+    assert len(links) == len(set(links))
+    # Индекс известных ссылок строится по CSV один раз, затем только дочитывается
+    assert len(rebuilds) == 1
+    assert len(known_articles) == len(links)
+
+    # Файл индекса дописывается блоками с новыми ссылками, а не перезаписывается целиком
+    assert index_sizes == sorted(index_sizes)
+    with gzip.open(f"{NEWS_DATA_FILE}.links.gz", mode="rt", encoding="utf-8") as file:
+        lines = file.read().splitlines()
+    assert sum(line.startswith("{") for line in lines) == 3
+    assert existing_articles.KnownArticlesIndex(NEWS_DATA_FILE).load()._links == known_articles._links
@@ -0,0 +1,61 @@
+import asyncio
+
+from news_scrappers.gazeta import SCRAPPER as gazeta
+from news_scrappers.lenta import SCRAPPER as lenta
+from news_scrappers.rbk import SCRAPPER as rbk
+from tools.pars_time_text import parse_time_text
+
+LENTA_ARTICLE = """
+<div class="topic-page__container">
+  <a class="premium-header__time">10:00, 1 марта 2024</a>
+  <a class="topic-header__time">12:30, 2 марта 2024</a>
+  <h1>Заголовок <span>статьи</span></h1>
+  <div class="topic-body">Первый блок <figure class="picture">фото</figure></div>
+  <div class="topic-body">Второй блок</div>
+</div>
+"""
+
+GAZETA_ARTICLE = """
+<h2 class="headline">Подзаголовок</h2>
+<h1 class="headline">Заголовок</h1>
+<div class="breadcrumb"><time>01.03.2024, 10:00</time></div>
+<div class="b_article-text">Текст <div class="b_article-incut">врезка</div></div>
+<div class="b_article-intro">Вступление</div>
+<div class="b_article-text">Второй текст</div>
+"""
+
+RBK_ARTICLE = """
+<h1>Заголовок</h1>
+<div class="article__text article__text_free">Первый <div class="thg">реклама</div></div>
+<div class="article__text article__text_free">Второй</div>
+"""
+
+
+def test_lenta_prefers_topic_header_time_and_first_body():
+    article = lenta.extract_article(LENTA_ARTICLE, "https://lenta.ru/news/1/")
+
+    assert article["date"] == parse_time_text("12:30, 2 марта 2024", "lenta")
+    assert article["title"] == "Заголовок статьи"
+    assert article["text"] == "Первый блок"
+
+
+def test_gazeta_prefers_h1_headline_and_first_blocks_in_order():
+    article = gazeta.extract_article(GAZETA_ARTICLE, "https://www.gazeta.ru/news/1.shtml")
+
+    assert article["title"] == "Заголовок"
+    assert article["text"] == "Вступление Текст"
+
+
+def test_rbk_takes_first_text_block():
+    article = rbk.extract_article(RBK_ARTICLE, "https://www.rbc.ru/news/1")
+
+    assert article == {"title": "Заголовок", "text": "Первый"}
+
+
+class FailingContext:
+    async def fetch_html(self, url, cacheable=False, canonical=True):
+        return None
+
+
+def test_failed_article_fetch_is_skipped():
+    assert asyncio.run(lenta.parse_articles(FailingContext(), "https://lenta.ru/news/1/")) is None
@@ -0,0 +1,30 @@
+import asyncio
+
+import scrapper
+
+
+class FlakyStorage:
+    def __init__(self, failing_link):
+        self.failing_link = failing_link
+        self.links = []
+
+    def write(self, article):
+        if article["article_link"] == self.failing_link:
+            raise OSError("disk error")
+        self.links.append(article["article_link"])
+        return True
+
+
+def test_write_error_skips_only_failed_article():
+    storage = FlakyStorage("https://example.com/2")
+    links = [f"https://example.com/{number}" for number in range(5)]
+
+    async def run():
+        queue = asyncio.Queue()
+        for link in links:
+            queue.put_nowait({"news_source_name": "test", "article_link": link})
+        queue.put_nowait(None)
+        return await scrapper.write_articles(storage, queue)
+
+    assert asyncio.run(run()) == 4
+    assert storage.links == [link for link in links if link != storage.failing_link]
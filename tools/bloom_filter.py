@@ -0,0 +1,57 @@
+import math
+import hashlib
+
+
+class BloomFilter:
+    """
+    Фильтр Блума для строк: компактное множество с ложноположительными ответами.
+
+    `item in filter` возвращает False только для строк, которые точно не добавлялись,
+    а True — для добавленных строк и, с вероятностью около `error_rate`, для остальных.
+    Размер битового массива и количество хеш-функций подбираются по ожидаемому количеству
+    элементов и допустимой доле ложноположительных ответов.
+
+    Аргументы:
+        capacity (int): Ожидаемое количество элементов.
+        error_rate (float): Допустимая доля ложноположительных ответов при заполнении до `capacity`.
+        bits (bytearray, optional): Битовый массив ранее сохраненного фильтра.
+        count (int, optional): Количество элементов, добавленных в ранее сохраненный фильтр.
+    """
+
+    def __init__(self, capacity, error_rate, bits=None, count=0):
+        self.capacity = max(int(capacity), 1)
+        self.error_rate = error_rate
+        self.num_bits = math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.num_bits += -self.num_bits % 8
+        self.num_hashes = max(round(self.num_bits / self.capacity * math.log(2)), 1)
+        self.bits = bits if bits is not None else bytearray(self.num_bits // 8)
+        self.count = count
+
+        if len(self.bits) != self.num_bits // 8:
+            raise ValueError("Bloom filter bits do not match its capacity and error rate")
+
+    def _positions(self, item):
+        # Двойное хеширование: k позиций из двух 64-битных половин одного хеша
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.num_bits for i in range(self.num_hashes)]
+
+    def __contains__(self, item):
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def __len__(self):
+        return self.count
+
+    def add(self, item):
+        """
+        Добавляет строку в фильтр.
+
+        Аргументы:
+            item (str): Строка, например ссылка на статью.
+        """
+        bits = self.bits
+        for position in self._positions(item):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
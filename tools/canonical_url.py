@@ -0,0 +1,127 @@
+import re
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Параметры запроса, которые только отслеживают переходы и не меняют содержимое страницы
+TRACKING_PARAMS = {
+    "from", "ref", "referrer", "source", "src",
+    "yclid", "gclid", "fbclid", "dclid", "ysclid", "rcmrclid",
+    "_openstat", "utm_referrer", "erid",
+}
+TRACKING_PARAM_PREFIXES = ("utm_",)
+
+"""
+Правила источников по домену сайта.
+
+    host: Канонический домен (зеркала `m.`/`www.` сводятся к нему).
+    keep_params: Параметры запроса, которые нужно сохранить; остальные отбрасываются.
+        None — сохраняются все параметры, кроме отслеживающих.
+    trailing_slash: `keep` (оставить как есть), `add` или `strip` — косая черта в конце пути.
+
+У всех поддерживаемых источников статья полностью определяется путем, поэтому параметры запроса
+в ссылках на статьи отбрасываются целиком. Ссылки пагинации категорий, которым параметры нужны,
+загружаются без канонизации (см. `ScrapeContext.fetch_html`).
+"""
+SOURCE_RULES = {
+    # /politics/17/05/2024/664712f09a7947...: идентификатор статьи в пути; в ссылках встречаются
+    # только `from=newsfeed`/`from=from_main_N` и `utm_*`
+    "rbc.ru": {"host": "www.rbc.ru", "keep_params": set(), "trailing_slash": "keep"},
+    # /news/2024/05/17/slug/: дата и slug в пути; сайт отдает одну и ту же статью с косой чертой
+    # в конце и без нее, а параметры в ссылках только отслеживающие
+    "lenta.ru": {"host": "lenta.ru", "keep_params": set(), "trailing_slash": "add"},
+    # /20240517/slug-1945.html: дата и числовой идентификатор в пути; параметры в ссылках
+    # только отслеживающие (`utm_*`)
+    "ria.ru": {"host": "ria.ru", "keep_params": set(), "trailing_slash": "keep"},
+    # /politics/news/2024/05/17/1.shtml: идентификатор в пути; `?updated` и `?utm_*` не меняют
+    # содержимое статьи
+    "gazeta.ru": {"host": "www.gazeta.ru", "keep_params": set(), "trailing_slash": "keep"},
+}
+
+DEFAULT_RULE = {"host": None, "keep_params": None, "trailing_slash": "keep"}
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+_MIRROR_PREFIX = re.compile(r"^(?:www\.|m\.)")
+
+
+def source_rule(host):
+    """
+    Возвращает правило источника для домена, учитывая поддомены (`www.`, `m.` и т.п.).
+
+    Args:
+        host (str): Домен в нижнем регистре.
+
+    Returns:
+        dict: Правило источника или `DEFAULT_RULE` для неизвестных сайтов.
+    """
+    domain = _MIRROR_PREFIX.sub("", host)
+    while domain:
+        if domain in SOURCE_RULES:
+            return SOURCE_RULES[domain]
+        domain = domain.partition(".")[2]
+    return DEFAULT_RULE
+
+
+def _is_tracking_param(name):
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PARAM_PREFIXES)
+
+
+def canonicalize_url(url, base=None):
+    """
+    Приводит ссылку к каноническому виду, чтобы одна и та же статья имела один ключ
+    при проверке дубликатов и загружалась один раз.
+
+    Относительная ссылка достраивается от `base`; схема приводится к `https`, домен — к нижнему
+    регистру и каноническому зеркалу источника, порт по умолчанию, фрагмент и отслеживающие
+    параметры отбрасываются, а оставшиеся параметры сортируются.
+
+    Args:
+        url (str): Ссылка в том виде, в котором ее построил скрапер.
+        base (str, optional): Адрес страницы, на которой найдена относительная ссылка.
+
+    Returns:
+        str: Каноническая ссылка. Пустая строка и ссылки не на http(s) возвращаются без изменений.
+
+    Examples:
+        >>> canonicalize_url("http://rbc.ru/politics/17/05/2024/664712?from=newsfeed#comments")
+        'https://www.rbc.ru/politics/17/05/2024/664712'
+        >>> canonicalize_url("/news/2024/05/17/slug", base="https://m.lenta.ru/rubrics/russia/")
+        'https://lenta.ru/news/2024/05/17/slug/'
+        >>> canonicalize_url("https://RIA.ru:443/20240517/slug-1945.html?utm_source=tg")
+        'https://ria.ru/20240517/slug-1945.html'
+        >>> canonicalize_url("https://gazeta.ru/politics/news/2024/05/17/1.shtml?updated")
+        'https://www.gazeta.ru/politics/news/2024/05/17/1.shtml'
+        >>> canonicalize_url("https://example.com//a/?b=2&utm_medium=x&a=1")
+        'https://example.com/a/?a=1&b=2'
+    """
+    if not url:
+        return url
+    if base:
+        url = urljoin(base, url)
+
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS:
+        return url
+
+    host = (parts.hostname or "").rstrip(".")
+    rule = source_rule(host)
+    if rule["host"]:
+        host = rule["host"]
+    if parts.port and parts.port != DEFAULT_PORTS[scheme]:
+        host = f"{host}:{parts.port}"
+
+    path = re.sub(r"/{2,}", "/", parts.path) or "/"
+    if rule["trailing_slash"] == "add" and not path.endswith("/") and "." not in path.rsplit("/", 1)[-1]:
+        path += "/"
+    elif rule["trailing_slash"] == "strip" and path != "/":
+        path = path.rstrip("/")
+
+    params = [
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(name)
+        and (rule["keep_params"] is None or name in rule["keep_params"])
+    ]
+
+    return urlunsplit(("https", host, path, urlencode(sorted(params)), ""))
@@ -0,0 +1,112 @@
+import os
+import json
+import time
+import asyncio
+from config import scrapper_logger
+
+
+class CategoryCache:
+    """
+    Сохраняемый в JSON-файл список категорий каждого источника с временем жизни.
+
+    Пока список моложе `ttl` секунд, главная страница источника не загружается. Устаревший список
+    используется в текущем цикле, а обновление выполняется в фоне, параллельно со скрапингом категорий.
+    Изменения набора категорий записываются в лог. Если обновить список не удалось (ошибка загрузки
+    или пустой результат), сохраняется последний удачный список, а не пустой.
+
+    Аргументы:
+        path (str): Путь к JSON-файлу со списками категорий.
+        ttl (float): Время, в течение которого список категорий используется без обновления, в секундах.
+    """
+
+    def __init__(self, path, ttl):
+        self.path = path
+        self.ttl = ttl
+        self.entries = self._load()
+        self._refreshes = {}
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError) as e:
+            scrapper_logger.warning(f"Ignoring category cache {self.path}: {e}")
+            return {}
+
+    def _save(self):
+        temporary_path = f"{self.path}.tmp"
+        try:
+            with open(temporary_path, mode="w", encoding="utf-8") as file:
+                json.dump(self.entries, file, ensure_ascii=False, indent=2)
+            os.replace(temporary_path, self.path)
+        except OSError as e:
+            scrapper_logger.warning(f"Error saving category cache {self.path}: {e}")
+
+    def _log_diff(self, source, old_categories, new_categories):
+        old = {category["link"]: category["name"] for category in old_categories}
+        new = {category["link"]: category["name"] for category in new_categories}
+
+        changes = [f"+ {new[link]} ({link})" for link in new if link not in old]
+        changes += [f"- {old[link]} ({link})" for link in old if link not in new]
+        changes += [f"~ {old[link]} -> {new[link]} ({link})" for link in new if link in old and old[link] != new[link]]
+        if changes:
+            scrapper_logger.info(f"-- Categories of {source} changed: " + "; ".join(changes))
+
+    def update(self, source, categories):
+        """
+        Сохраняет новый список категорий источника и записывает в лог отличия от предыдущего.
+
+        Аргументы:
+            source (str): Название источника.
+            categories (list): Словари категорий с ключами 'name' и 'link'.
+        """
+        previous = self.entries.get(source)
+        if previous is not None:
+            self._log_diff(source, previous["categories"], categories)
+        self.entries[source] = {"categories": categories, "fetched_at": time.time()}
+        self._save()
+
+    async def _refresh(self, source, load):
+        try:
+            categories = await load()
+        except Exception as e:
+            scrapper_logger.error(f"-- Error refreshing categories of {source}: {e}")
+            categories = []
+
+        if not categories:
+            scrapper_logger.warning(
+                f"-- Refreshing categories of {source} failed, keeping "
+                f"{len(self.entries[source]['categories'])} cached categories.")
+            return
+        self.update(source, categories)
+
+    async def categories(self, source, load):
+        """
+        Возвращает список категорий источника из кэша, а если его нет — загружает.
+        Если сохраненный список устарел, запускает его фоновое обновление и возвращает сохраненный.
+
+        Аргументы:
+            source (str): Название источника.
+            load: Асинхронная функция без аргументов, загружающая список категорий.
+
+        Возвращает:
+            list: Словари категорий с ключами 'name' и 'link'.
+        """
+        entry = self.entries.get(source)
+        if entry is None:
+            categories = await load()
+            if categories:
+                self.update(source, categories)
+            return categories
+
+        if time.time() - entry["fetched_at"] >= self.ttl and source not in self._refreshes:
+            self._refreshes[source] = asyncio.create_task(self._refresh(source, load))
+        return entry["categories"]
+
+    async def wait_refreshes(self):
+        """
+        Ожидает завершения фоновых обновлений, запущенных в этом цикле.
+        """
+        await asyncio.gather(*self._refreshes.values())
@@ -0,0 +1,49 @@
+from config import scrapper_logger
+
+
+class CircuitBreaker:
+    """
+    Предохранитель запросов к одному хосту в рамках цикла скрапинга.
+
+    Считает запросы и сбои (ошибки соединения, тайм-ауты и повторяемые статусы после всех повторов).
+    Когда после `min_requests` запросов доля сбоев достигает `error_rate`, предохранитель размыкается,
+    и все оставшиеся запросы к хосту в этом цикле сразу завершаются без обращения к сети.
+    Планировщик создается заново для каждого цикла, поэтому в следующем цикле хост снова опрашивается.
+
+    Аргументы:
+        host (str): Хост, для которого ведется учет.
+        min_requests (int): Минимальное количество запросов, после которого оценивается доля сбоев.
+        error_rate (float): Доля сбоев от 0 до 1, при которой предохранитель размыкается.
+    """
+
+    def __init__(self, host, min_requests, error_rate):
+        self.host = host
+        self.min_requests = min_requests
+        self.error_rate = error_rate
+        self.requests = 0
+        self.failures = 0
+        self.is_open = False
+
+    def allow(self):
+        """
+        Возвращает True, если запрос к хосту можно выполнить.
+        """
+        return not self.is_open
+
+    def record(self, failed):
+        """
+        Учитывает результат запроса и размыкает предохранитель при превышении доли сбоев.
+
+        Аргументы:
+            failed (bool): Запрос завершился сбоем, указывающим на проблемы сайта.
+        """
+        self.requests += 1
+        if failed:
+            self.failures += 1
+        if self.is_open or self.requests < self.min_requests:
+            return
+        if self.failures / self.requests >= self.error_rate:
+            self.is_open = True
+            scrapper_logger.warning(
+                f"-- Circuit breaker opened for {self.host}: {self.failures} of {self.requests} requests failed, "
+                f"skipping remaining requests in this cycle.")
@@ -0,0 +1,97 @@
+import os
+import gzip
+import json
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Поддерживаемые сжатые снимки: кодировка Content-Encoding -> расширение файла
+SNAPSHOT_EXTENSIONS = {"gzip": "gz", "zstd": "zst"}
+
+
+def snapshot_path(csv_path, encoding):
+    """
+    Возвращает путь к сжатому снимку CSV-файла для указанной кодировки.
+
+    Аргументы:
+        csv_path (str): Путь к CSV файлу.
+        encoding (str): Кодировка из `SNAPSHOT_EXTENSIONS`.
+
+    Возвращает:
+        str: Путь к файлу снимка.
+    """
+    return f"{csv_path}.{SNAPSHOT_EXTENSIONS[encoding]}"
+
+
+# Размер блока при потоковом сжатии, чтобы не читать большой CSV в память целиком
+CHUNK_SIZE = 1024 * 1024
+
+
+def _compressed_writer(encoding, file):
+    if encoding == "gzip":
+        return gzip.GzipFile(fileobj=file, mode="wb", compresslevel=6)
+    return zstandard.ZstdCompressor(level=10).stream_writer(file, closefd=False)
+
+
+def update_compressed_snapshot(csv_path, encoding):
+    """
+    Дописывает в сжатый снимок только ту часть CSV-файла, которая появилась после прошлого обновления.
+
+    Новая часть сжимается отдельным блоком (member для gzip, frame для zstd) и добавляется в конец
+    файла снимка. Склеенные блоки распаковываются стандартными декодерами как один поток,
+    поэтому снимок не нужно пересжимать целиком. Если CSV был заменен или укорочен,
+    снимок пересоздается.
+
+    Аргументы:
+        csv_path (str): Путь к CSV файлу.
+        encoding (str): Кодировка из `SNAPSHOT_EXTENSIONS`.
+    """
+    path = snapshot_path(csv_path, encoding)
+    state_path = f"{path}.state"
+    if not os.path.exists(csv_path):
+        return
+
+    csv_size = os.path.getsize(csv_path)
+    compressed_size = 0
+    if os.path.exists(path) and os.path.exists(state_path):
+        with open(state_path, encoding="utf-8") as file:
+            state = json.load(file)
+        compressed_size = state["csv_size"]
+        if compressed_size > csv_size or state["snapshot_size"] != os.path.getsize(path):
+            compressed_size = 0
+
+    if compressed_size == csv_size:
+        return
+
+    with open(csv_path, mode="rb") as source, open(path, mode="ab" if compressed_size else "wb") as file:
+        source.seek(compressed_size)
+        remaining = csv_size - compressed_size
+        with _compressed_writer(encoding, file) as writer:
+            while remaining > 0:
+                chunk = source.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                writer.write(chunk)
+                remaining -= len(chunk)
+
+    tmp_path = f"{state_path}.tmp"
+    with open(tmp_path, mode="w", encoding="utf-8") as file:
+        json.dump({"csv_size": csv_size, "snapshot_size": os.path.getsize(path)}, file)
+    os.replace(tmp_path, state_path)
+
+
+def update_compressed_snapshots(csv_path, encodings):
+    """
+    Обновляет сжатые снимки CSV-файла для всех указанных кодировок.
+    Снимки zstd пропускаются, если пакет `zstandard` не установлен.
+
+    Аргументы:
+        csv_path (str): Путь к CSV файлу.
+        encodings (Iterable[str]): Кодировки из `SNAPSHOT_EXTENSIONS`.
+    """
+    for encoding in encodings:
+        if encoding == "zstd" and zstandard is None:
+            continue
+        update_compressed_snapshot(csv_path, encoding)
@@ -1,5 +1,13 @@
 import os
 import csv
+import asyncio
+import io
+import gzip
+import json
+import zlib
+from collections import deque
+from tools.bloom_filter import BloomFilter
+from tools.canonical_url import canonicalize_url
 
 def read_existing_articles(file_path):
     """
@@ -19,4 +27,388 @@ def read_existing_articles(file_path):
                 if "article_link" in row:
                     existing_articles.add(row["article_link"])
 
-    return existing_articles
\ No newline at end of file
+    return existing_articles
+
+
+def _read_csv_tail(file_path, offset):
+    """
+    Читает ссылки на статьи из CSV файла, начиная с указанного смещения в байтах.
+
+    Аргументы:
+        file_path (str): Путь к CSV файлу.
+        offset (int): Смещение начала непрочитанных строк. Должно указывать на начало строки.
+
+    Возвращает:
+        set: Множество ссылок на статьи, записанных после смещения.
+    """
+    if offset == 0:
+        return read_existing_articles(file_path)
+
+    links = set()
+    with open(file_path, mode="r", encoding="utf-8", newline="") as file:
+        header = next(csv.reader(file), None)
+    if not header or "article_link" not in header:
+        return links
+
+    with open(file_path, mode="rb") as raw_file:
+        raw_file.seek(offset)
+        file = io.TextIOWrapper(raw_file, encoding="utf-8", newline="")
+        for row in csv.DictReader(file, fieldnames=header):
+            if row.get("article_link"):
+                links.add(row["article_link"])
+    return links
+
+
+def _iter_csv_links(file_path, offset=0):
+    """
+    Построчно перебирает ссылки на статьи из CSV файла, начиная с указанного смещения в байтах,
+    не накапливая их в памяти.
+
+    Аргументы:
+        file_path (str): Путь к CSV файлу.
+        offset (int, optional): Смещение начала непрочитанных строк. Должно указывать на начало строки.
+
+    Возвращает:
+        Итератор ссылок на статьи.
+    """
+    if not os.path.exists(file_path):
+        return
+
+    with open(file_path, mode="r", encoding="utf-8", newline="") as file:
+        header = next(csv.reader(file), None)
+    if not header or "article_link" not in header:
+        return
+
+    with open(file_path, mode="rb") as raw_file:
+        if offset:
+            raw_file.seek(offset)
+        else:
+            raw_file.readline()
+        file = io.TextIOWrapper(raw_file, encoding="utf-8", newline="")
+        for row in csv.DictReader(file, fieldnames=header):
+            if row.get("article_link"):
+                yield row["article_link"]
+
+
+class KnownArticlesIndex:
+    """
+    Индекс ссылок на уже сохраненные статьи, общий для всех скраперов в рамках цикла.
+    Ссылки хранятся и проверяются в каноническом виде (см. `tools.canonical_url`).
+
+    Индекс строится один раз при запуске, дополняется в памяти по мере записи новых строк
+    в CSV и сохраняется в компактный сжатый файл рядом с CSV. При следующем запуске
+    индекс читается из этого файла, а из CSV дочитываются только строки, дописанные
+    после последнего сохранения. Если индекс уже загружен (следующий цикл в той же
+    `ScrapperRuntime`), повторная загрузка только дочитывает новые строки CSV.
+
+    Файл индекса — последовательность gzip-блоков: первый содержит строку с метаданными и все ссылки,
+    а каждое следующее сохранение дописывает блок только с новыми ссылками и новым размером CSV,
+    поэтому стоимость сохранения не растет вместе с историей.
+
+    Аргументы:
+        csv_path (str): Путь к CSV файлу с новостями.
+        index_path (str, optional): Путь к файлу индекса. По умолчанию `<csv_path>.links.gz`.
+    """
+
+    def __init__(self, csv_path, index_path=None):
+        self.csv_path = csv_path
+        self.index_path = index_path or f"{csv_path}.links.gz"
+        self._links = set()
+        self._synced_size = None
+        # Ссылки, которых еще нет в файле индекса, и размер CSV, записанный в файл последним.
+        # None — файл не соответствует индексу в памяти и при сохранении перезаписывается целиком
+        self._new_links = []
+        self._saved_size = None
+
+    def __contains__(self, link):
+        return canonicalize_url(link) in self._links
+
+    def __len__(self):
+        return len(self._links)
+
+    def add(self, link):
+        """
+        Добавляет ссылку на статью в индекс.
+
+        Аргументы:
+            link (str): Ссылка на статью.
+        """
+        link = canonicalize_url(link)
+        if link not in self._links:
+            self._links.add(link)
+            self._new_links.append(link)
+
+    async def confirm(self, links):
+        """
+        Ничего не делает: множество ссылок отвечает точно и без обращения к CSV.
+        Метод есть для совместимости с `BloomArticlesIndex.confirm`.
+        """
+
+    def _read_index(self):
+        """
+        Читает файл индекса.
+
+        Возвращает:
+            tuple: Множество ссылок, размер CSV из последнего блока и признак канонических ссылок,
+                или (None, None, False), если файла нет или он поврежден.
+        """
+        if not os.path.exists(self.index_path):
+            return None, None, False
+        links = set()
+        try:
+            with gzip.open(self.index_path, mode="rt", encoding="utf-8") as file:
+                meta = json.loads(file.readline())
+                indexed_size = meta.get("csv_size")
+                for line in file:
+                    if line.startswith("{"):
+                        # Метаданные блока, дописанного следующим сохранением
+                        indexed_size = json.loads(line).get("csv_size")
+                    else:
+                        links.add(line.rstrip("\n"))
+        except (OSError, ValueError, EOFError, zlib.error):
+            return None, None, False
+        return links, indexed_size, bool(meta.get("canonical"))
+
+    def load(self):
+        """
+        Загружает индекс из файла индекса, дочитывая новые строки CSV,
+        или полностью перестраивает его по CSV, если файл индекса отсутствует или устарел.
+
+        Возвращает:
+            KnownArticlesIndex: Текущий индекс.
+        """
+        csv_size = os.path.getsize(self.csv_path) if os.path.exists(self.csv_path) else 0
+        if self._synced_size is not None and self._synced_size <= csv_size:
+            if self._synced_size < csv_size:
+                for link in _read_csv_tail(self.csv_path, self._synced_size):
+                    self.add(link)
+            self._synced_size = csv_size
+            return self
+
+        links, indexed_size, canonical = self._read_index()
+        self._new_links = []
+        if indexed_size is None or indexed_size > csv_size:
+            self._links = {canonicalize_url(link) for link in read_existing_articles(self.csv_path)}
+            self._saved_size = None
+        else:
+            self._links = links if canonical else {canonicalize_url(link) for link in links}
+            self._saved_size = indexed_size if canonical else None
+            if indexed_size < csv_size:
+                for link in _read_csv_tail(self.csv_path, indexed_size):
+                    self.add(link)
+
+        self._synced_size = csv_size
+        return self
+
+    def save(self):
+        """
+        Сохраняет индекс в файл индекса вместе с размером CSV, которому он соответствует.
+
+        Если файл соответствует индексу в памяти, в него дописывается блок только с новыми ссылками
+        (или ничего не пишется, если изменений нет). Иначе файл перезаписывается целиком
+        через временный файл с последующей атомарной заменой.
+        """
+        csv_size = os.path.getsize(self.csv_path) if os.path.exists(self.csv_path) else 0
+
+        if self._saved_size is not None and os.path.exists(self.index_path):
+            if self._new_links or csv_size != self._saved_size:
+                with gzip.open(self.index_path, mode="at", encoding="utf-8") as file:
+                    file.write(json.dumps({"csv_size": csv_size}) + "\n")
+                    for link in self._new_links:
+                        file.write(link + "\n")
+        else:
+            tmp_path = f"{self.index_path}.tmp"
+            with gzip.open(tmp_path, mode="wt", encoding="utf-8") as file:
+                file.write(json.dumps({"csv_size": csv_size, "canonical": True}) + "\n")
+                for link in self._links:
+                    file.write(link + "\n")
+            os.replace(tmp_path, self.index_path)
+
+        self._new_links = []
+        self._saved_size = csv_size
+        self._synced_size = csv_size
+
+
+class BloomArticlesIndex:
+    """
+    Индекс ссылок на уже сохраненные статьи на основе фильтра Блума с ограниченным расходом памяти.
+
+    Вместо множества всех ссылок в памяти хранятся битовый массив фильтра и точный список
+    последних `recent_size` ссылок. Ответ фильтра «нет» окончательный. Ответ «возможно»
+    подтверждается по списку последних ссылок, а если ссылки в нем нет — проходом по CSV
+    (такое случается для ложноположительных ответов и давно сохраненных статей).
+    Метод `confirm` подтверждает сразу все ссылки страницы категории одним проходом по CSV
+    в отдельном потоке, не блокируя цикл событий. Результаты подтверждения, в том числе
+    отрицательные, запоминаются до следующей загрузки индекса (`load`), чтобы не читать CSV повторно.
+    Ссылки хранятся и проверяются в каноническом виде (см. `tools.canonical_url`).
+    Фильтр вместе со списком последних ссылок сохраняется в файл рядом с CSV,
+    и при следующем запуске из CSV дочитываются только новые строки. Если фильтр уже загружен
+    (следующий цикл в той же `ScrapperRuntime`), повторная загрузка только дочитывает новые строки CSV.
+
+    Аргументы:
+        csv_path (str): Путь к CSV файлу с новостями.
+        capacity (int): Ожидаемое количество ссылок. При переполнении фильтр перестраивается с запасом.
+        error_rate (float): Допустимая доля ложноположительных ответов фильтра.
+        recent_size (int, optional): Количество последних ссылок, хранимых точно.
+        index_path (str, optional): Путь к файлу фильтра. По умолчанию `<csv_path>.bloom`.
+    """
+
+    def __init__(self, csv_path, capacity, error_rate, recent_size=100_000, index_path=None):
+        self.csv_path = csv_path
+        self.index_path = index_path or f"{csv_path}.bloom"
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.filter = BloomFilter(capacity, error_rate)
+        self._recent = deque(maxlen=recent_size)
+        self._recent_links = set()
+        self._confirmed = {}
+        self._synced_size = None
+        self.confirmations = 0
+
+    def __contains__(self, link):
+        link = canonicalize_url(link)
+        if link not in self.filter:
+            return False
+        if link in self._recent_links:
+            return True
+        if link in self._confirmed:
+            return self._confirmed[link]
+
+        # Редкий случай: ложноположительный ответ фильтра или давно сохраненная статья
+        self.confirmations += 1
+        self._apply_confirmed({link}, self._scan_csv({link}))
+        return self._confirmed[link]
+
+    async def confirm(self, links):
+        """
+        Подтверждает по CSV ссылки, на которые фильтр отвечает «возможно», одним проходом по файлу
+        в отдельном потоке. После этого проверка `link in index` для этих ссылок не обращается к CSV.
+
+        Аргументы:
+            links (Iterable[str]): Ссылки на статьи.
+        """
+        pending = set()
+        for link in links:
+            link = canonicalize_url(link)
+            if link in self.filter and link not in self._recent_links and link not in self._confirmed:
+                pending.add(link)
+        if pending:
+            self.confirmations += 1
+            self._apply_confirmed(pending, await asyncio.to_thread(self._scan_csv, pending))
+
+    def _scan_csv(self, links):
+        # Выполняется и в отдельном потоке, поэтому не изменяет состояние индекса
+        found = set()
+        for existing_link in _iter_csv_links(self.csv_path):
+            existing_link = canonicalize_url(existing_link)
+            if existing_link in links:
+                found.add(existing_link)
+                if len(found) == len(links):
+                    break
+        return found
+
+    def _apply_confirmed(self, links, found):
+        for link in links:
+            # Ссылка могла быть записана, пока CSV читался в отдельном потоке
+            self._confirmed[link] = link in found or link in self._recent_links
+
+    def __len__(self):
+        return len(self.filter)
+
+    def _remember(self, link):
+        if len(self._recent) == self._recent.maxlen:
+            self._recent_links.discard(self._recent[0])
+        self._recent.append(link)
+        self._recent_links.add(link)
+
+    def add(self, link):
+        """
+        Добавляет ссылку на статью в индекс.
+
+        Аргументы:
+            link (str): Ссылка на статью.
+        """
+        link = canonicalize_url(link)
+        self.filter.add(link)
+        self._remember(link)
+        self._confirmed.pop(link, None)
+
+    def _rebuild(self):
+        count = sum(1 for _ in _iter_csv_links(self.csv_path))
+        self.filter = BloomFilter(max(self.capacity, count * 2), self.error_rate)
+        self._recent.clear()
+        self._recent_links = set()
+        for link in _iter_csv_links(self.csv_path):
+            self.add(link)
+
+    def load(self):
+        """
+        Загружает фильтр из файла, дочитывая новые строки CSV, или перестраивает его по CSV,
+        если файл отсутствует, устарел, создан с другой долей ошибок или без канонических ссылок,
+        или фильтр переполнен.
+
+        Возвращает:
+            BloomArticlesIndex: Текущий индекс.
+        """
+        csv_size = os.path.getsize(self.csv_path) if os.path.exists(self.csv_path) else 0
+        self._confirmed = {}
+        if self._synced_size is not None and self._synced_size <= csv_size:
+            if self._synced_size < csv_size:
+                for link in _iter_csv_links(self.csv_path, self._synced_size):
+                    self.add(link)
+            if len(self.filter) > self.filter.capacity:
+                self._rebuild()
+            self._synced_size = csv_size
+            return self
+
+        indexed_size = None
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, mode="rb") as file:
+                    meta = json.loads(file.readline())
+                    indexed_size = meta.get("csv_size")
+                    if (indexed_size is not None and indexed_size <= csv_size
+                            and meta["error_rate"] == self.error_rate and meta.get("canonical")):
+                        bits = bytearray(file.read(meta["num_bits"] // 8))
+                        self.filter = BloomFilter(meta["capacity"], meta["error_rate"], bits, meta["count"])
+                        for line in io.TextIOWrapper(file, encoding="utf-8"):
+                            self._remember(line.rstrip("\n"))
+                    else:
+                        indexed_size = None
+            except (OSError, ValueError, KeyError):
+                indexed_size = None
+
+        if indexed_size is None:
+            self._rebuild()
+        elif indexed_size < csv_size:
+            for link in _iter_csv_links(self.csv_path, indexed_size):
+                self.add(link)
+
+        if len(self.filter) > self.filter.capacity:
+            self._rebuild()
+
+        self._synced_size = csv_size
+        return self
+
+    def save(self):
+        """
+        Сохраняет фильтр и последние ссылки в файл вместе с размером CSV, которому они соответствуют.
+        Запись выполняется во временный файл с последующей атомарной заменой.
+        """
+        csv_size = os.path.getsize(self.csv_path) if os.path.exists(self.csv_path) else 0
+        tmp_path = f"{self.index_path}.tmp"
+        meta = {
+            "csv_size": csv_size,
+            "capacity": self.filter.capacity,
+            "error_rate": self.filter.error_rate,
+            "num_bits": self.filter.num_bits,
+            "count": self.filter.count,
+            "canonical": True,
+        }
+
+        with open(tmp_path, mode="wb") as file:
+            file.write(json.dumps(meta).encode("utf-8") + b"\n")
+            file.write(self.filter.bits)
+            file.write("".join(link + "\n" for link in self._recent).encode("utf-8"))
+        os.replace(tmp_path, self.index_path)
+        self._synced_size = csv_size
@@ -1,46 +1,237 @@
-async def async_fetch_html(session, url):
+import time
+import random
+import asyncio
+import contextlib
+import aiohttp
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+from config import (
+    scrapper_logger,
+    FETCH_URL_REWRITE,
+    FETCH_TIMEOUT,
+    FETCH_CONNECT_TIMEOUT,
+    FETCH_RETRIES,
+    FETCH_BACKOFF_BASE,
+    FETCH_BACKOFF_MAX,
+    FETCH_RETRY_AFTER_MAX,
+)
+from tools.metrics import (
+    FETCH_DURATION,
+    FETCH_RESPONSES,
+    FETCH_BYTES,
+    FETCH_RETRIES_TOTAL,
+    FETCH_REJECTED,
+    source_label,
+)
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept-Encoding": "gzip, deflate, br",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Connection": "keep-alive",
+}
+
+# Статусы ответа, при которых запрос повторяется: перегрузка или временная недоступность сайта
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Ошибки, при которых запрос повторяется: сбои соединения, обрыв ответа и тайм-ауты
+RETRYABLE_ERRORS = (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError)
+
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=FETCH_TIMEOUT, connect=FETCH_CONNECT_TIMEOUT)
+
+
+def request_headers(url):
     """
-    Асинхронно загружает HTML контент по указанному URL с использованием заданной сессии.
+    Возвращает заголовки запроса, которые принимает сайт указанного URL.
 
     Аргументы:
-        session (aiohttp.ClientSession): Сессия для выполнения HTTP запросов.
         url (str): URL, по которому нужно выполнить запрос.
 
     Возвращает:
-        str: HTML контент страницы, если запрос успешен.
-        None: Если произошла ошибка при выполнении запроса или статус ответа не равен 200.
+        dict: Заголовки HTTP запроса.
+    """
+    if "https://lenta.ru/" in url:
+        return {"Host": "lenta.ru"}
+    elif "https://www.gazeta.ru/" in url:
+        return {"User-Agent": HEADERS["User-Agent"]}
+    return dict(HEADERS)
 
-    Исключения:
-        Если возникает ошибка при выполнении запроса, она выводится на печать.
+
+def rewrite_url(url):
     """
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-        "Accept-Encoding": "gzip, deflate, br",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-        "Connection": "keep-alive",
-    }
+    Перенаправляет запрос на локальный сервер из `SCRAPPER_FETCH_URL_REWRITE`, если он задан:
+    домен исходного URL становится первым сегментом пути.
+
+    Аргументы:
+        url (str): URL, по которому нужно выполнить запрос.
+
+    Возвращает:
+        str: URL для фактического запроса.
+    """
+    if not FETCH_URL_REWRITE:
+        return url
+
+    parts = urlsplit(url)
+    rewritten = f"{FETCH_URL_REWRITE.rstrip('/')}/{parts.netloc}{parts.path or '/'}"
+    if parts.query:
+        rewritten += f"?{parts.query}"
+    return rewritten
+
+
+def backoff_delay(attempt):
+    """
+    Возвращает паузу перед повтором запроса: случайное значение от 0 до экспоненциально растущей границы
+    (`SCRAPPER_FETCH_BACKOFF_BASE * 2 ** attempt`, не больше `SCRAPPER_FETCH_BACKOFF_MAX`), чтобы повторы
+    разных запросов к сайту не приходили одновременно.
+
+    Аргументы:
+        attempt (int): Номер неудачной попытки, начиная с 0.
+
+    Возвращает:
+        float: Пауза в секундах.
+    """
+    return random.uniform(0, min(FETCH_BACKOFF_MAX, FETCH_BACKOFF_BASE * 2 ** attempt))
+
+
+def retry_after_seconds(value):
+    """
+    Разбирает заголовок `Retry-After`, заданный числом секунд или HTTP-датой.
+
+    Аргументы:
+        value (str): Значение заголовка или None.
 
+    Возвращает:
+        float: Пауза в секундах или None, если заголовка нет или его не удалось разобрать.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
     try:
-        if "https://lenta.ru/" in url:
-            async with session.get(url, headers={"Host": "lenta.ru"}) as response:
-                if response.status == 200:
-                    return await response.text()
-                else:
-                    response.raise_for_status()
-        elif "https://www.gazeta.ru/" in url:
-            async with session.get(url, headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-            }) as response:
-                if response.status == 200:
-                    return await response.text()
-                else:
-                    response.raise_for_status()
-        else:
-            async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    return await response.text()
-                else:
-                    response.raise_for_status()
-    except Exception as e:
-        print(f"Error fetching {url}: {e}")
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
         return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+async def _fetch_once(session, url, headers, cache, source, limiter):
+    """
+    Выполняет одну попытку запроса. При ответе 429 или 503 сообщает ограничителю скорости,
+    что сайт просит снизить нагрузку.
+
+    Возвращает:
+        tuple: HTML контент страницы или None, признак того, что сбой стоит повторить,
+            пауза из заголовка `Retry-After` в секундах или None и признак того, что на условный запрос
+            пришел ответ 304, а сохраненного тела в кэше нет, и страницу нужно запросить целиком.
+    """
+    started = time.monotonic()
+    try:
+        async with session.get(rewrite_url(url), headers=headers, timeout=REQUEST_TIMEOUT) as response:
+            FETCH_RESPONSES.inc(source=source, status=response.status)
+            if response.status == 304 and cache is not None:
+                html = cache.not_modified(url)
+                if html is not None:
+                    return html, False, None, False
+                # Запись кэша уже удалена, поэтому следующий запрос уйдет без условных заголовков
+                scrapper_logger.warning(f"Cached body of {url} is missing, refetching without validators")
+                return None, False, None, True
+            elif response.status == 200:
+                body = await response.read()
+                FETCH_BYTES.inc(len(body), source=source)
+                html = body.decode(response.get_encoding())
+                if cache is not None:
+                    cache.store(url, html, response.headers)
+                return html, False, None, False
+            else:
+                scrapper_logger.warning(f"Error fetching {url}: HTTP {response.status} {response.reason}")
+                retry_after = None
+                if response.status in (429, 503):
+                    retry_after = retry_after_seconds(response.headers.get("Retry-After"))
+                    if limiter is not None and (response.status == 429 or retry_after is not None):
+                        limiter.throttle(url, min(retry_after, FETCH_RETRY_AFTER_MAX) if retry_after is not None else None)
+                return None, response.status in RETRYABLE_STATUSES, retry_after, False
+    except RETRYABLE_ERRORS as e:
+        FETCH_RESPONSES.inc(source=source, status="error")
+        scrapper_logger.warning(f"Error fetching {url}: {type(e).__name__} {e}")
+        return None, True, None, False
+    except Exception as e:
+        FETCH_RESPONSES.inc(source=source, status="error")
+        scrapper_logger.warning(f"Error fetching {url}: {type(e).__name__} {e}")
+        return None, False, None, False
+    finally:
+        FETCH_DURATION.observe(time.monotonic() - started, source=source)
+
+
+async def async_fetch_html(session, url, cache=None, breaker=None, limiter=None, slot=None):
+    """
+    Асинхронно загружает HTML контент по указанному URL с использованием заданной сессии.
+
+    Каждая попытка ограничена тайм-аутами `SCRAPPER_FETCH_TIMEOUT`/`SCRAPPER_FETCH_CONNECT_TIMEOUT`.
+    Ошибки соединения, тайм-ауты и статусы 429/5xx повторяются до `SCRAPPER_FETCH_RETRIES` раз
+    с паузами `backoff_delay`; остальные ошибки (например, 404) не повторяются.
+    Если сайт передал `Retry-After`, повтор выполняется не раньше указанного времени, а при паузе
+    длиннее `SCRAPPER_FETCH_RETRY_AFTER_MAX` запрос не повторяется.
+    Каждая попытка, включая повторы, ожидает разрешения ограничителя скорости хоста, если он передан.
+    Если передан `slot`, каждая попытка занимает его только на время самого запроса:
+    ожидание ограничителя скорости и паузы между повторами выполняются вне слота.
+    Если передан предохранитель хоста и он разомкнут, запрос сразу завершается без обращения к сети.
+
+    Если передан кэш, запрос выполняется как условный (`If-None-Match`/`If-Modified-Since`),
+    а при ответе 304 возвращается сохраненное в кэше тело страницы. Если тела в кэше нет, страница
+    один раз запрашивается целиком без условных заголовков; этот запрос не считается повтором,
+    но так же проходит через предохранитель, ограничитель скорости и слот.
+    Кэш и результат привязаны к исходному URL, даже если запрос перенаправлен функцией `rewrite_url`.
+
+    Аргументы:
+        session (aiohttp.ClientSession): Сессия для выполнения HTTP запросов.
+        url (str): URL, по которому нужно выполнить запрос.
+        cache (HttpCache, optional): Кэш ответов для условных запросов.
+        breaker (CircuitBreaker, optional): Предохранитель хоста, учитывающий сбои запросов.
+        limiter (HostRateLimiter, optional): Ограничитель скорости запросов к хостам.
+        slot (callable, optional): Фабрика асинхронного контекстного менеджера, ограничивающего
+            количество одновременных запросов (например, слоты `FetchScheduler`).
+
+    Возвращает:
+        str: HTML контент страницы, если запрос успешен.
+        None: Если страницу не удалось загрузить. Вызывающий код должен обработать этот случай сам.
+    """
+    if slot is None:
+        slot = contextlib.nullcontext
+
+    source = source_label(url)
+    attempt = 0
+    refetched = False
+    while True:
+        if breaker is not None and not breaker.allow():
+            FETCH_REJECTED.inc(source=source)
+            return None
+
+        if limiter is not None:
+            await limiter.acquire(session, url)
+
+        headers = request_headers(url)
+        if cache is not None:
+            headers.update(cache.conditional_headers(url))
+        async with slot():
+            html, retryable, retry_after, refetch = await _fetch_once(session, url, headers, cache, source, limiter)
+        if refetch and not refetched:
+            refetched = True
+            continue
+        if html is not None or not retryable or attempt == FETCH_RETRIES:
+            break
+        delay = backoff_delay(attempt)
+        if retry_after is not None:
+            if retry_after > FETCH_RETRY_AFTER_MAX:
+                break
+            delay = max(delay, retry_after)
+        FETCH_RETRIES_TOTAL.inc(source=source)
+        await asyncio.sleep(delay)
+        attempt += 1
+
+    if breaker is not None:
+        breaker.record(failed=html is None and retryable)
+    return html
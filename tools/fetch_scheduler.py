@@ -0,0 +1,89 @@
+import asyncio
+import contextlib
+from urllib.parse import urlsplit
+from tools.fetch_html import async_fetch_html
+from tools.circuit_breaker import CircuitBreaker
+
+
+class FetchScheduler:
+    """
+    Планировщик HTTP-запросов, общий для всех скраперов в рамках одного цикла.
+
+    Ограничивает количество одновременных запросов глобально и отдельно для каждого хоста,
+    чтобы скраперы могли запускать загрузку категорий и статей параллельно,
+    не перегружая ни сеть, ни отдельный сайт.
+    Для каждого хоста ведется предохранитель (`CircuitBreaker`), который до конца цикла
+    отключает запросы к сайту с большой долей сбоев, а скорость запросов к каждому сайту
+    ограничивается `HostRateLimiter`, если он передан.
+
+    Аргументы:
+        global_limit (int): Максимальное количество одновременных запросов по всем хостам.
+        per_host_limit (int): Максимальное количество одновременных запросов к одному хосту.
+        http_cache (HttpCache, optional): Кэш ответов для условных запросов к страницам-спискам.
+        breaker_min_requests (int): Количество запросов к хосту, после которого оценивается доля сбоев.
+        breaker_error_rate (float): Доля сбоев, при которой запросы к хосту прекращаются до конца цикла.
+        rate_limiter (HostRateLimiter, optional): Ограничитель скорости запросов к каждому хосту.
+    """
+
+    def __init__(self, global_limit, per_host_limit, http_cache=None, breaker_min_requests=10, breaker_error_rate=0.5,
+                 rate_limiter=None):
+        self.http_cache = http_cache
+        self.rate_limiter = rate_limiter
+        self._global_semaphore = asyncio.Semaphore(global_limit)
+        self._per_host_limit = per_host_limit
+        self._host_semaphores = {}
+        self._breaker_min_requests = breaker_min_requests
+        self._breaker_error_rate = breaker_error_rate
+        self._breakers = {}
+
+    def _host_semaphore(self, url):
+        host = urlsplit(url).netloc
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self._per_host_limit)
+            self._host_semaphores[host] = semaphore
+        return semaphore
+
+    def breaker(self, url):
+        """
+        Возвращает предохранитель хоста указанного URL.
+        """
+        host = urlsplit(url).netloc
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(host, self._breaker_min_requests, self._breaker_error_rate)
+            self._breakers[host] = breaker
+        return breaker
+
+    @contextlib.asynccontextmanager
+    async def _slot(self, url):
+        """
+        Занимает слот хоста, а затем глобальный слот, чтобы запросы,
+        ожидающие загруженный хост, не блокировали запросы к остальным сайтам.
+        """
+        async with self._host_semaphore(url):
+            async with self._global_semaphore:
+                yield
+
+    async def fetch(self, session, url, cacheable=False):
+        """
+        Загружает HTML по указанному URL с учетом глобального лимита и лимита хоста.
+
+        Слоты занимаются отдельно на каждую попытку и только на время самого запроса:
+        ожидание ограничителя скорости, паузы между повторами и `Retry-After`
+        не удерживают слоты и не задерживают запросы к другим сайтам.
+
+        Аргументы:
+            session (aiohttp.ClientSession): Сессия для выполнения HTTP запросов.
+            url (str): URL, по которому нужно выполнить запрос.
+            cacheable (bool): Выполнять условный запрос через кэш ответов.
+                Используется для главных страниц и страниц категорий, которые загружаются каждый цикл.
+
+        Возвращает:
+            str: HTML контент страницы или None, если запрос завершился ошибкой
+                или предохранитель хоста разомкнут.
+        """
+        cache = self.http_cache if cacheable else None
+        return await async_fetch_html(
+            session, url, cache=cache, breaker=self.breaker(url), limiter=self.rate_limiter,
+            slot=lambda: self._slot(url))
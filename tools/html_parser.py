@@ -0,0 +1,166 @@
+import functools
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer
+from config import HTML_PARSER_BACKEND, HTML_PARSE_SUBTREES, scrapper_logger
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import lxml  # noqa: F401
+    _FRAGMENT_PARSER = "lxml"
+except ImportError:
+    _FRAGMENT_PARSER = "html.parser"
+
+# Поддерживаемые движки разбора HTML
+PARSER_BACKENDS = ("html.parser", "lxml", "selectolax")
+
+_backend = HTML_PARSER_BACKEND
+_restrict_subtrees = HTML_PARSE_SUBTREES
+
+
+def set_parser_backend(backend, restrict_subtrees=None):
+    """
+    Переключает движок разбора HTML для текущего процесса.
+
+    Аргументы:
+        backend (str): Один из движков `PARSER_BACKENDS`.
+        restrict_subtrees (bool, optional): Разбирать только объявленные скрапером поддеревья.
+            Если не указан, значение не меняется.
+    """
+    global _backend, _restrict_subtrees
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend: {backend}")
+    _backend = backend
+    if restrict_subtrees is not None:
+        _restrict_subtrees = restrict_subtrees
+
+
+def _matches_subtree(subtrees):
+    """
+    Создает функцию для SoupStrainer, которая пропускает только элементы объявленных поддеревьев.
+    Класс сравнивается так же, как `class_` в BeautifulSoup: по полному значению атрибута
+    или по одному из классов.
+    """
+    def match(name, attrs):
+        for tag, class_name in subtrees:
+            if name != tag:
+                continue
+            if class_name is None:
+                return True
+            classes = attrs.get("class") or ""
+            if not isinstance(classes, str):
+                classes = " ".join(classes)
+            if classes == class_name or class_name in classes.split():
+                return True
+        return False
+
+    return match
+
+
+def _css_selector(subtrees):
+    """
+    Преобразует объявление поддеревьев в CSS-селектор вида `div.a.b, h1`.
+    """
+    selectors = []
+    for tag, class_name in subtrees:
+        selector = tag
+        if class_name:
+            selector += "".join(f".{name}" for name in class_name.split())
+        selectors.append(selector)
+    return ", ".join(selectors)
+
+
+def _select_subtrees_html(html, subtrees):
+    """
+    Быстро находит объявленные поддеревья движком selectolax и возвращает их HTML.
+    Вложенные совпадения пропускаются, так как уже входят во внешнее поддерево.
+    """
+    tree = LexborHTMLParser(html)
+    selected_ids = set()
+    fragments = []
+
+    for node in tree.css(_css_selector(subtrees)):
+        parent = node.parent
+        nested = False
+        while parent is not None:
+            if parent.mem_id in selected_ids:
+                nested = True
+                break
+            parent = parent.parent
+        if nested:
+            continue
+        selected_ids.add(node.mem_id)
+        fragments.append(node.html)
+
+    return "".join(fragments)
+
+
+def make_soup(html, subtrees=None):
+    """
+    Строит дерево BeautifulSoup выбранным в конфигурации движком.
+
+    Если скрапер объявил нужные поддеревья, разбираются только они: для `html.parser`
+    и `lxml` через SoupStrainer, для `selectolax` поддеревья сначала вырезаются
+    быстрым парсером, а BeautifulSoup разбирает только их фрагменты.
+    Поиск по результату выполняется так же, как по полному дереву.
+
+    Аргументы:
+        html (str): HTML контент страницы.
+        subtrees (list, optional): Список пар (тег, класс) корней нужных поддеревьев.
+            Класс может быть None. Если не указан, строится полное дерево.
+
+    Возвращает:
+        BeautifulSoup: Дерево документа или объединение выбранных поддеревьев.
+    """
+    if html is None:
+        raise ValueError("No HTML to parse")
+
+    subtrees = subtrees if _restrict_subtrees else None
+
+    if _backend == "selectolax" and LexborHTMLParser is not None:
+        if subtrees:
+            html = _select_subtrees_html(html, subtrees)
+        return BeautifulSoup(html, _FRAGMENT_PARSER)
+
+    backend = _backend
+    if backend == "selectolax":
+        scrapper_logger.warning("selectolax is not installed, falling back to html.parser")
+        set_parser_backend("html.parser")
+        backend = "html.parser"
+
+    parse_only = SoupStrainer(_matches_subtree(subtrees)) if subtrees else None
+    return BeautifulSoup(html, backend, parse_only=parse_only)
+
+
+@functools.lru_cache(maxsize=None)
+def compile_selector(selector):
+    """
+    Компилирует CSS-селектор движком soupsieve один раз на процесс.
+
+    `Tag.select` BeautifulSoup при каждом вызове заново разбирает строку селектора
+    (или ищет ее в ограниченном кэше soupsieve), а скомпилированный селектор применяется сразу.
+
+    Аргументы:
+        selector (str): CSS-селектор.
+
+    Возвращает:
+        soupsieve.SoupSieve: Скомпилированный селектор.
+    """
+    return soupsieve.compile(selector)
+
+
+def select(node, selector):
+    """
+    Возвращает все элементы поддерева `node`, подходящие под CSS-селектор, в порядке документа.
+    """
+    return compile_selector(selector).select(node)
+
+
+def select_one(node, selector):
+    """
+    Возвращает первый элемент поддерева `node`, подходящий под CSS-селектор, или None.
+    """
+    return compile_selector(selector).select_one(node)
@@ -0,0 +1,192 @@
+import os
+import json
+import time
+import hashlib
+
+
+def _is_valid_entry(entry):
+    """
+    Проверяет, что прочитанная с диска запись кэша содержит все нужные поля.
+    Записи старого формата и поврежденные записи считаются промахом кэша.
+    """
+    return (
+        isinstance(entry, dict)
+        and isinstance(entry.get("url"), str)
+        and isinstance(entry.get("content_hash"), str)
+        and isinstance(entry.get("parsed"), dict)
+        and isinstance(entry.get("size"), int)
+        and isinstance(entry.get("accessed"), (int, float))
+    )
+
+
+class HttpCache:
+    """
+    Дисковый кэш ответов для страниц, которые загружаются каждый цикл (главные страницы
+    и страницы категорий).
+
+    Для каждого URL хранятся тело ответа, валидаторы ETag/Last-Modified, хеш содержимого
+    и результаты разбора страницы. Это позволяет отправлять условные запросы
+    (`If-None-Match`/`If-Modified-Since`) и не разбирать страницу повторно, если сервер
+    вернул 304 или содержимое не изменилось. Общий размер тел ограничен: при превышении
+    удаляются записи, к которым дольше всего не обращались. Записи без нужных полей
+    (поврежденные или старого формата) при загрузке пропускаются и считаются промахом.
+    Объект хранится в `ScrapperRuntime` и переиспользуется между циклами.
+
+    Аргументы:
+        cache_dir (str): Каталог кэша.
+        max_bytes (int): Максимальный общий размер сохраненных тел ответов в байтах.
+    """
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+
+        os.makedirs(cache_dir, exist_ok=True)
+        for file_name in os.listdir(cache_dir):
+            if not file_name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(cache_dir, file_name), encoding="utf-8") as file:
+                    entry = json.load(file)
+            except (OSError, ValueError):
+                continue
+            if _is_valid_entry(entry):
+                self._entries[entry["url"]] = entry
+
+    def _path(self, url, extension):
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.{extension}")
+
+    def _save_entry(self, entry):
+        with open(self._path(entry["url"], "json"), mode="w", encoding="utf-8") as file:
+            json.dump(entry, file, ensure_ascii=False)
+
+    def _read_body(self, url):
+        try:
+            with open(self._path(url, "html"), encoding="utf-8") as file:
+                return file.read()
+        except OSError:
+            return None
+
+    def conditional_headers(self, url):
+        """
+        Возвращает заголовки условного запроса для URL, если он есть в кэше.
+
+        Аргументы:
+            url (str): URL страницы.
+
+        Возвращает:
+            dict: Заголовки `If-None-Match` и/или `If-Modified-Since`. Пустой словарь, если записи нет.
+        """
+        entry = self._entries.get(url)
+        headers = {}
+        if entry is None:
+            return headers
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def not_modified(self, url):
+        """
+        Обрабатывает ответ 304: возвращает сохраненное тело и учитывает попадание в кэш.
+
+        Аргументы:
+            url (str): URL страницы.
+
+        Возвращает:
+            str: Сохраненный HTML, или None, если записи нет или тело отсутствует на диске.
+        """
+        entry = self._entries.get(url)
+        html = self._read_body(url) if entry is not None else None
+        if html is None:
+            self._entries.pop(url, None)
+            return None
+
+        entry["accessed"] = time.time()
+        self._save_entry(entry)
+        self.hits += 1
+        return html
+
+    def store(self, url, html, headers):
+        """
+        Сохраняет полученный ответ 200. Если хеш содержимого совпадает с сохраненным,
+        это учитывается как попадание в кэш, и ранее сохраненные результаты разбора остаются действительными.
+
+        Аргументы:
+            url (str): URL страницы.
+            html (str): HTML контент страницы.
+            headers (Mapping): Заголовки ответа.
+        """
+        content_hash = hashlib.sha1(html.encode("utf-8")).hexdigest()
+        entry = self._entries.get(url)
+
+        if entry is not None and entry["content_hash"] == content_hash:
+            self.hits += 1
+        else:
+            self.misses += 1
+            entry = {"url": url, "content_hash": content_hash, "parsed": {}}
+            with open(self._path(url, "html"), mode="w", encoding="utf-8") as file:
+                file.write(html)
+
+        entry["etag"] = headers.get("ETag")
+        entry["last_modified"] = headers.get("Last-Modified")
+        entry["size"] = len(html.encode("utf-8"))
+        entry["accessed"] = time.time()
+        self._entries[url] = entry
+        self._save_entry(entry)
+        self._evict()
+
+    def get_parsed(self, url, parser_name):
+        """
+        Возвращает сохраненный результат разбора, если он получен для текущего содержимого страницы.
+
+        Аргументы:
+            url (str): URL страницы.
+            parser_name (str): Имя функции извлечения данных.
+
+        Возвращает:
+            Результат разбора или None, если его нет или содержимое страницы изменилось.
+        """
+        entry = self._entries.get(url)
+        if entry is None:
+            return None
+        parsed = entry["parsed"].get(parser_name)
+        if not isinstance(parsed, dict) or parsed.get("content_hash") != entry["content_hash"]:
+            return None
+        return parsed.get("result")
+
+    def store_parsed(self, url, parser_name, result):
+        """
+        Сохраняет результат разбора для текущего содержимого страницы.
+
+        Аргументы:
+            url (str): URL страницы.
+            parser_name (str): Имя функции извлечения данных.
+            result: Результат разбора, сериализуемый в JSON.
+        """
+        entry = self._entries.get(url)
+        if entry is None:
+            return
+        entry["parsed"][parser_name] = {"content_hash": entry["content_hash"], "result": result}
+        self._save_entry(entry)
+
+    def _evict(self):
+        total_size = sum(entry["size"] for entry in self._entries.values())
+        if total_size <= self.max_bytes:
+            return
+
+        for entry in sorted(self._entries.values(), key=lambda entry: entry["accessed"]):
+            if total_size <= self.max_bytes:
+                break
+            for extension in ("html", "json"):
+                try:
+                    os.remove(self._path(entry["url"], extension))
+                except OSError:
+                    pass
+            del self._entries[entry["url"]]
+            total_size -= entry["size"]
@@ -0,0 +1,176 @@
+import bisect
+import threading
+from urllib.parse import urlsplit
+
+# Домены сайтов и соответствующие им метки источников
+SOURCE_HOSTS = {
+    "rbc.ru": "rbk",
+    "lenta.ru": "lenta",
+    "ria.ru": "ria",
+    "gazeta.ru": "gazeta",
+}
+
+# Границы корзин гистограмм длительности по умолчанию, в секундах
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+_lock = threading.Lock()
+_registry = []
+
+
+def source_label(url):
+    """
+    Возвращает метку источника для URL: `rbk`, `lenta`, `ria`, `gazeta` или домен для остальных сайтов.
+    """
+    host = (urlsplit(url).hostname or "").lower()
+    for domain, source in SOURCE_HOSTS.items():
+        if host == domain or host.endswith(f".{domain}"):
+            return source
+    return host or "unknown"
+
+
+def _format_labels(label_names, label_values, extra=()):
+    pairs = list(zip(label_names, label_values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value):
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._values = {}
+        with _lock:
+            _registry.append(self)
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with _lock:
+            items = sorted(self._values.items())
+        for label_values, value in items:
+            lines.extend(self._render_value(label_values, value))
+        return lines
+
+    def _render_value(self, label_values, value):
+        return [f"{self.name}{_format_labels(self.label_names, label_values)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    """
+    Счетчик, который только увеличивается (количество запросов, байтов, статей).
+
+    Аргументы:
+        name (str): Имя метрики.
+        documentation (str): Описание метрики для строки `# HELP`.
+        labels (tuple, optional): Имена меток.
+    """
+
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with _lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """
+    Текущее значение, которое может как расти, так и уменьшаться.
+    """
+
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        with _lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    """
+    Гистограмма наблюдений (длительностей) с накопительными корзинами, суммой и количеством.
+
+    Аргументы:
+        name (str): Имя метрики.
+        documentation (str): Описание метрики для строки `# HELP`.
+        labels (tuple, optional): Имена меток.
+        buckets (tuple, optional): Верхние границы корзин по возрастанию.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with _lock:
+            counts, total = self._values.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._values[key] = (counts, total + value)
+
+    def _render_value(self, label_values, value):
+        counts, total = value
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else _format_value(bound)
+            labels = _format_labels(self.label_names, label_values, [("le", le)])
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.label_names, label_values)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+def render_metrics():
+    """
+    Возвращает все зарегистрированные метрики в текстовом формате Prometheus.
+    """
+    with _lock:
+        metrics = list(_registry)
+    lines = []
+    for metric in metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+FETCH_DURATION = Histogram(
+    "scrapper_fetch_duration_seconds", "HTTP request duration.", labels=("source",))
+FETCH_RESPONSES = Counter(
+    "scrapper_fetch_responses_total", "HTTP responses by status code (error for failed requests).",
+    labels=("source", "status"))
+FETCH_BYTES = Counter(
+    "scrapper_fetch_bytes_total", "Response body bytes received.", labels=("source",))
+FETCH_RETRIES_TOTAL = Counter(
+    "scrapper_fetch_retries_total", "HTTP requests retried after a retryable failure.", labels=("source",))
+FETCH_REJECTED = Counter(
+    "scrapper_fetch_rejected_total", "HTTP requests skipped by an open circuit breaker.", labels=("source",))
+PARSE_DURATION = Histogram(
+    "scrapper_parse_duration_seconds", "HTML extraction duration.", labels=("source", "function"))
+CATEGORY_PAGES = Counter(
+    "scrapper_category_pages_total", "Category listing pages fetched, including pagination.", labels=("source",))
+ARTICLES_FOUND = Counter(
+    "scrapper_articles_found_total", "Article links found on category pages.", labels=("source",))
+ARTICLES_NEW = Counter(
+    "scrapper_articles_new_total", "Article links not yet stored or claimed in the cycle.", labels=("source",))
+ARTICLES_WRITTEN = Counter(
+    "scrapper_articles_written_total", "Articles written to storage.", labels=("source",))
+SOURCE_DURATION = Histogram(
+    "scrapper_source_duration_seconds", "Duration of one source scrape in a cycle.", labels=("source",))
+CYCLE_DURATION = Histogram(
+    "scrapper_cycle_duration_seconds", "Duration of a scraping cycle.")
+LAST_CYCLE_TIMESTAMP = Gauge(
+    "scrapper_last_cycle_timestamp_seconds", "Unix time when the last scraping cycle finished.")
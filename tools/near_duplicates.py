@@ -0,0 +1,311 @@
+import os
+import re
+import json
+import zlib
+from config import scrapper_logger
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Количество хеш-функций MinHash и число полос LSH (по NUM_PERMUTATIONS // LSH_BANDS значений в полосе).
+# При 16 полосах по 8 значений кандидатами становятся пары со сходством примерно от 0.7.
+NUM_PERMUTATIONS = 128
+LSH_BANDS = 16
+
+# Размер шингла в словах
+SHINGLE_SIZE = 3
+
+# Статьи с меньшим количеством шинглов (пустые или очень короткие тексты) не проверяются
+MIN_SHINGLES = 10
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def shingle_hashes(text, shingle_size=SHINGLE_SIZE):
+    """
+    Разбивает текст на шинглы из `shingle_size` соседних слов и возвращает их 32-битные хеши.
+
+    Аргументы:
+        text (str): Текст статьи.
+        shingle_size (int, optional): Количество слов в шингле.
+
+    Возвращает:
+        numpy.ndarray: Уникальные хеши шинглов (uint64).
+    """
+    words = _WORD_PATTERN.findall(text.lower())
+    if not words:
+        return np.empty(0, dtype=np.uint64)
+
+    word_hashes = np.fromiter(
+        (zlib.crc32(word.encode("utf-8")) for word in words), dtype=np.uint64, count=len(words))
+    if len(words) < shingle_size:
+        return np.unique(word_hashes)
+
+    count = len(words) - shingle_size + 1
+    shingles = np.zeros(count, dtype=np.uint64)
+    for offset in range(shingle_size):
+        shingles = shingles * np.uint64(1_000_003) + word_hashes[offset:offset + count]
+    return np.unique(shingles & np.uint64(0xFFFFFFFF))
+
+
+class NearDuplicateIndex:
+    """
+    Индекс MinHash/LSH последних статей для поиска почти совпадающих текстов.
+
+    Для каждой статьи вычисляется подпись MinHash, которая делится на полосы; статьи с совпадающей
+    полосой становятся кандидатами, и для них сходство оценивается по доле совпадающих значений подписи.
+    Поэтому новая статья сравнивается только с несколькими кандидатами, а не со всем архивом.
+    В индексе хранятся последние `window` статей; он сохраняется в файл `.npz` между запусками.
+    Файл читается только при первой загрузке: индекс хранится в `ScrapperRuntime` между циклами,
+    и после сохранения в памяти, как и в файле, остаются последние `window` статей.
+
+    Аргументы:
+        index_path (str): Путь к файлу индекса.
+        threshold (float): Минимальное оценочное сходство Жаккара, при котором статьи считаются почти дубликатами.
+        window (int): Количество последних статей, которые хранятся в индексе.
+    """
+
+    def __init__(self, index_path, threshold, window):
+        self.index_path = index_path
+        self.threshold = threshold
+        self.window = window
+
+        # Хеш-функции вида (a * x + b) >> 32 по модулю 2^64 с нечетными a (multiply-shift)
+        random = np.random.default_rng(1)
+        self._a = random.integers(0, 1 << 63, size=(NUM_PERMUTATIONS, 1), dtype=np.uint64)
+        self._a = self._a * np.uint64(2) + np.uint64(1)
+        self._b = random.integers(0, 1 << 63, size=(NUM_PERMUTATIONS, 1), dtype=np.uint64)
+
+        self._loaded = False
+        self._reset([], np.empty((0, NUM_PERMUTATIONS), dtype=np.uint32))
+
+    def _reset(self, links, signatures):
+        self.links = []
+        self._link_rows = {}
+        self._signatures = np.empty((0, NUM_PERMUTATIONS), dtype=np.uint32)
+        self._new_signatures = []
+        self._buckets = [{} for _ in range(LSH_BANDS)]
+        for link, signature in zip(links, signatures):
+            self.add(link, signature)
+        self._signatures = signatures
+        self._new_signatures = []
+
+    def __contains__(self, link):
+        return link in self._link_rows
+
+    def __len__(self):
+        return len(self.links)
+
+    def signature(self, text):
+        """
+        Вычисляет подпись MinHash текста.
+
+        Аргументы:
+            text (str): Текст статьи.
+
+        Возвращает:
+            numpy.ndarray: Подпись из `NUM_PERMUTATIONS` значений (uint32) или None,
+                если текст короче `MIN_SHINGLES` шинглов.
+        """
+        shingles = shingle_hashes(text)
+        if len(shingles) < MIN_SHINGLES:
+            return None
+        hashed = (self._a * shingles[np.newaxis, :] + self._b) >> np.uint64(32)
+        return hashed.min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signature):
+        return [band.tobytes() for band in np.split(signature, LSH_BANDS)]
+
+    def _row_signature(self, row):
+        if row < len(self._signatures):
+            return self._signatures[row]
+        return self._new_signatures[row - len(self._signatures)]
+
+    def query(self, signature):
+        """
+        Ищет в индексе статью, наиболее похожую на статью с указанной подписью.
+
+        Аргументы:
+            signature (numpy.ndarray): Подпись MinHash статьи.
+
+        Возвращает:
+            tuple: Ссылка на похожую статью и оценка сходства, либо None, если похожих статей нет.
+        """
+        candidates = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            candidates.update(self._buckets[band].get(key, ()))
+
+        best = None
+        for row in candidates:
+            similarity = float(np.mean(self._row_signature(row) == signature))
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (self.links[row], similarity)
+        return best
+
+    def add(self, link, signature):
+        """
+        Добавляет статью в индекс.
+
+        Аргументы:
+            link (str): Ссылка на статью.
+            signature (numpy.ndarray): Подпись MinHash статьи.
+        """
+        row = len(self.links)
+        self.links.append(link)
+        self._link_rows[link] = row
+        self._new_signatures.append(signature)
+        for band, key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(key, []).append(row)
+
+    def load(self):
+        """
+        Загружает индекс из файла, если он существует. Повторная загрузка ничего не делает:
+        индекс в памяти уже содержит все статьи файла и добавленные после него.
+
+        Возвращает:
+            NearDuplicateIndex: Текущий индекс.
+        """
+        if self._loaded:
+            return self
+        self._loaded = True
+        if not os.path.exists(self.index_path):
+            return self
+
+        try:
+            with np.load(self.index_path) as data:
+                signatures = data["signatures"]
+                links = [str(link) for link in data["links"]]
+        except (OSError, ValueError, KeyError) as e:
+            scrapper_logger.error(f"Error loading near-duplicate index {self.index_path}: {e}")
+            return self
+
+        self._reset(links, signatures)
+        return self
+
+    def save(self):
+        """
+        Сохраняет последние `window` статей индекса в файл с атомарной заменой
+        и оставляет в памяти только их.
+        """
+        signatures = self._signatures
+        if self._new_signatures:
+            signatures = np.vstack([signatures, np.array(self._new_signatures, dtype=np.uint32)])
+        links = self.links
+        if len(links) > self.window:
+            signatures = signatures[-self.window:]
+            links = links[-self.window:]
+
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "wb") as file:
+            np.savez(file, signatures=signatures, links=np.array(links, dtype=str))
+        os.replace(tmp_path, self.index_path)
+        if len(self.links) > self.window:
+            self._reset(links, signatures)
+        else:
+            self._signatures = signatures
+            self._new_signatures = []
+
+
+class NearDuplicateStorage:
+    """
+    Этап поиска почти дубликатов между скраперами и хранилищем.
+
+    Перед записью текст статьи сравнивается с последними статьями через индекс MinHash/LSH.
+    Найденные почти дубликаты записываются в журнал `log_path` (JSON Lines: ссылка, ссылка на исходную
+    статью и оценка сходства). В режиме `mark` статья сохраняется как обычно, а в режиме `collapse`
+    не сохраняется; ее ссылка остается в индексе, поэтому в следующих циклах она не загружается повторно.
+
+    Аргументы:
+        storage: Хранилище статей, в которое передаются статьи.
+        index (NearDuplicateIndex): Индекс последних статей.
+        mode (str): `mark` или `collapse`.
+        log_path (str): Путь к журналу найденных почти дубликатов.
+    """
+
+    def __init__(self, storage, index, mode, log_path):
+        if mode not in ("mark", "collapse"):
+            raise ValueError(f"Unknown near-duplicate mode: {mode}")
+        self.storage = storage
+        self.index = index
+        self.mode = mode
+        self.log_path = log_path
+        self.found = 0
+
+    def open(self):
+        self.found = 0
+        self.storage.open()
+        self.index.load()
+
+    def __contains__(self, link):
+        return link in self.storage or link in self.index
+
+    async def confirm_links(self, links):
+        await self.storage.confirm_links(links)
+
+    def write(self, article):
+        """
+        Проверяет статью на почти дубликат и передает ее в хранилище, если она не свернута.
+
+        Аргументы:
+            article (dict): Словарь статьи.
+
+        Возвращает:
+            bool: True, если статья записана в хранилище.
+        """
+        link = article["article_link"]
+        if link in self:
+            return False
+
+        signature = self.index.signature(f"{article.get('article_title', '')} {article.get('article_text', '')}")
+        if signature is None:
+            return self.storage.write(article)
+
+        match = self.index.query(signature)
+        self.index.add(link, signature)
+
+        if match is not None:
+            self.found += 1
+            with open(self.log_path, mode="a", encoding="utf-8") as file:
+                file.write(json.dumps({
+                    "article_link": link,
+                    "duplicate_of": match[0],
+                    "similarity": round(match[1], 3),
+                    "mode": self.mode,
+                }, ensure_ascii=False) + "\n")
+            if self.mode == "collapse":
+                return False
+
+        return self.storage.write(article)
+
+    def close(self):
+        try:
+            self.storage.close()
+        finally:
+            self.index.save()
+        scrapper_logger.info(f"-- Found {self.found} near-duplicate articles ({self.mode}).")
+
+
+def wrap_near_duplicates(storage, mode, index_path, log_path, threshold, window):
+    """
+    Добавляет к хранилищу этап поиска почти дубликатов, если он включен.
+    Этап пропускается с предупреждением, если пакет `numpy` не установлен.
+
+    Аргументы:
+        storage: Хранилище статей.
+        mode (str): `off`, `mark` или `collapse`.
+        index_path (str): Путь к файлу индекса MinHash/LSH.
+        log_path (str): Путь к журналу найденных почти дубликатов.
+        threshold (float): Минимальное оценочное сходство почти дубликатов.
+        window (int): Количество последних статей в индексе.
+
+    Возвращает:
+        Хранилище с этапом поиска почти дубликатов или исходное хранилище.
+    """
+    if mode == "off":
+        return storage
+    if np is None:
+        scrapper_logger.warning("numpy is not installed, near-duplicate detection is disabled.")
+        return storage
+    return NearDuplicateStorage(storage, NearDuplicateIndex(index_path, threshold, window), mode, log_path)
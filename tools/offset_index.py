@@ -0,0 +1,181 @@
+import os
+import struct
+import time
+
+# Запись индекса: смещение начала строки, смещение конца строки, время записи (unix)
+RECORD = struct.Struct("<QQd")
+
+
+def _scan_row_bounds(csv_path, start):
+    """
+    Находит границы CSV-строк в файле, начиная с указанного смещения.
+    Учитывает многострочные значения в кавычках: строка заканчивается на переводе строки
+    только при четном количестве кавычек с начала строки.
+
+    Аргументы:
+        csv_path (str): Путь к CSV файлу.
+        start (int): Смещение начала первой строки.
+
+    Возвращает:
+        list: Список пар (начало, конец) для каждой полной строки.
+    """
+    bounds = []
+    with open(csv_path, mode="rb") as file:
+        file.seek(start)
+        row_start = start
+        position = start
+        in_quotes = False
+        for line in file:
+            position += len(line)
+            if line.count(b'"') % 2:
+                in_quotes = not in_quotes
+            if not in_quotes and line.endswith(b"\n"):
+                bounds.append((row_start, position))
+                row_start = position
+    return bounds
+
+
+class RowOffsetIndex:
+    """
+    Индекс смещений строк CSV-файла с новостями для постраничной выдачи без сканирования файла.
+
+    Индекс хранится в отдельном файле из записей фиксированного размера: для каждой строки
+    данных (без заголовка) — смещение ее начала и конца в CSV и время записи. Номер строки
+    служит курсором, а по времени записи выполняется бинарный поиск. Запись в индекс
+    выполняется только после того, как строка целиком записана в CSV, поэтому читатель
+    в другом потоке или процессе видит только полные строки.
+
+    Аргументы:
+        csv_path (str): Путь к CSV файлу с новостями.
+        index_path (str, optional): Путь к файлу индекса. По умолчанию `<csv_path>.offsets`.
+    """
+
+    def __init__(self, csv_path, index_path=None):
+        self.csv_path = csv_path
+        self.index_path = index_path or f"{csv_path}.offsets"
+
+    def count(self):
+        """
+        Возвращает количество проиндексированных строк данных.
+        """
+        if not os.path.exists(self.index_path):
+            return 0
+        return os.path.getsize(self.index_path) // RECORD.size
+
+    def record(self, row):
+        """
+        Возвращает запись индекса для строки с указанным номером.
+
+        Аргументы:
+            row (int): Номер строки данных, начиная с 0.
+
+        Возвращает:
+            tuple: (начало, конец, время записи).
+        """
+        with open(self.index_path, mode="rb") as file:
+            file.seek(row * RECORD.size)
+            return RECORD.unpack(file.read(RECORD.size))
+
+    def append(self, start, end, written_at=None):
+        """
+        Добавляет в индекс строку, которая уже полностью записана в CSV.
+
+        Аргументы:
+            start (int): Смещение начала строки.
+            end (int): Смещение конца строки.
+            written_at (float, optional): Время записи строки. По умолчанию текущее время.
+        """
+        written_at = time.time() if written_at is None else written_at
+        with open(self.index_path, mode="ab") as file:
+            file.write(RECORD.pack(start, end, written_at))
+
+    def sync(self):
+        """
+        Приводит индекс в соответствие с CSV-файлом: дописывает строки, которые есть в CSV,
+        но отсутствуют в индексе (например, после сбоя или для файла, созданного до появления индекса),
+        и перестраивает индекс, если CSV был заменен или укорочен.
+
+        Строкам без известного времени записи присваивается время последней проиндексированной
+        строки (или 0), чтобы время записи в индексе не убывало.
+        """
+        if not os.path.exists(self.csv_path):
+            if os.path.exists(self.index_path):
+                os.remove(self.index_path)
+            return
+
+        csv_size = os.path.getsize(self.csv_path)
+        count = self.count()
+        if count:
+            _, indexed_end, written_at = self.record(count - 1)
+        if not count or indexed_end > csv_size:
+            if os.path.exists(self.index_path):
+                os.remove(self.index_path)
+            header_bounds = _scan_row_bounds(self.csv_path, 0)[:1]
+            if not header_bounds:
+                return
+            indexed_end, written_at = header_bounds[0][1], 0.0
+
+        if indexed_end == csv_size:
+            return
+
+        with open(self.index_path, mode="ab") as file:
+            for start, end in _scan_row_bounds(self.csv_path, indexed_end):
+                file.write(RECORD.pack(start, end, written_at))
+
+    def first_row_since(self, timestamp):
+        """
+        Находит первую строку, записанную позже указанного времени.
+
+        Аргументы:
+            timestamp (float): Время в формате unix.
+
+        Возвращает:
+            int: Номер строки или количество строк, если таких строк нет.
+        """
+        low, high = 0, self.count()
+        if not high:
+            return 0
+
+        with open(self.index_path, mode="rb") as file:
+            while low < high:
+                middle = (low + high) // 2
+                file.seek(middle * RECORD.size)
+                _, _, written_at = RECORD.unpack(file.read(RECORD.size))
+                if written_at <= timestamp:
+                    low = middle + 1
+                else:
+                    high = middle
+        return low
+
+    def read_header(self):
+        """
+        Возвращает строку заголовка CSV в байтах.
+        """
+        if not self.count():
+            return b""
+        first_start, _, _ = self.record(0)
+        with open(self.csv_path, mode="rb") as file:
+            return file.read(first_start)
+
+    def read_rows(self, start_row, limit):
+        """
+        Читает из CSV строки данных с номерами [start_row, start_row + limit) одним чтением.
+
+        Аргументы:
+            start_row (int): Номер первой строки.
+            limit (int): Максимальное количество строк.
+
+        Возвращает:
+            tuple: (байты строк CSV без заголовка, номер следующей строки для курсора).
+        """
+        count = self.count()
+        start_row = max(0, min(start_row, count))
+        end_row = min(count, start_row + limit)
+        if start_row == end_row:
+            return b"", end_row
+
+        start, _, _ = self.record(start_row)
+        _, end, _ = self.record(end_row - 1)
+        with open(self.csv_path, mode="rb") as file:
+            file.seek(start)
+            return file.read(end - start), end_row
@@ -1,12 +1,95 @@
+import re
 import pytz
 from datetime import datetime
-import locale
+from functools import lru_cache
+
+MOSCOW_TZ = pytz.timezone('Europe/Moscow')
+
+# Названия месяцев: полные (в родительном и именительном падеже) и сокращенные формы,
+# которые выдавала локаль ru_RU.UTF-8 для %B и %b, а также встречающиеся на сайтах варианты
+MONTHS = {
+    1: ("января", "январь", "янв"),
+    2: ("февраля", "февраль", "фев", "февр"),
+    3: ("марта", "март", "мар"),
+    4: ("апреля", "апрель", "апр"),
+    5: ("мая", "май"),
+    6: ("июня", "июнь", "июн"),
+    7: ("июля", "июль", "июл"),
+    8: ("августа", "август", "авг"),
+    9: ("сентября", "сентябрь", "сен", "сент"),
+    10: ("октября", "октябрь", "окт"),
+    11: ("ноября", "ноябрь", "ноя", "нояб"),
+    12: ("декабря", "декабрь", "дек"),
+}
+
+MONTH_NUMBERS = {name: number for number, names in MONTHS.items() for name in names}
+
+_MONTH = r"(?P<month>[а-яё]+)\.?"
+_TIME = r"(?P<hour>\d{1,2}):(?P<minute>\d{1,2})"
+
+# Форматы строк времени источников; пробел соответствует любому количеству пробельных символов, как в strptime
+TIME_FORMATS = {
+    "ria": [re.compile(rf"{_TIME}\s+(?P<day>\d{{1,2}})\.(?P<month>\d{{1,2}})\.(?P<year>\d{{4}})")],
+    "lenta": [re.compile(rf"{_TIME},\s*(?P<day>\d{{1,2}})\s+{_MONTH}\s+(?P<year>\d{{4}})", re.IGNORECASE)],
+    "rbk": [
+        re.compile(rf"{_TIME}"),
+        re.compile(rf"(?P<day>\d{{1,2}})\s+{_MONTH},\s*{_TIME}", re.IGNORECASE),
+    ],
+    "gazeta": [re.compile(rf"(?P<day>\d{{1,2}})\s+{_MONTH}\s+(?P<year>\d{{4}}),\s*{_TIME}", re.IGNORECASE)],
+}
+
+
+def _match_datetime(time_text, name, today):
+    for pattern in TIME_FORMATS[name]:
+        match = pattern.fullmatch(time_text)
+        if not match:
+            continue
+
+        fields = match.groupdict()
+        month = fields.get("month")
+        if month is None:
+            month = today.month
+        elif month.isdigit():
+            month = int(month)
+        elif month.lower() in MONTH_NUMBERS:
+            month = MONTH_NUMBERS[month.lower()]
+        else:
+            continue
+
+        return datetime(
+            year=int(fields["year"]) if fields.get("year") else today.year,
+            month=month,
+            day=int(fields["day"]) if fields.get("day") else today.day,
+            hour=int(fields["hour"]),
+            minute=int(fields["minute"]),
+        )
+    raise ValueError(f"time data {time_text!r} does not match {name} format")
+
+
+@lru_cache(maxsize=4096)
+def _parse_time_text_cached(time_text, name, today):
+    try:
+        article_time = _match_datetime(time_text, name, today)
+        return MOSCOW_TZ.localize(article_time).isoformat()
+    except ValueError:
+        return time_text
+
+
+def _today(name):
+    # Год и день нужны только форматам RBK без года; для остальных источников ключ кэша от даты не зависит
+    if name == "rbk":
+        return datetime.now(MOSCOW_TZ).date()
+    return None
 
 
 def parse_time_text(time_text, name):
     """
     Преобразует строку времени в формат ISO 8601 с учетом часового пояса Москвы.
 
+    Названия месяцев разбираются по собственным таблицам модуля, без смены локали процесса,
+    поэтому функцию можно вызывать из нескольких потоков и процессов парсинга.
+    Результаты для повторяющихся строк берутся из кэша.
+
     Аргументы:
         time_text (str): Строка с временем статьи.
         name (str): Название источника, чтобы определить формат строки времени.
@@ -14,33 +97,25 @@ def parse_time_text(time_text, name):
     Возвращает:
         str: Время статьи в формате ISO 8601 с учетом часового пояса Москвы,
              или оригинальную строку времени в случае ошибки парсинга.
-
-    Исключения:
-        ValueError: Если строка времени не соответствует ожидаемому формату.
     """
-    moscow_tz = pytz.timezone('Europe/Moscow')
-    now = datetime.now(moscow_tz)
-    locale.setlocale(locale.LC_TIME, 'ru_RU.UTF-8')
+    if name not in TIME_FORMATS:
+        return time_text
+    return _parse_time_text_cached(time_text, name, _today(name))
 
-    try:
 
-        if name == "ria":
-            article_time = datetime.strptime(time_text, '%H:%M %d.%m.%Y')
-        elif name == "lenta":
-            article_time = datetime.strptime(time_text, '%H:%M, %d %B %Y')
-        elif name == "rbk":
-            if len(time_text) == 5 and ':' in time_text:
-                article_time = datetime.strptime(time_text, '%H:%M').replace(
-                    year=now.year, month=now.month, day=now.day)
-            else:
-                article_time = datetime.strptime(
-                    time_text, '%d %b, %H:%M').replace(year=now.year)
-        elif name == "gazeta":
-            article_time = datetime.strptime(time_text, '%d %B %Y, %H:%M')
-        else:
-            return time_text
+def parse_time_texts(time_texts, name):
+    """
+    Преобразует список строк времени одного источника в формат ISO 8601.
 
-        article_time = moscow_tz.localize(article_time)
-        return article_time.isoformat()
-    except ValueError:
-        return time_text
+    Аргументы:
+        time_texts (list): Строки с временем статей.
+        name (str): Название источника, чтобы определить формат строк времени.
+
+    Возвращает:
+        list: Время статей в формате ISO 8601 в том же порядке,
+              с оригинальными строками для тех, которые не удалось разобрать.
+    """
+    if name not in TIME_FORMATS:
+        return list(time_texts)
+    today = _today(name)
+    return [_parse_time_text_cached(time_text, name, today) for time_text in time_texts]
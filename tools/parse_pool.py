@@ -0,0 +1,51 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from config import PARSE_WORKERS
+
+_executor = None
+
+
+def get_parse_executor():
+    """
+    Возвращает общий пул процессов парсинга, создавая его при первом обращении.
+
+    Возвращает:
+        ProcessPoolExecutor: Пул процессов, или None, если `PARSE_WORKERS` равен 0.
+    """
+    global _executor
+    if _executor is None and PARSE_WORKERS > 0:
+        _executor = ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+    return _executor
+
+
+async def run_parse(extract_function, *args):
+    """
+    Выполняет функцию извлечения данных из HTML в пуле процессов парсинга
+    или в текущем процессе, если пул отключен.
+
+    Функция и аргументы передаются в другой процесс, поэтому функция должна быть
+    определена на уровне модуля, а результат должен состоять из простых типов.
+
+    Аргументы:
+        extract_function: Функция извлечения данных из HTML.
+        *args: Аргументы функции извлечения.
+
+    Возвращает:
+        Результат функции извлечения.
+    """
+    executor = get_parse_executor()
+    if executor is None:
+        return extract_function(*args)
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, extract_function, *args)
+
+
+def shutdown_parse_pool():
+    """
+    Останавливает пул процессов парсинга, если он был создан.
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
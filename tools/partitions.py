@@ -0,0 +1,74 @@
+import os
+import re
+from datetime import datetime
+
+# Форматы ключей разделов, как у месячных файлов логов в `tools.logger.setup_logger`
+PARTITION_FORMATS = {
+    "month": "%Y_%m",
+    "day": "%Y_%m_%d",
+}
+
+PARTITION_KEY_PATTERN = re.compile(r"\d{4}_\d{2}(?:_\d{2})?")
+
+
+def partition_key(partitioning, when=None):
+    """
+    Возвращает ключ раздела для указанного момента времени.
+
+    Args:
+        partitioning (str): Схема разбиения: `none`, `month` или `day`.
+        when (datetime, optional): Момент времени. По умолчанию текущее время.
+
+    Returns:
+        str: Ключ раздела, например `2024_05` или `2024_05_17`, либо None без разбиения.
+    """
+    if partitioning not in PARTITION_FORMATS:
+        return None
+    return (when or datetime.now()).strftime(PARTITION_FORMATS[partitioning])
+
+
+def partition_path(base_path, key):
+    """
+    Возвращает путь к файлу раздела: `news_data.csv` -> `news_data_2024_05.csv`.
+
+    Args:
+        base_path (str): Путь к основному файлу с новостями.
+        key (str): Ключ раздела. Если не указан, возвращается основной файл.
+
+    Returns:
+        str: Путь к файлу раздела.
+    """
+    if not key:
+        return base_path
+    stem, ext = os.path.splitext(base_path)
+    return f"{stem}_{key}{ext}"
+
+
+def list_partitions(base_path):
+    """
+    Возвращает существующие разделы файла с новостями в порядке от старых к новым.
+
+    Основной файл без ключа (данные, собранные до включения разбиения) считается самым старым разделом.
+
+    Args:
+        base_path (str): Путь к основному файлу с новостями.
+
+    Returns:
+        list: Список пар (ключ раздела или None для основного файла, путь к файлу).
+    """
+    directory = os.path.dirname(base_path) or "."
+    stem, ext = os.path.splitext(os.path.basename(base_path))
+    name_pattern = re.compile(
+        rf"{re.escape(stem)}_({PARTITION_KEY_PATTERN.pattern}){re.escape(ext)}")
+
+    partitions = []
+    if os.path.isdir(directory):
+        for file_name in os.listdir(directory):
+            match = name_pattern.fullmatch(file_name)
+            if match:
+                partitions.append((match.group(1), os.path.join(directory, file_name)))
+    partitions.sort()
+
+    if os.path.exists(base_path):
+        partitions.insert(0, (None, base_path))
+    return partitions
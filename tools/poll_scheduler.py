@@ -0,0 +1,111 @@
+import time
+
+# Коэффициент сглаживания скорости появления новых статей (0..1).
+# Чем больше значение, тем быстрее интервал реагирует на последний запуск.
+RATE_SMOOTHING = 0.5
+
+# Во сколько раз увеличивается интервал, если у источника еще не наблюдалось новых статей
+IDLE_BACKOFF = 1.5
+
+# Минимальное отношение интервала к длительности запуска источника
+DURATION_FACTOR = 2
+
+
+class AdaptivePollScheduler:
+    """
+    Планировщик опроса источников с отдельным временем следующего запуска для каждого источника.
+
+    После каждого запуска интервал источника пересчитывается по наблюдаемой скорости
+    появления новых статей так, чтобы за один опрос набиралось около `target_articles` статей.
+    Источники с большим потоком новостей опрашиваются чаще, а «тихие» — реже.
+    Интервал не бывает меньше удвоенной длительности запуска источника
+    и всегда остается в пределах [min_interval, max_interval].
+
+    Аргументы:
+        sources (Iterable[str]): Названия источников.
+        min_interval (float): Минимальный интервал опроса в секундах.
+        max_interval (float): Максимальный интервал опроса в секундах.
+        initial_interval (float): Начальный интервал опроса в секундах.
+        target_articles (int): Желаемое количество новых статей за один опрос.
+    """
+
+    def __init__(self, sources, min_interval, max_interval, initial_interval, target_articles):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_articles = target_articles
+
+        now = time.monotonic()
+        self._intervals = {source: initial_interval for source in sources}
+        self._next_run = {source: now for source in sources}
+        self._last_run = {}
+        self._rates = {}
+
+    def due_sources(self, now=None):
+        """
+        Возвращает источники, время запуска которых наступило.
+
+        Аргументы:
+            now (float, optional): Текущее время по `time.monotonic()`.
+
+        Возвращает:
+            list: Названия источников, которые нужно запустить.
+        """
+        now = time.monotonic() if now is None else now
+        return [source for source, next_run in self._next_run.items() if next_run <= now]
+
+    def seconds_until_next_run(self, now=None):
+        """
+        Возвращает время до ближайшего запуска любого источника.
+
+        Аргументы:
+            now (float, optional): Текущее время по `time.monotonic()`.
+
+        Возвращает:
+            float: Количество секунд (не меньше 0).
+        """
+        now = time.monotonic() if now is None else now
+        return max(0.0, min(self._next_run.values()) - now)
+
+    def interval(self, source):
+        """
+        Возвращает текущий интервал опроса источника в секундах.
+        """
+        return self._intervals[source]
+
+    def record(self, source, new_articles, duration, now=None):
+        """
+        Учитывает результат запуска источника и назначает время его следующего запуска.
+
+        Аргументы:
+            source (str): Название источника.
+            new_articles (int): Количество новых статей, найденных за запуск.
+            duration (float): Длительность запуска в секундах.
+            now (float, optional): Время окончания запуска по `time.monotonic()`.
+
+        Возвращает:
+            float: Новый интервал опроса источника в секундах.
+        """
+        now = time.monotonic() if now is None else now
+        interval = self._intervals[source]
+        last_run = self._last_run.get(source)
+        started = now - duration
+
+        if last_run is not None and started > last_run:
+            rate = new_articles / (started - last_run)
+            previous_rate = self._rates.get(source)
+            if previous_rate is not None:
+                rate = RATE_SMOOTHING * rate + (1 - RATE_SMOOTHING) * previous_rate
+            self._rates[source] = rate
+
+            if rate > 0:
+                interval = self.target_articles / rate
+            else:
+                interval *= IDLE_BACKOFF
+
+        interval = max(interval, duration * DURATION_FACTOR)
+        interval = min(max(interval, self.min_interval), self.max_interval)
+
+        self._intervals[source] = interval
+        self._last_run[source] = started
+        self._next_run[source] = started + interval
+        return interval
@@ -0,0 +1,181 @@
+import io
+import os
+import sys
+import time
+import pstats
+import asyncio
+import cProfile
+import threading
+import traceback
+import tracemalloc
+from datetime import datetime
+from contextlib import nullcontext
+from config import scrapper_logger
+
+# Количество строк в разделах отчета
+TOP_FUNCTIONS = 40
+TOP_ALLOCATIONS = 25
+
+# Количество внутренних кадров стека, записываемых для блокировки цикла событий
+STACK_DEPTH = 12
+
+# Сколько циклов уже профилировано в этом процессе
+_profiled_cycles = 0
+
+
+class CycleProfiler:
+    """
+    Профилирует один цикл скрапинга: время функций (cProfile), места выделения памяти (tracemalloc)
+    и промежутки, в которые цикл событий был заблокирован дольше порога.
+
+    Блокировки находятся без отладочного режима asyncio, который сам сильно замедляет цикл:
+    задача-пульс засыпает на половину порога и измеряет опоздание пробуждения, а фоновый поток
+    в это время записывает стек потока цикла событий, чтобы было видно, какой код его занимал.
+
+    Профилируется только поток цикла событий. Разбор страниц в пуле процессов (`SCRAPPER_PARSE_WORKERS`)
+    в отчет не попадает, поэтому для профилирования парсинга пул лучше отключить.
+    По завершении в отдельном каталоге отчета сохраняются `cycle.prof` (открывается `pstats` или snakeviz)
+    и текстовый отчет `report.txt`.
+
+    Аргументы:
+        report_dir (str): Каталог, в котором создается каталог отчета цикла.
+        slow_callback_ms (float): Порог блокировки цикла событий в миллисекундах, после которого она попадает в отчет.
+    """
+
+    def __init__(self, report_dir, slow_callback_ms):
+        self.report_dir = report_dir
+        self.slow_callback_ms = slow_callback_ms
+        self.threshold = slow_callback_ms / 1000
+        self.profile = cProfile.Profile()
+        self.blocked_spans = []
+        self.started = None
+
+        # Время последнего пробуждения пульса и стек, записанный фоновым потоком во время блокировки
+        self._tick = None
+        self._blocked_stack = None
+        self._stop_watching = threading.Event()
+
+    async def _heartbeat(self):
+        interval = self.threshold / 2
+        while True:
+            self._tick = time.perf_counter()
+            await asyncio.sleep(interval)
+            lag = time.perf_counter() - self._tick - interval
+            if lag >= self.threshold:
+                tick, stack = self._blocked_stack or (None, None)
+                self.blocked_spans.append(
+                    (self._tick - self._started_perf, lag, stack if tick == self._tick else None))
+
+    def _watch(self, loop_thread_id):
+        interval = self.threshold / 2
+        while not self._stop_watching.wait(interval):
+            tick = self._tick
+            if time.perf_counter() - tick < self.threshold + interval:
+                continue
+            if self._blocked_stack is not None and self._blocked_stack[0] == tick:
+                continue
+            frame = sys._current_frames().get(loop_thread_id)
+            if frame is not None:
+                self._blocked_stack = (tick, traceback.extract_stack(frame)[-STACK_DEPTH:])
+
+    async def __aenter__(self):
+        self.started = time.time()
+        self._started_perf = time.perf_counter()
+
+        self.tracemalloc_was_tracing = tracemalloc.is_tracing()
+        if not self.tracemalloc_was_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+
+        self._tick = time.perf_counter()
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
+        self._watcher = threading.Thread(
+            target=self._watch, args=(threading.get_ident(),), name="cycle-profiler-watchdog", daemon=True)
+        self._watcher.start()
+
+        self.profile.enable()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, exc_traceback):
+        self.profile.disable()
+        duration = time.time() - self.started
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        if not self.tracemalloc_was_tracing:
+            tracemalloc.stop()
+
+        self._stop_watching.set()
+        self._heartbeat_task.cancel()
+        try:
+            await self._heartbeat_task
+        except asyncio.CancelledError:
+            pass
+        self._watcher.join()
+
+        try:
+            report_path = self.write_report(duration, snapshot, peak)
+            scrapper_logger.info(f"-- Profile report: {report_path}")
+        except OSError as e:
+            scrapper_logger.error(f"Error writing profile report: {e}")
+        return False
+
+    def write_report(self, duration, snapshot, peak):
+        """
+        Сохраняет данные cProfile и текстовый отчет в новый каталог и возвращает путь к отчету.
+        """
+        run_dir = os.path.join(
+            self.report_dir, f"cycle_{datetime.fromtimestamp(self.started):%Y_%m_%d_%H%M%S}_{os.getpid()}")
+        os.makedirs(run_dir, exist_ok=True)
+        self.profile.dump_stats(os.path.join(run_dir, "cycle.prof"))
+
+        report = io.StringIO()
+        report.write(f"Cycle started at {datetime.fromtimestamp(self.started).isoformat(timespec='seconds')}, "
+                     f"took {duration:.2f} s, peak traced memory {peak / 1024 / 1024:.1f} MiB\n")
+
+        for sort_key in ("cumulative", "tottime"):
+            report.write(f"\n===== Top {TOP_FUNCTIONS} functions by {sort_key} time =====\n")
+            stats = pstats.Stats(self.profile, stream=report)
+            stats.strip_dirs().sort_stats(sort_key).print_stats(TOP_FUNCTIONS)
+
+        report.write(f"\n===== Top {TOP_ALLOCATIONS} allocation sites alive at the end of the cycle =====\n")
+        snapshot = snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ])
+        for statistic in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+            report.write(f"{statistic}\n")
+
+        spans = self.blocked_spans
+        report.write(f"\n===== Event loop blocked longer than {self.slow_callback_ms:g} ms: "
+                     f"{len(spans)} spans, {sum(seconds for _, seconds, _ in spans):.2f} s total =====\n")
+        for offset, seconds, stack in sorted(spans, key=lambda span: span[1], reverse=True):
+            report.write(f"\n+{offset:.3f} s, blocked {seconds * 1000:.1f} ms\n")
+            if stack:
+                report.writelines(traceback.format_list(stack))
+
+        report_path = os.path.join(run_dir, "report.txt")
+        with open(report_path, mode="w", encoding="utf-8") as file:
+            file.write(report.getvalue())
+        return report_path
+
+
+def cycle_profiler(cycles, report_dir, slow_callback_ms):
+    """
+    Возвращает профилировщик для очередного цикла скрапинга, пока в процессе профилировано
+    меньше `cycles` циклов, и пустой асинхронный контекст в остальных случаях, чтобы без профилирования
+    цикл выполнялся без накладных расходов.
+
+    Аргументы:
+        cycles (int): Количество первых циклов процесса, которые нужно профилировать. 0 отключает профилирование.
+        report_dir (str): Каталог отчетов.
+        slow_callback_ms (float): Порог длительности блокирующих колбэков в миллисекундах.
+
+    Возвращает:
+        CycleProfiler или contextlib.nullcontext.
+    """
+    global _profiled_cycles
+    if _profiled_cycles >= cycles:
+        return nullcontext()
+    _profiled_cycles += 1
+    return CycleProfiler(report_dir, slow_callback_ms)
@@ -0,0 +1,251 @@
+import os
+import re
+import json
+import time
+import asyncio
+from urllib.parse import urlsplit
+from config import scrapper_logger
+from tools.fetch_html import request_headers, rewrite_url, REQUEST_TIMEOUT
+
+# Минимальная скорость запросов к хосту после снижений из-за ответов 429, запросов в секунду
+MIN_RATE = 0.2
+
+# Значение `Request-rate`: количество запросов за период, например `1/5` или `1/5s`
+REQUEST_RATE_PATTERN = re.compile(r"(\d+)\s*/\s*(\d+(?:\.\d+)?)\s*([smh]?)", re.IGNORECASE)
+REQUEST_RATE_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600}
+
+
+def robots_delay(text):
+    """
+    Возвращает минимальный интервал между запросами в секундах, который robots.txt задает
+    для всех роботов (`User-agent: *`) директивами `Crawl-delay` и `Request-rate`.
+
+    В отличие от `urllib.robotparser`, дробные значения `Crawl-delay` (например, `0.5`) поддерживаются.
+
+    Аргументы:
+        text (str): Содержимое robots.txt.
+
+    Возвращает:
+        float: Интервал в секундах или None, если robots.txt его не задает.
+
+    Пример:
+        >>> robots_delay("User-agent: Yandex\\nCrawl-delay: 5\\n\\nUser-agent: *\\nCrawl-delay: 0.5\\n")
+        0.5
+        >>> robots_delay("User-agent: *\\nRequest-rate: 1/10s\\nDisallow: /search\\n")
+        10.0
+    """
+    delays = []
+    applies = False
+    in_rules = False
+    for line in text.splitlines():
+        line = line.split("#", 1)[0].strip()
+        if ":" not in line:
+            continue
+        field, value = (part.strip() for part in line.split(":", 1))
+        field = field.lower()
+
+        if field == "user-agent":
+            # Строки User-agent после правил начинают новую группу
+            if in_rules:
+                applies = in_rules = False
+            applies = applies or value == "*"
+            continue
+
+        in_rules = True
+        if not applies:
+            continue
+        if field == "crawl-delay":
+            try:
+                delays.append(float(value))
+            except ValueError:
+                pass
+        elif field == "request-rate":
+            match = REQUEST_RATE_PATTERN.match(value)
+            if match and int(match.group(1)):
+                seconds = float(match.group(2)) * REQUEST_RATE_UNITS[match.group(3).lower()]
+                delays.append(seconds / int(match.group(1)))
+
+    delays = [delay for delay in delays if delay > 0]
+    return max(delays) if delays else None
+
+
+class TokenBucket:
+    """
+    Ограничитель скорости запросов «ведро с токенами»: в среднем `rate` запросов в секунду
+    с возможностью кратковременно выполнить до `burst` запросов подряд.
+    Ожидающие запросы обслуживаются по очереди.
+
+    Аргументы:
+        rate (float): Средняя скорость запросов в секунду.
+        burst (int): Емкость ведра — количество запросов, которые можно выполнить без ожидания.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """
+        Ожидает, пока в ведре появится токен и закончится пауза, и забирает токен.
+        """
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+
+                self.tokens = min(self.capacity, self.tokens + max(0.0, now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def pause(self, seconds):
+        """
+        Приостанавливает выдачу токенов на указанное время (например, по заголовку `Retry-After`).
+        После паузы ведро начинает заполняться заново.
+        """
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+        self.updated = self.blocked_until
+
+    def slow_down(self):
+        """
+        Вдвое снижает скорость запросов, но не ниже `MIN_RATE`.
+        """
+        self.rate = max(MIN_RATE, self.rate / 2)
+
+
+class HostRateLimiter:
+    """
+    Ограничивает скорость запросов к каждому хосту отдельным `TokenBucket`.
+
+    Скорость хоста берется из `rates` или `default_rate` и снижается до `Crawl-delay`/`Request-rate`
+    из robots.txt сайта, если они строже. robots.txt загружается один раз при первом запросе к хосту,
+    а результат сохраняется в файл `cache_path` и используется повторно в течение `robots_ttl` секунд.
+
+    Аргументы:
+        default_rate (float): Скорость запросов к хосту в секунду. 0 отключает ограничение.
+        burst (int): Количество запросов к хосту, которые можно выполнить без ожидания.
+        rates (dict, optional): Скорость для отдельных хостов: хост -> запросов в секунду.
+        cache_path (str, optional): Файл с сохраненными задержками из robots.txt. Если не указан, robots.txt не читается.
+        robots_ttl (float): Время, в течение которого сохраненные данные robots.txt считаются актуальными, в секундах.
+    """
+
+    def __init__(self, default_rate, burst, rates=None, cache_path=None, robots_ttl=86400):
+        self.default_rate = default_rate
+        self.burst = burst
+        self.rates = rates or {}
+        self.cache_path = cache_path
+        self.robots_ttl = robots_ttl
+        self._buckets = {}
+        self._bucket_locks = {}
+        self._robots = self._load_robots_cache()
+
+    def _load_robots_cache(self):
+        if self.cache_path is None or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError) as e:
+            scrapper_logger.warning(f"Ignoring robots.txt cache {self.cache_path}: {e}")
+            return {}
+
+    def _save_robots_cache(self):
+        temporary_path = f"{self.cache_path}.tmp"
+        try:
+            with open(temporary_path, mode="w", encoding="utf-8") as file:
+                json.dump(self._robots, file, ensure_ascii=False, indent=2)
+            os.replace(temporary_path, self.cache_path)
+        except OSError as e:
+            scrapper_logger.warning(f"Error saving robots.txt cache {self.cache_path}: {e}")
+
+    async def _robots_delay(self, session, scheme, host):
+        """
+        Возвращает минимальный интервал между запросами к хосту по robots.txt в секундах или None.
+        """
+        entry = self._robots.get(host)
+        if entry is not None and time.time() - entry["fetched_at"] < self.robots_ttl:
+            return entry["delay"]
+
+        url = f"{scheme}://{host}/robots.txt"
+        try:
+            async with session.get(rewrite_url(url), headers=request_headers(url), timeout=REQUEST_TIMEOUT) as response:
+                if response.status >= 500:
+                    scrapper_logger.warning(f"Error fetching {url}: HTTP {response.status}")
+                    return None
+                text = await response.text() if response.status == 200 else ""
+        except Exception as e:
+            # Не сохраняем результат, чтобы повторить запрос в следующем цикле
+            scrapper_logger.warning(f"Error fetching {url}: {type(e).__name__} {e}")
+            return None
+
+        delay = robots_delay(text)
+        self._robots[host] = {"delay": delay, "fetched_at": time.time()}
+        if self.cache_path is not None:
+            self._save_robots_cache()
+        if delay:
+            scrapper_logger.info(f"-- robots.txt of {host} asks for {delay:g} s between requests.")
+        return delay
+
+    async def bucket(self, session, url):
+        """
+        Возвращает ведро токенов хоста указанного URL, создавая его при первом обращении.
+        Для хостов без ограничения скорости возвращает None.
+        """
+        parts = urlsplit(url)
+        host = parts.netloc
+        if host in self._buckets:
+            return self._buckets[host]
+
+        lock = self._bucket_locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            if host in self._buckets:
+                return self._buckets[host]
+
+            rate = self.rates.get(host, self.default_rate)
+            burst = self.burst
+            if self.cache_path is not None:
+                delay = await self._robots_delay(session, parts.scheme, host)
+                if delay:
+                    rate = min(rate, 1 / delay) if rate > 0 else 1 / delay
+                    burst = 1
+            self._buckets[host] = TokenBucket(rate, burst) if rate > 0 else None
+            return self._buckets[host]
+
+    async def acquire(self, session, url):
+        """
+        Ожидает разрешения на запрос к хосту указанного URL.
+
+        Аргументы:
+            session (aiohttp.ClientSession): Сессия, через которую при необходимости загружается robots.txt.
+            url (str): URL запроса.
+        """
+        bucket = await self.bucket(session, url)
+        if bucket is not None:
+            await bucket.acquire()
+
+    def throttle(self, url, retry_after=None):
+        """
+        Учитывает ответ сайта о перегрузке: приостанавливает запросы к хосту на `retry_after` секунд,
+        если сайт передал `Retry-After`, а при ответе 429 без него вдвое снижает скорость запросов к хосту
+        до конца цикла.
+
+        Аргументы:
+            url (str): URL запроса, получившего ответ.
+            retry_after (float, optional): Пауза из заголовка `Retry-After` в секундах.
+        """
+        bucket = self._buckets.get(urlsplit(url).netloc)
+        if bucket is None:
+            return
+        if retry_after is not None:
+            bucket.pause(retry_after)
+        else:
+            bucket.slow_down()
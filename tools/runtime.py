@@ -0,0 +1,64 @@
+import asyncio
+import aiohttp
+from config import (
+    CONNECTOR_LIMIT,
+    CONNECTOR_LIMIT_PER_HOST,
+    DNS_CACHE_TTL,
+    KEEPALIVE_TIMEOUT,
+)
+from tools.parse_pool import shutdown_parse_pool
+
+
+class ScrapperRuntime:
+    """
+    Долгоживущая среда выполнения скрапера для периодических запусков.
+
+    Хранит один цикл событий и одну сессию aiohttp с пулом соединений `TCPConnector`
+    между циклами скрапинга, чтобы каждый цикл не создавал заново цикл событий,
+    не повторял DNS-запросы и TLS-рукопожатия, а переиспользовал keep-alive соединения.
+    Также хранит хранилище статей с индексом известных ссылок и кэш ответов, которые
+    создает первый цикл `scrapper.main`, чтобы следующие циклы не перестраивали их с диска.
+    Объект должен использоваться из одного потока.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.session = None
+        self.storage = None
+        self.http_cache = None
+
+    async def _create_session(self):
+        connector = aiohttp.TCPConnector(
+            limit=CONNECTOR_LIMIT,
+            limit_per_host=CONNECTOR_LIMIT_PER_HOST,
+            ttl_dns_cache=DNS_CACHE_TTL,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+        )
+        return aiohttp.ClientSession(connector=connector)
+
+    def run(self, coroutine_function, *args, **kwargs):
+        """
+        Выполняет корутину в цикле событий среды, передавая ей общую сессию и саму среду.
+
+        Аргументы:
+            coroutine_function: Асинхронная функция, принимающая именованные аргументы `session` и `runtime`.
+            *args: Позиционные аргументы функции.
+            **kwargs: Именованные аргументы функции.
+
+        Возвращает:
+            Результат выполнения корутины.
+        """
+        if self.session is None or self.session.closed:
+            self.session = self.loop.run_until_complete(self._create_session())
+        return self.loop.run_until_complete(
+            coroutine_function(*args, session=self.session, runtime=self, **kwargs))
+
+    def close(self):
+        """
+        Закрывает сессию и цикл событий среды и останавливает пул процессов парсинга.
+        """
+        if self.session is not None and not self.session.closed:
+            self.loop.run_until_complete(self.session.close())
+        self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+        self.loop.close()
+        shutdown_parse_pool()
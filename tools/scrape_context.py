@@ -0,0 +1,217 @@
+import time
+from tools.parse_pool import run_parse
+from tools.metrics import PARSE_DURATION, ARTICLES_FOUND, ARTICLES_NEW, CATEGORY_PAGES, source_label
+from tools.canonical_url import canonicalize_url
+
+
+class ScrapeContext:
+    """
+    Общее состояние одного цикла скрапинга, которое передается во все скраперы.
+
+    Аргументы:
+        session (aiohttp.ClientSession): Сессия для выполнения HTTP запросов.
+        scheduler (FetchScheduler): Планировщик запросов с ограничениями параллелизма.
+        known_articles: Хранилище статей, по которому проверяется, сохранена ли уже ссылка (`link in known_articles`).
+        queue (asyncio.Queue): Очередь готовых статей, которую разбирает задача записи.
+        max_pages (int): Наибольшее количество страниц списка статей, которое загружается в одной категории.
+        known_run (int): Количество известных ссылок подряд, после которого следующие страницы категории не загружаются.
+        category_cache (CategoryCache, optional): Кэш списков категорий источников.
+    """
+
+    def __init__(self, session, scheduler, known_articles, queue, max_pages=1, known_run=5, category_cache=None):
+        self.session = session
+        self.scheduler = scheduler
+        self.known_articles = known_articles
+        self.queue = queue
+        self.max_pages = max_pages
+        self.known_run = known_run
+        self.category_cache = category_cache
+        self._claimed_links = set()
+
+    async def fetch_html(self, url, cacheable=False, canonical=True):
+        """
+        Загружает HTML по указанному URL через общий планировщик запросов.
+        URL предварительно приводится к каноническому виду.
+
+        Аргументы:
+            url (str): URL, по которому нужно выполнить запрос.
+            cacheable (bool): Выполнять условный запрос через кэш ответов.
+            canonical (bool): Приводить URL к каноническому виду. Отключается для ссылок пагинации,
+                параметры запроса которых канонизация бы отбросила.
+
+        Возвращает:
+            str: HTML контент страницы или None, если запрос завершился ошибкой.
+        """
+        if canonical:
+            url = canonicalize_url(url)
+        return await self.scheduler.fetch(self.session, url, cacheable=cacheable)
+
+    async def categories(self, source, parse_categories, url):
+        """
+        Возвращает список категорий источника: из кэша категорий, если он задан, или загружая главную страницу.
+
+        Аргументы:
+            source (str): Название источника.
+            parse_categories: Асинхронная функция скрапера вида `parse_categories(context, url)`.
+            url (str): URL главной страницы источника.
+
+        Возвращает:
+            list: Словари категорий с ключами 'name' и 'link'.
+        """
+        if self.category_cache is None:
+            return await parse_categories(self, url)
+        return await self.category_cache.categories(source, lambda: parse_categories(self, url))
+
+    async def confirm_known(self, articles):
+        """
+        Заранее подтверждает в хранилище ссылки статей страницы категории одним пакетом,
+        чтобы последующая проверка в `new_articles` не читала файлы хранилища в цикле событий
+        (см. `BloomArticlesIndex.confirm`).
+
+        Аргументы:
+            articles (list): Словари статей со ссылкой в поле `link`.
+        """
+        await self.known_articles.confirm_links([canonicalize_url(article["link"]) for article in articles])
+
+    def new_articles(self, articles):
+        """
+        Приводит ссылки статей к каноническому виду и оставляет только статьи, которых нет
+        в хранилище и которые еще не взяты в работу в этом цикле другой категорией или источником.
+
+        Аргументы:
+            articles (list): Словари статей со ссылкой в поле `link`.
+
+        Возвращает:
+            list: Новые статьи с каноническими ссылками.
+
+        Примеры:
+            Статья, найденная в двух категориях или по ссылке с отслеживающими параметрами,
+            загружается один раз, а уже сохраненная статья не загружается повторно:
+
+            >>> context = ScrapeContext(None, None, {"https://ria.ru/20240517/old-1.html"}, None)
+            >>> [article["link"] for article in context.new_articles([
+            ...     {"link": "https://www.rbc.ru/politics/17/05/2024/664712?from=newsfeed"},
+            ...     {"link": "https://ria.ru/20240517/old-1.html?utm_source=tg"},
+            ... ])]
+            ['https://www.rbc.ru/politics/17/05/2024/664712']
+            >>> context.new_articles([
+            ...     {"link": "http://rbc.ru/politics/17/05/2024/664712?utm_source=yxnews&utm_medium=desktop"},
+            ...     {"link": "https://m.rbc.ru/politics/17/05/2024/664712#comments"},
+            ... ])
+            []
+        """
+        new_articles = []
+        for article in articles:
+            link = canonicalize_url(article["link"])
+            if link in self._claimed_links or link in self.known_articles:
+                continue
+            self._claimed_links.add(link)
+            new_articles.append({**article, "link": link})
+
+        for article in articles:
+            ARTICLES_FOUND.inc(source=source_label(article["link"]))
+        for article in new_articles:
+            ARTICLES_NEW.inc(source=source_label(article["link"]))
+        return new_articles
+
+    def _reached_known(self, links, new_articles):
+        """
+        Возвращает True, если на странице списка встретилось `known_run` известных ссылок подряд
+        (или все ссылки страницы известны), то есть статьи дальше по списку уже получены раньше.
+        """
+        if not links:
+            return True
+        new_links = {article["link"] for article in new_articles}
+        run = longest_run = 0
+        for article in links:
+            if canonicalize_url(article["link"]) in new_links:
+                run = 0
+            else:
+                run += 1
+                longest_run = max(longest_run, run)
+        return longest_run >= min(self.known_run, len(links))
+
+    async def crawl_category(self, url, extract_page):
+        """
+        Загружает страницы списка статей категории от новых к старым и возвращает новые статьи.
+
+        Первая страница загружается всегда. Следующая страница («показать еще» или пагинация)
+        загружается, только если на текущей странице не встретилось `known_run` известных ссылок подряд,
+        то есть с прошлого цикла вышло больше статей, чем помещается на странице.
+        Так в спокойное время загружается одна страница, а при всплеске новостей статьи,
+        ушедшие с первой страницы между циклами, догружаются с последующих (не больше `max_pages` страниц).
+
+        Аргументы:
+            url (str): URL категории.
+            extract_page: Функция уровня модуля или метод объекта скрапера вида `extract_page(html, url)`, возвращающая словарь
+                со списком статей страницы (`articles`) и URL следующей страницы или None (`next_page`).
+
+        Возвращает:
+            list: Новые статьи со всех загруженных страниц или None, если не удалось загрузить первую страницу.
+        """
+        articles = []
+        page_url = url
+        for page_number in range(self.max_pages):
+            first_page = page_number == 0
+            html = await self.fetch_html(page_url, cacheable=first_page, canonical=first_page)
+            if html is None:
+                return None if first_page else articles
+
+            CATEGORY_PAGES.inc(source=source_label(url))
+            page = await self.parse(extract_page, html, page_url)
+            await self.confirm_known(page["articles"])
+            new_articles = self.new_articles(page["articles"])
+            articles.extend(new_articles)
+            if not page["next_page"] or self._reached_known(page["articles"], new_articles):
+                break
+            page_url = page["next_page"]
+        return articles
+
+    async def parse(self, extract_function, html, url):
+        """
+        Извлекает данные из HTML с помощью функции извлечения скрапера,
+        используя пул процессов парсинга, если он включен.
+
+        Если страница загружена через кэш ответов и ее содержимое не изменилось
+        с прошлого разбора, возвращается сохраненный результат без повторного разбора.
+
+        Аргументы:
+            extract_function: Функция уровня модуля или метод объекта скрапера вида `extract_function(html, url)`.
+            html (str): HTML контент страницы.
+            url (str): URL страницы.
+
+        Возвращает:
+            Результат функции извлечения (список или словарь).
+        """
+        http_cache = self.scheduler.http_cache
+        # Методы скраперов определены в общем классе движка, поэтому источник берется из модуля их объекта
+        owner = getattr(extract_function, "__self__", None)
+        module = type(owner).__module__ if owner is not None else extract_function.__module__
+        parser_name = f"{module}.{extract_function.__name__}"
+
+        if http_cache is not None and html is not None:
+            result = http_cache.get_parsed(url, parser_name)
+            if result is not None:
+                return result
+
+        started = time.monotonic()
+        result = await run_parse(extract_function, html, url)
+        PARSE_DURATION.observe(
+            time.monotonic() - started,
+            source=module.rsplit(".", 1)[-1],
+            function=extract_function.__name__,
+        )
+
+        if http_cache is not None:
+            http_cache.store_parsed(url, parser_name, result)
+        return result
+
+    async def emit(self, article):
+        """
+        Передает готовую статью в очередь записи.
+        Если очередь заполнена, ожидает, пока задача записи освободит место.
+
+        Аргументы:
+            article (dict): Словарь статьи с полями строки CSV.
+        """
+        await self.queue.put(article)
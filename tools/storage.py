@@ -0,0 +1,460 @@
+import os
+import csv
+import time
+import sqlite3
+from functools import partial
+from config import scrapper_logger
+from tools.existing_articles import KnownArticlesIndex, BloomArticlesIndex
+from tools.offset_index import RowOffsetIndex
+from tools.compressed_snapshot import update_compressed_snapshots
+from tools.canonical_url import canonicalize_url
+from tools.partitions import partition_key, partition_path, list_partitions
+
+# Поля статьи в порядке столбцов хранилища
+ARTICLE_FIELDS = [
+    "news_source_name",
+    "news_source_link",
+    "category_name",
+    "category_link",
+    "article_date",
+    "article_link",
+    "article_title",
+    "article_text",
+]
+
+
+class CsvStorage:
+    """
+    Хранилище статей в CSV-файле с дозаписью в конец.
+
+    Дубликаты отсекаются по индексу известных ссылок, для каждой строки ведется индекс смещений
+    для выдачи по курсору, а после закрытия обновляются сжатые снимки файла.
+    Хранилище можно открывать повторно: индекс ссылок остается в памяти между циклами.
+
+    Аргументы:
+        file_path (str): Путь к CSV файлу.
+        snapshot_encodings (list, optional): Кодировки сжатых снимков, обновляемых при закрытии.
+        known_articles_factory (callable, optional): Создает индекс известных ссылок по пути к CSV.
+            По умолчанию `KnownArticlesIndex`.
+    """
+
+    def __init__(self, file_path, snapshot_encodings=(), known_articles_factory=KnownArticlesIndex):
+        self.file_path = file_path
+        self.snapshot_encodings = snapshot_encodings
+        self.known_articles = known_articles_factory(file_path)
+        self.offset_index = RowOffsetIndex(file_path)
+        self._file = None
+        self._writer = None
+
+    def open(self):
+        """
+        Загружает индексы и открывает файл для дозаписи, записывая заголовок в новый файл.
+        """
+        self.known_articles.load()
+        self.offset_index.sync()
+
+        file_exists = os.path.exists(self.file_path)
+        self._file = open(self.file_path, mode="a", encoding="utf-8", newline="")
+        self._writer = csv.writer(self._file)
+        if not file_exists or os.path.getsize(self.file_path) == 0:
+            self._writer.writerow(ARTICLE_FIELDS)
+            self._file.flush()
+
+    def __contains__(self, link):
+        return link in self.known_articles
+
+    async def confirm_links(self, links):
+        """
+        Заранее подтверждает ссылки в индексе известных ссылок, не блокируя цикл событий
+        (см. `BloomArticlesIndex.confirm`).
+
+        Аргументы:
+            links (Iterable[str]): Ссылки на статьи.
+        """
+        await self.known_articles.confirm(links)
+
+    def write(self, article):
+        """
+        Дописывает статью в CSV и сразу сбрасывает строку на диск.
+
+        Аргументы:
+            article (dict): Словарь статьи с полями `ARTICLE_FIELDS`.
+
+        Возвращает:
+            bool: True, если статья записана, и False, если она уже была в файле.
+        """
+        if article["article_link"] in self.known_articles:
+            return False
+
+        row_start = self._file.tell()
+        self._writer.writerow([article.get(field, "") for field in ARTICLE_FIELDS])
+        self._file.flush()
+        self.offset_index.append(row_start, self._file.tell())
+        self.known_articles.add(article["article_link"])
+        return True
+
+    def close(self):
+        """
+        Закрывает файл, сохраняет индекс известных ссылок и обновляет сжатые снимки.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.known_articles.save()
+        update_compressed_snapshots(self.file_path, self.snapshot_encodings)
+
+
+class PartitionedCsvStorage:
+    """
+    Хранилище статей в CSV-файлах, разбитых по месяцам или дням: `news_data_2024_05.csv`.
+
+    Новые статьи дописываются в раздел текущего периода; при смене периода во время записи
+    текущий раздел закрывается и открывается следующий. Дубликаты ищутся только в последних
+    `dedup_window` разделах, так как новые ссылки совпадают лишь с недавно собранными статьями.
+    Индексы ссылок разделов окна хранятся между открытиями, поэтому в следующих циклах
+    из CSV дочитываются только новые строки.
+
+    Аргументы:
+        base_path (str): Путь к основному CSV файлу, от которого строятся имена разделов.
+        partitioning (str): Схема разбиения: `month` или `day`.
+        dedup_window (int): Количество последних разделов (включая текущий) для проверки дубликатов.
+        snapshot_encodings (list, optional): Кодировки сжатых снимков, обновляемых при закрытии раздела.
+        known_articles_factory (callable, optional): Создает индекс известных ссылок по пути к разделу.
+    """
+
+    def __init__(self, base_path, partitioning, dedup_window, snapshot_encodings=(),
+                 known_articles_factory=KnownArticlesIndex):
+        self.base_path = base_path
+        self.partitioning = partitioning
+        self.dedup_window = max(dedup_window, 1)
+        self.snapshot_encodings = snapshot_encodings
+        self.known_articles_factory = known_articles_factory
+        self.key = None
+        self._current = None
+        self._recent = []
+        self._indexes = {}
+
+    def _known_articles(self, path):
+        known_articles = self._indexes.get(path)
+        if known_articles is None:
+            known_articles = self.known_articles_factory(path)
+            self._indexes[path] = known_articles
+        return known_articles
+
+    def open(self):
+        """
+        Открывает раздел текущего периода и загружает индексы ссылок предыдущих разделов окна.
+        """
+        self.key = partition_key(self.partitioning)
+        current_path = partition_path(self.base_path, self.key)
+
+        previous = [path for _, path in list_partitions(self.base_path) if path != current_path]
+        window = previous[max(len(previous) - (self.dedup_window - 1), 0):]
+        self._indexes = {path: known_articles for path, known_articles in self._indexes.items()
+                         if path in window or path == current_path}
+        self._recent = [self._known_articles(path).load() for path in window]
+
+        self._current = CsvStorage(current_path, self.snapshot_encodings, self._known_articles)
+        self._current.open()
+
+    def _rotate(self, key):
+        self._current.close()
+        recent = self._recent + [self._current.known_articles]
+        self._recent = recent[max(len(recent) - (self.dedup_window - 1), 0):]
+
+        self.key = key
+        self._current = CsvStorage(
+            partition_path(self.base_path, key), self.snapshot_encodings, self._known_articles)
+        self._current.open()
+        scrapper_logger.info(f"-- Rotated news data to {self._current.file_path}.")
+
+    def __contains__(self, link):
+        return link in self._current or any(link in known_articles for known_articles in self._recent)
+
+    async def confirm_links(self, links):
+        """
+        Заранее подтверждает ссылки в индексах текущего и предыдущих разделов окна.
+
+        Аргументы:
+            links (Iterable[str]): Ссылки на статьи.
+        """
+        links = list(links)
+        await self._current.confirm_links(links)
+        for known_articles in self._recent:
+            await known_articles.confirm(links)
+
+    def write(self, article):
+        """
+        Дописывает статью в раздел текущего периода, переключая раздел при смене периода.
+
+        Аргументы:
+            article (dict): Словарь статьи с полями `ARTICLE_FIELDS`.
+
+        Возвращает:
+            bool: True, если статья записана, и False, если она уже есть в окне разделов.
+        """
+        key = partition_key(self.partitioning)
+        if key != self.key:
+            self._rotate(key)
+
+        if any(article["article_link"] in known_articles for known_articles in self._recent):
+            return False
+        return self._current.write(article)
+
+    def close(self):
+        """
+        Закрывает текущий раздел.
+        """
+        if self._current is not None:
+            self._current.close()
+            self._current = None
+
+
+class SqliteStorage:
+    """
+    Хранилище статей в базе SQLite в режиме WAL.
+
+    Таблица `articles` имеет уникальный индекс по `article_link` и индексы по источнику,
+    категории и дате статьи, поэтому проверка дубликатов и выборки не требуют полного просмотра.
+    Новые статьи вставляются пачками по `batch_size` строк в одной транзакции.
+    При первом открытии в базу однократно переносятся статьи из существующего CSV-файла.
+    Завершение переноса отмечается в таблице `meta`; если перенос был прерван, при следующем
+    открытии он выполняется заново (уже перенесенные статьи пропускаются).
+    Ссылки статей хранятся в каноническом виде (см. `tools.canonical_url`).
+
+    Аргументы:
+        db_path (str): Путь к файлу базы данных.
+        batch_size (int): Количество статей в одной транзакции вставки.
+        migrate_from (list, optional): Пути к CSV-файлам для однократного переноса данных в базу.
+    """
+
+    def __init__(self, db_path, batch_size, migrate_from=None):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.migrate_from = migrate_from or []
+        self._connection = None
+        self._pending = []
+        self._pending_links = set()
+
+    def open(self):
+        """
+        Открывает базу, создает таблицу и индексы и при необходимости переносит данные из CSV.
+        """
+        self._connection = sqlite3.connect(self.db_path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript("""
+            CREATE TABLE IF NOT EXISTS articles (
+                id INTEGER PRIMARY KEY,
+                news_source_name TEXT,
+                news_source_link TEXT,
+                category_name TEXT,
+                category_link TEXT,
+                article_date TEXT,
+                article_link TEXT NOT NULL,
+                article_title TEXT,
+                article_text TEXT,
+                created_at REAL
+            );
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_articles_link ON articles (article_link);
+            CREATE INDEX IF NOT EXISTS idx_articles_source ON articles (news_source_name);
+            CREATE INDEX IF NOT EXISTS idx_articles_category ON articles (category_name);
+            CREATE INDEX IF NOT EXISTS idx_articles_date ON articles (article_date);
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        """)
+
+        migrated_mark = self._connection.execute(
+            "SELECT value FROM meta WHERE key = 'csv_migrated'").fetchone()
+        if migrated_mark is None:
+            for csv_path in self.migrate_from:
+                if os.path.exists(csv_path):
+                    migrated = migrate_csv_to_sqlite(csv_path, self._connection, self.batch_size)
+                    scrapper_logger.info(f"-- Migrated {migrated} articles from {csv_path} to {self.db_path}.")
+            with self._connection:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('csv_migrated', ?)", (str(time.time()),))
+
+    def __contains__(self, link):
+        link = canonicalize_url(link)
+        if link in self._pending_links:
+            return True
+        row = self._connection.execute(
+            "SELECT 1 FROM articles WHERE article_link = ? LIMIT 1", (link,)).fetchone()
+        return row is not None
+
+    async def confirm_links(self, links):
+        """
+        Ничего не делает: проверка ссылки выполняется по уникальному индексу базы.
+        """
+
+    def write(self, article):
+        """
+        Добавляет статью в текущую пачку вставки. Пачка записывается, когда набирается `batch_size` статей.
+
+        Аргументы:
+            article (dict): Словарь статьи с полями `ARTICLE_FIELDS`.
+
+        Возвращает:
+            bool: True, если статья добавлена, и False, если она уже есть в базе.
+        """
+        article = {**article, "article_link": canonicalize_url(article["article_link"])}
+        if article["article_link"] in self:
+            return False
+
+        self._pending.append([article.get(field, "") for field in ARTICLE_FIELDS] + [time.time()])
+        self._pending_links.add(article["article_link"])
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+        return True
+
+    def flush(self):
+        """
+        Записывает накопленную пачку статей одной транзакцией.
+        """
+        if not self._pending:
+            return
+        with self._connection:
+            _insert_rows(self._connection, self._pending)
+        self._pending = []
+        self._pending_links = set()
+
+    def close(self):
+        """
+        Записывает оставшиеся статьи и закрывает базу.
+        """
+        if self._connection is None:
+            return
+        self.flush()
+        self._connection.close()
+        self._connection = None
+
+
+class CompositeStorage:
+    """
+    Записывает статьи сразу в несколько хранилищ, например в CSV и SQLite одновременно.
+    Проверка дубликатов выполняется по первому (основному) хранилищу.
+
+    Аргументы:
+        storages (list): Хранилища; первое считается основным.
+    """
+
+    def __init__(self, storages):
+        self.storages = storages
+
+    def open(self):
+        for storage in self.storages:
+            storage.open()
+
+    def __contains__(self, link):
+        return link in self.storages[0]
+
+    async def confirm_links(self, links):
+        await self.storages[0].confirm_links(links)
+
+    def write(self, article):
+        written = self.storages[0].write(article)
+        if written:
+            for storage in self.storages[1:]:
+                storage.write(article)
+        return written
+
+    def close(self):
+        for storage in self.storages:
+            try:
+                storage.close()
+            except Exception as e:
+                scrapper_logger.error(f"Error closing storage {type(storage).__name__}: {e}")
+
+
+def _insert_rows(connection, rows):
+    connection.executemany(
+        f"INSERT OR IGNORE INTO articles ({', '.join(ARTICLE_FIELDS)}, created_at) "
+        f"VALUES ({', '.join('?' * (len(ARTICLE_FIELDS) + 1))})",
+        rows,
+    )
+
+
+def migrate_csv_to_sqlite(csv_path, connection, batch_size):
+    """
+    Переносит статьи из CSV-файла в базу SQLite, приводя ссылки к каноническому виду.
+    Статьи, которые уже есть в базе, пропускаются.
+
+    Аргументы:
+        csv_path (str): Путь к CSV-файлу с новостями.
+        connection (sqlite3.Connection): Соединение с базой, в которой уже создана таблица `articles`.
+        batch_size (int): Количество статей в одной транзакции вставки.
+
+    Возвращает:
+        int: Количество прочитанных из CSV статей.
+    """
+    migrated = 0
+    rows = []
+    with open(csv_path, mode="r", encoding="utf-8", newline="") as file:
+        for row in csv.DictReader(file):
+            if not row.get("article_link"):
+                continue
+            row["article_link"] = canonicalize_url(row["article_link"])
+            rows.append([row.get(field, "") for field in ARTICLE_FIELDS] + [None])
+            if len(rows) >= batch_size:
+                with connection:
+                    _insert_rows(connection, rows)
+                migrated += len(rows)
+                rows = []
+    if rows:
+        with connection:
+            _insert_rows(connection, rows)
+        migrated += len(rows)
+    return migrated
+
+
+def create_storage(backends, csv_path, sqlite_path, sqlite_batch_size, snapshot_encodings=(),
+                   partitioning="none", dedup_window=1, dedup_mode="set", bloom_capacity=1_000_000,
+                   bloom_error_rate=0.001, bloom_recent_links=100_000):
+    """
+    Создает хранилище статей по списку бэкендов из конфигурации.
+
+    Аргументы:
+        backends (list): Названия бэкендов: `csv` и/или `sqlite`. Первый считается основным.
+        csv_path (str): Путь к CSV-файлу.
+        sqlite_path (str): Путь к базе SQLite.
+        sqlite_batch_size (int): Количество статей в одной транзакции вставки SQLite.
+        snapshot_encodings (list, optional): Кодировки сжатых снимков CSV-файла.
+        partitioning (str, optional): Схема разбиения CSV по времени: `none`, `month` или `day`.
+        dedup_window (int, optional): Количество последних разделов CSV для проверки дубликатов.
+        dedup_mode (str, optional): Индекс известных ссылок CSV: `set` (точное множество в памяти)
+            или `bloom` (фильтр Блума с подтверждением по CSV).
+        bloom_capacity (int, optional): Ожидаемое количество ссылок в фильтре Блума.
+        bloom_error_rate (float, optional): Допустимая доля ложноположительных ответов фильтра Блума.
+        bloom_recent_links (int, optional): Количество последних ссылок, хранимых фильтром точно.
+
+    Возвращает:
+        Хранилище с методами `open`, `write`, `close` и проверкой `link in storage`.
+    """
+    if dedup_mode == "bloom":
+        known_articles_factory = partial(
+            BloomArticlesIndex, capacity=bloom_capacity, error_rate=bloom_error_rate,
+            recent_size=bloom_recent_links)
+    elif dedup_mode == "set":
+        known_articles_factory = KnownArticlesIndex
+    else:
+        raise ValueError(f"Unknown dedup mode: {dedup_mode}")
+
+    storages = []
+    for backend in backends:
+        if backend == "csv" and partitioning != "none":
+            storages.append(PartitionedCsvStorage(
+                csv_path, partitioning, dedup_window, snapshot_encodings, known_articles_factory))
+        elif backend == "csv":
+            storages.append(CsvStorage(csv_path, snapshot_encodings, known_articles_factory))
+        elif backend == "sqlite":
+            migrate_from = [path for _, path in list_partitions(csv_path)]
+            storages.append(SqliteStorage(sqlite_path, sqlite_batch_size, migrate_from=migrate_from))
+        else:
+            raise ValueError(f"Unknown storage backend: {backend}")
+
+    if len(storages) == 1:
+        return storages[0]
+    return CompositeStorage(storages)